@@ -0,0 +1,59 @@
+"""Merge review tags differing only in case or spacing, and order the top-k index by count
+
+Revision ID: 1c9e5a7f3b28
+Revises: e81c4b7a2d06
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.user.tags import normalize_tag
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e5a7f3b28'
+down_revision: Union[str, Sequence[str], None] = 'e81c4b7a2d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+review_tag = sa.table('review_tag', sa.column('review_id'), sa.column('road_id'), sa.column('tag'))
+road_tag_count = sa.table('road_tag_count', sa.column('road_id'), sa.column('tag'), sa.column('count'))
+tag_count = sa.table('tag_count', sa.column('tag'), sa.column('count'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Re-key every review tag by its normalized form, keeping one row per
+    # review and key, and recount both counters from the merged rows
+    conn = op.get_bind()
+    merged = {}
+    for review_id, road_id, tag in conn.execute(sa.text("SELECT review_id, road_id, tag FROM review_tag")):
+        merged[(review_id, normalize_tag(tag))] = road_id
+    rows = [{'review_id': review_id, 'road_id': road_id, 'tag': tag} for (review_id, tag), road_id in merged.items()]
+
+    op.execute(review_tag.delete())
+    op.execute(road_tag_count.delete())
+    op.execute(tag_count.delete())
+    if rows:
+        op.bulk_insert(review_tag, rows)
+        per_road = Counter((r['road_id'], r['tag']) for r in rows)
+        op.bulk_insert(road_tag_count, [
+            {'road_id': road_id, 'tag': tag, 'count': count} for (road_id, tag), count in per_road.items()
+        ])
+        city = Counter(r['tag'] for r in rows)
+        op.bulk_insert(tag_count, [{'tag': tag, 'count': count} for tag, count in city.items()])
+
+    op.drop_index('ix_road_tag_count_tag_count', table_name='road_tag_count')
+    op.create_index(
+        'ix_road_tag_count_tag_count', 'road_tag_count', ['tag', sa.text('count DESC'), 'road_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema. Merged tags stay merged; only the index is restored."""
+    op.drop_index('ix_road_tag_count_tag_count', table_name='road_tag_count')
+    op.create_index('ix_road_tag_count_tag_count', 'road_tag_count', ['tag', 'count'], unique=False)
@@ -0,0 +1,30 @@
+"""Add road revision counter for the serialized road cache
+
+Revision ID: 2a7c5e9f1b34
+Revises: 9d2f4b6a8c10
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7c5e9f1b34'
+down_revision: Union[str, Sequence[str], None] = '9d2f4b6a8c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('road', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('road', schema=None) as batch_op:
+        batch_op.drop_column('revision')
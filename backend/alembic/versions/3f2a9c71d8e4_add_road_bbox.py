@@ -0,0 +1,57 @@
+"""Add precomputed road bounding boxes
+
+Revision ID: 3f2a9c71d8e4
+Revises: 0ea11e408b36
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.roads.geometry import polyline_bbox
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c71d8e4'
+down_revision: Union[str, Sequence[str], None] = '0ea11e408b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('road', sa.Column('min_lat', sa.Float(), nullable=True))
+    op.add_column('road', sa.Column('min_lng', sa.Float(), nullable=True))
+    op.add_column('road', sa.Column('max_lat', sa.Float(), nullable=True))
+    op.add_column('road', sa.Column('max_lng', sa.Float(), nullable=True))
+    op.create_index('ix_road_bbox', 'road', ['min_lng', 'max_lng', 'min_lat', 'max_lat'], unique=False)
+
+    # Backfill bounding boxes for existing roads
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT road_id, polyline_data FROM road")).fetchall()
+    for road_id, polyline_data in rows:
+        points = json.loads(polyline_data) if isinstance(polyline_data, str) else polyline_data
+        try:
+            min_lng, min_lat, max_lng, max_lat = polyline_bbox(points or [])
+        except ValueError:
+            continue
+        conn.execute(
+            sa.text(
+                "UPDATE road SET min_lng = :min_lng, min_lat = :min_lat, "
+                "max_lng = :max_lng, max_lat = :max_lat WHERE road_id = :road_id"
+            ),
+            {"min_lng": min_lng, "min_lat": min_lat, "max_lng": max_lng, "max_lat": max_lat, "road_id": road_id},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_road_bbox', table_name='road')
+    with op.batch_alter_table('road') as batch_op:
+        batch_op.drop_column('max_lng')
+        batch_op.drop_column('max_lat')
+        batch_op.drop_column('min_lng')
+        batch_op.drop_column('min_lat')
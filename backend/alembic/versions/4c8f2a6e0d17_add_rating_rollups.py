@@ -0,0 +1,42 @@
+"""Add time-bucketed rating rollups
+
+Revision ID: 4c8f2a6e0d17
+Revises: e5a1c8d3b9f0
+Create Date: 2026-10-18 17:00:00.000000
+
+History is not backfilled here; run `python -m scripts.rebuild_rating_rollups`
+after upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8f2a6e0d17'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c8d3b9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rating_rollup',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('scope_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.Date(), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.DECIMAL(precision=12, scale=1), nullable=False),
+        sa.Column('rating_min', sa.DECIMAL(precision=2, scale=1), nullable=False),
+        sa.Column('rating_max', sa.DECIMAL(precision=2, scale=1), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_id', 'bucket', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rating_rollup')
@@ -0,0 +1,58 @@
+"""Add precomputed level-of-detail road geometries
+
+Revision ID: 5e93b0c2a7f1
+Revises: c41e7a9d05b3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.roads.polyline import decode_polyline, encode_polyline
+from app.roads.simplify import LOD_ZOOMS, simplify_points, zoom_tolerance_m
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e93b0c2a7f1'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9d05b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    road_lod = op.create_table(
+        'road_lod',
+        sa.Column('road_id', sa.Integer(), nullable=False),
+        sa.Column('level', sa.Integer(), nullable=False),
+        sa.Column('polyline_encoded', sa.Text(), nullable=False),
+        sa.Column('point_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['road_id'], ['road.road_id'], ),
+        sa.PrimaryKeyConstraint('road_id', 'level')
+    )
+
+    # Build the pyramid for existing roads
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT road_id, polyline_encoded FROM road WHERE polyline_encoded IS NOT NULL"
+    )).fetchall()
+    lods = []
+    for road_id, encoded in rows:
+        points = decode_polyline(encoded)
+        for level in LOD_ZOOMS:
+            simplified = simplify_points(points, zoom_tolerance_m(level))
+            lods.append({
+                'road_id': road_id,
+                'level': level,
+                'polyline_encoded': encode_polyline(simplified),
+                'point_count': len(simplified),
+            })
+    if lods:
+        op.bulk_insert(road_lod, lods)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('road_lod')
@@ -0,0 +1,33 @@
+"""Add journal_checkpoint for the rating write-behind journal
+
+Revision ID: 6d1f8b3e2a57
+Revises: a3e7c9b1d5f4
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d1f8b3e2a57'
+down_revision: Union[str, Sequence[str], None] = 'a3e7c9b1d5f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'journal_checkpoint',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('journal_checkpoint')
@@ -0,0 +1,78 @@
+"""Add incrementally maintained per-road rating aggregates
+
+Revision ID: 7b3e1d9c4f62
+Revises: 2a7c5e9f1b34
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e1d9c4f62'
+down_revision: Union[str, Sequence[str], None] = '2a7c5e9f1b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'road_stats',
+        sa.Column('road_id', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.DECIMAL(precision=12, scale=1), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False),
+        sa.Column('rating_hist_0', sa.Integer(), nullable=False),
+        sa.Column('rating_hist_1', sa.Integer(), nullable=False),
+        sa.Column('rating_hist_2', sa.Integer(), nullable=False),
+        sa.Column('rating_hist_3', sa.Integer(), nullable=False),
+        sa.Column('rating_hist_4', sa.Integer(), nullable=False),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('last_rating_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['road_id'], ['road.road_id'], ),
+        sa.PrimaryKeyConstraint('road_id')
+    )
+
+    # Backfill from existing ratings and reviews
+    op.execute(
+        """
+        INSERT INTO road_stats (
+            road_id, rating_sum, rating_count,
+            rating_hist_0, rating_hist_1, rating_hist_2, rating_hist_3, rating_hist_4,
+            review_count, last_rating_at
+        )
+        SELECT
+            road.road_id,
+            COALESCE(r.rating_sum, 0), COALESCE(r.rating_count, 0),
+            COALESCE(r.h0, 0), COALESCE(r.h1, 0), COALESCE(r.h2, 0), COALESCE(r.h3, 0), COALESCE(r.h4, 0),
+            COALESCE(v.review_count, 0), r.last_rating_at
+        FROM road
+        LEFT JOIN (
+            SELECT
+                road_id,
+                SUM(rating) AS rating_sum,
+                COUNT(*) AS rating_count,
+                SUM(CASE WHEN rating < 1 THEN 1 ELSE 0 END) AS h0,
+                SUM(CASE WHEN rating >= 1 AND rating < 2 THEN 1 ELSE 0 END) AS h1,
+                SUM(CASE WHEN rating >= 2 AND rating < 3 THEN 1 ELSE 0 END) AS h2,
+                SUM(CASE WHEN rating >= 3 AND rating < 4 THEN 1 ELSE 0 END) AS h3,
+                SUM(CASE WHEN rating >= 4 THEN 1 ELSE 0 END) AS h4,
+                MAX(timestamp) AS last_rating_at
+            FROM rating
+            GROUP BY road_id
+        ) AS r ON r.road_id = road.road_id
+        LEFT JOIN (
+            SELECT road_id, COUNT(*) AS review_count
+            FROM review
+            GROUP BY road_id
+        ) AS v ON v.road_id = road.road_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('road_stats')
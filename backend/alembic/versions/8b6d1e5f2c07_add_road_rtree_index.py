@@ -0,0 +1,40 @@
+"""Add R*Tree spatial index over road bounding boxes
+
+Revision ID: 8b6d1e5f2c07
+Revises: 3f2a9c71d8e4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b6d1e5f2c07'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c71d8e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # R*Tree is SQLite-only; other databases use the ix_road_bbox index
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS road_rtree "
+        "USING rtree(road_id, min_lng, max_lng, min_lat, max_lat)"
+    )
+    op.execute(
+        "INSERT INTO road_rtree (road_id, min_lng, max_lng, min_lat, max_lat) "
+        "SELECT road_id, min_lng, max_lng, min_lat, max_lat FROM road WHERE min_lng IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS road_rtree")
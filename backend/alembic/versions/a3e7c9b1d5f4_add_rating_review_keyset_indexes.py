@@ -0,0 +1,29 @@
+"""Add (road_id, timestamp, id) indexes for keyset pagination
+
+Revision ID: a3e7c9b1d5f4
+Revises: f16b3d7a9e25
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7c9b1d5f4'
+down_revision: Union[str, Sequence[str], None] = 'f16b3d7a9e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_rating_road_timestamp', 'rating', ['road_id', 'timestamp', 'rating_id'], unique=False)
+    op.create_index('ix_review_road_timestamp', 'review', ['road_id', 'timestamp', 'review_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_review_road_timestamp', table_name='review')
+    op.drop_index('ix_rating_road_timestamp', table_name='rating')
@@ -0,0 +1,32 @@
+"""Add batch-computed road scores to road_stats
+
+Revision ID: b8d4f0a2c6e9
+Revises: 4c8f2a6e0d17
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f0a2c6e9'
+down_revision: Union[str, Sequence[str], None] = '4c8f2a6e0d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('road_stats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('score_computed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('road_stats', schema=None) as batch_op:
+        batch_op.drop_column('score_computed_at')
+        batch_op.drop_column('score')
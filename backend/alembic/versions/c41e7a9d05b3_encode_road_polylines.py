@@ -0,0 +1,61 @@
+"""Store road geometry as encoded polylines
+
+Revision ID: c41e7a9d05b3
+Revises: 8b6d1e5f2c07
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.roads.polyline import decode_polyline, encode_polyline
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d05b3'
+down_revision: Union[str, Sequence[str], None] = '8b6d1e5f2c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('road') as batch_op:
+        batch_op.add_column(sa.Column('polyline_encoded', sa.Text(), nullable=True))
+        batch_op.alter_column('polyline_data', existing_type=sa.JSON(), nullable=True)
+
+    # Move existing JSON polylines into the encoded column
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT road_id, polyline_data FROM road WHERE polyline_encoded IS NULL AND polyline_data IS NOT NULL"
+    )).fetchall()
+    for road_id, polyline_data in rows:
+        points = json.loads(polyline_data) if isinstance(polyline_data, str) else polyline_data
+        try:
+            encoded = encode_polyline(points or [])
+        except ValueError:
+            continue
+        conn.execute(
+            sa.text("UPDATE road SET polyline_encoded = :encoded, polyline_data = NULL WHERE road_id = :road_id"),
+            {"encoded": encoded, "road_id": road_id},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT road_id, polyline_encoded FROM road WHERE polyline_data IS NULL AND polyline_encoded IS NOT NULL"
+    )).fetchall()
+    for road_id, encoded in rows:
+        conn.execute(
+            sa.text("UPDATE road SET polyline_data = :points WHERE road_id = :road_id"),
+            {"points": json.dumps(decode_polyline(encoded)), "road_id": road_id},
+        )
+
+    with op.batch_alter_table('road') as batch_op:
+        batch_op.alter_column('polyline_data', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('polyline_encoded')
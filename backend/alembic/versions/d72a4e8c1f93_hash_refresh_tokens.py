@@ -0,0 +1,57 @@
+"""Store refresh tokens as SHA-256 digests and index them for revocation and purging
+
+Revision ID: d72a4e8c1f93
+Revises: 6d1f8b3e2a57
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.auth.tokens import hash_refresh_token
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd72a4e8c1f93'
+down_revision: Union[str, Sequence[str], None] = '6d1f8b3e2a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+
+    # Existing sessions stay valid: digest their tokens in place
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, token FROM refresh_token")).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE refresh_token SET token_hash = :token_hash WHERE id = :id"),
+            [{"token_hash": hash_refresh_token(token), "id": token_id} for token_id, token in rows],
+        )
+
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.LargeBinary(length=32), nullable=False)
+        batch_op.drop_index('ix_refresh_token_token')
+        batch_op.drop_column('token')
+        batch_op.create_index('ix_refresh_token_token_hash', ['token_hash'], unique=True)
+        batch_op.create_index('ix_refresh_token_user_revoked', ['user_id', 'is_revoked'], unique=False)
+        batch_op.create_index('ix_refresh_token_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Plain tokens cannot be recovered from their digests, so every
+    # session is dropped and users sign in again.
+    op.execute("DELETE FROM refresh_token")
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.drop_index('ix_refresh_token_expires_at')
+        batch_op.drop_index('ix_refresh_token_user_revoked')
+        batch_op.drop_index('ix_refresh_token_token_hash')
+        batch_op.drop_column('token_hash')
+        batch_op.add_column(sa.Column('token', sa.String(), nullable=False))
+        batch_op.create_index('ix_refresh_token_token', ['token'], unique=True)
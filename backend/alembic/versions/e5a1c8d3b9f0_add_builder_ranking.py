@@ -0,0 +1,65 @@
+"""Add materialized builder ranking columns
+
+Revision ID: e5a1c8d3b9f0
+Revises: 7b3e1d9c4f62
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8d3b9f0'
+down_revision: Union[str, Sequence[str], None] = '7b3e1d9c4f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('builder', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.DECIMAL(precision=14, scale=1), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('score', sa.Float(), server_default='0', nullable=False))
+        batch_op.create_index('ix_builder_score', ['score'], unique=False)
+
+    # Backfill from roads and road_stats
+    op.execute(
+        """
+        UPDATE builder SET
+            total_projects = (SELECT COUNT(*) FROM road WHERE road.builder_id = builder.id),
+            rating_sum = COALESCE((
+                SELECT SUM(road_stats.rating_sum) FROM road_stats
+                JOIN road ON road.road_id = road_stats.road_id
+                WHERE road.builder_id = builder.id
+            ), 0),
+            rating_count = COALESCE((
+                SELECT SUM(road_stats.rating_count) FROM road_stats
+                JOIN road ON road.road_id = road_stats.road_id
+                WHERE road.builder_id = builder.id
+            ), 0)
+        """
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE builder SET
+                average_rating = CASE WHEN rating_count > 0 THEN rating_sum / rating_count ELSE 0 END,
+                score = (:weight * :mean + rating_sum) / (:weight + rating_count)
+            """
+        ).bindparams(weight=settings.LEADERBOARD_PRIOR_WEIGHT, mean=settings.LEADERBOARD_PRIOR_MEAN)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('builder', schema=None) as batch_op:
+        batch_op.drop_index('ix_builder_score')
+        batch_op.drop_column('score')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
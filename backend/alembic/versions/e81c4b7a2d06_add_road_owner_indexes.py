@@ -0,0 +1,31 @@
+"""Index road.builder_id, road.maintained_by and road.employee_id
+
+Revision ID: e81c4b7a2d06
+Revises: d72a4e8c1f93
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81c4b7a2d06'
+down_revision: Union[str, Sequence[str], None] = 'd72a4e8c1f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_road_builder_id', 'road', ['builder_id'], unique=False)
+    op.create_index('ix_road_maintained_by', 'road', ['maintained_by'], unique=False)
+    op.create_index('ix_road_employee_id', 'road', ['employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_road_employee_id', table_name='road')
+    op.drop_index('ix_road_maintained_by', table_name='road')
+    op.drop_index('ix_road_builder_id', table_name='road')
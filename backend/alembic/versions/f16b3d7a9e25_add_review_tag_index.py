@@ -0,0 +1,74 @@
+"""Add normalized review tags and tag counts
+
+Revision ID: f16b3d7a9e25
+Revises: b8d4f0a2c6e9
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.user.tags import parse_review_tags
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f16b3d7a9e25'
+down_revision: Union[str, Sequence[str], None] = 'b8d4f0a2c6e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    review_tag = op.create_table(
+        'review_tag',
+        sa.Column('review_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('road_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['review_id'], ['review.review_id'], ),
+        sa.ForeignKeyConstraint(['road_id'], ['road.road_id'], ),
+        sa.PrimaryKeyConstraint('review_id', 'tag')
+    )
+    op.create_index('ix_review_tag_tag_road', 'review_tag', ['tag', 'road_id'], unique=False)
+    road_tag_count = op.create_table(
+        'road_tag_count',
+        sa.Column('road_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['road_id'], ['road.road_id'], ),
+        sa.PrimaryKeyConstraint('road_id', 'tag')
+    )
+    op.create_index('ix_road_tag_count_tag_count', 'road_tag_count', ['tag', 'count'], unique=False)
+    tag_count = op.create_table(
+        'tag_count',
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tag')
+    )
+
+    # Index existing reviews
+    conn = op.get_bind()
+    rows = []
+    for review_id, road_id, raw in conn.execute(sa.text("SELECT review_id, road_id, tags FROM review")):
+        _, tags = parse_review_tags(raw)
+        rows.extend({'review_id': review_id, 'road_id': road_id, 'tag': tag} for tag in tags)
+    if rows:
+        op.bulk_insert(review_tag, rows)
+        per_road = Counter((r['road_id'], r['tag']) for r in rows)
+        op.bulk_insert(road_tag_count, [
+            {'road_id': road_id, 'tag': tag, 'count': count} for (road_id, tag), count in per_road.items()
+        ])
+        city = Counter(r['tag'] for r in rows)
+        op.bulk_insert(tag_count, [{'tag': tag, 'count': count} for tag, count in city.items()])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tag_count')
+    op.drop_index('ix_road_tag_count_tag_count', table_name='road_tag_count')
+    op.drop_table('road_tag_count')
+    op.drop_index('ix_review_tag_tag_road', table_name='review_tag')
+    op.drop_table('review_tag')
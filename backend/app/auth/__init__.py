@@ -1,4 +1,4 @@
 from .routes import auth_router
-from .dependencies import get_current_user, get_current_manager, get_current_active_user
+from .dependencies import get_current_user, get_current_principal, get_current_manager, get_current_active_user
 
-__all__ = ["auth_router", "get_current_user", "get_current_manager", "get_current_active_user"]
+__all__ = ["auth_router", "get_current_user", "get_current_principal", "get_current_manager", "get_current_active_user"]
@@ -0,0 +1,172 @@
+"""
+In-process caches for the authentication fast path.
+
+Verifying a JWT signature and loading the caller's user row cost more than
+most handlers they guard. Verified claims are cached by SHA-256 digest of
+the token, never past the token's own `exp`, and the minimal principal
+(id, type, active flag) by user_id. A repeat request then identifies its
+caller without a signature check or a database round trip.
+
+Entries are dropped on logout, on revoking all of a user's tokens and
+whenever a user row is updated or deleted through the ORM. The caches are
+per process, so a change made by another worker becomes visible within
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import threading
+import time
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Who is calling: just enough to authorize a request"""
+    user_id: int
+    user_type: str
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            user_id=user.user_id,
+            user_type=user.user_type,
+            # is_active is not a column yet (see app/models/user.py)
+            is_active=getattr(user, "is_active", True),
+        )
+
+
+# Attributes a Principal is built from; other updates leave the cache alone
+PRINCIPAL_ATTRIBUTES = ("user_type", "is_active")
+
+
+class TTLCache:
+    """Thread-safe LRU whose entries also expire at a per-entry deadline"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= now:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store `value` for ttl_seconds, capped at the cache's own TTL"""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k, (_, value) in self._items.items() if predicate(value)]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class AuthCache:
+    """Verified token claims by token digest and principals by user_id"""
+
+    def __init__(self, max_size: int, claims_ttl_seconds: float, principal_ttl_seconds: float):
+        self.claims = TTLCache(max_size, claims_ttl_seconds)
+        self.principals = TTLCache(max_size, principal_ttl_seconds)
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        return self.claims.get(token_digest(token))
+
+    def put_claims(self, token: str, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload until its exp at the latest"""
+        remaining = payload["exp"] - time.time() if "exp" in payload else None
+        self.claims.put(token_digest(token), payload, remaining)
+
+    def get_principal(self, user_id: int) -> Optional[Principal]:
+        return self.principals.get(user_id)
+
+    def put_principal(self, principal: Principal) -> None:
+        self.principals.put(principal.user_id, principal)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget a user's principal and every cached token of theirs"""
+        self.principals.discard(user_id)
+        subject = str(user_id)
+        self.claims.discard_where(lambda payload: payload.get("sub") == subject)
+
+    def clear(self) -> None:
+        self.claims.clear()
+        self.principals.clear()
+
+
+auth_cache = AuthCache(
+    settings.AUTH_CACHE_MAX_SIZE,
+    settings.AUTH_CLAIMS_CACHE_TTL_SECONDS,
+    settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# Invalidate at flush and again at commit, so a request that re-cached the old
+# row between the two cannot keep it
+_PENDING_KEY = "auth_cache_invalidate"
+
+
+def _invalidate_on_commit(target: User) -> None:
+    auth_cache.invalidate_user(target.user_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.user_id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if any(
+        name in state.attrs and state.attrs[name].history.has_changes()
+        for name in PRINCIPAL_ATTRIBUTES
+    ):
+        _invalidate_on_commit(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    _invalidate_on_commit(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
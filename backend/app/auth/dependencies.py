@@ -1,36 +1,39 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from .cache import Principal, auth_cache
 from .utils import decode_access_token
 from app.models.user import User
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
-    result = decode_access_token(token)
-    
-    # Check token status
-    if result["status"] == "expired":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Access token has expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    elif result["status"] != "valid":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # If valid, get the payload
-    payload = result["payload"]
+def verify_token(token: str) -> int:
+    """
+    Verify an access token and return its user_id. Claims of tokens seen
+    before come from the cache, skipping the signature check.
+    """
+    payload = auth_cache.get_claims(token)
+    if payload is None:
+        result = decode_access_token(token)
+
+        # Check token status
+        if result["status"] == "expired":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Access token has expired",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        elif result["status"] != "valid":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # If valid, get the payload
+        payload = result["payload"]
     
     # Extract user ID from payload
     user_id_str = payload.get("sub")
@@ -49,6 +52,48 @@ def get_current_user(
             detail="Invalid user ID in token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    auth_cache.put_claims(token, payload)
+    return user_id
+
+
+def _check_active(principal: Principal) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+    return principal
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_read_db)
+) -> Principal:
+    """
+    Identify the caller without loading the full user. Served from the auth
+    caches when warm, in which case no database query is made.
+    """
+    user_id = verify_token(token)
+    principal = auth_cache.get_principal(user_id)
+    if principal is None:
+        user = session.query(User).filter(User.user_id == user_id).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        principal = Principal.from_user(user)
+        auth_cache.put_principal(principal)
+    return _check_active(principal)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user"""
+    user_id = verify_token(token)
     
     # Get the user
     user = session.query(User).filter(User.user_id == user_id).first()
@@ -58,13 +103,10 @@ def get_current_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
-    
+
+    principal = Principal.from_user(user)
+    auth_cache.put_principal(principal)
+    _check_active(principal)
     return user
 
 
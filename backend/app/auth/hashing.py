@@ -0,0 +1,61 @@
+"""
+Password hashing off the request path.
+
+bcrypt is deliberately slow (~250 ms at 12 rounds) and would otherwise tie
+up the event loop or a threadpool worker per login. Hashes run on a small
+dedicated thread pool (bcrypt releases the GIL, so the threads hash in
+parallel) and handlers await them. At most PASSWORD_HASH_MAX_PENDING
+hashes may be queued or running; beyond that requests fail fast with 503
+instead of piling up behind a login storm.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from typing import Callable, TypeVar
+import asyncio
+import threading
+from app.core.config import settings
+from .utils import generate_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Bounded executor for bcrypt hashing and verification"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(generate_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests in progress, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
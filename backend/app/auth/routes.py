@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from .services import UserService
 from .schemas import (
     UserCreateModel_By_Password,
@@ -13,7 +13,8 @@ from .schemas import (
     MessageResponse,
     UserResponse
 )
-from .dependencies import get_current_user, get_current_active_user
+from .cache import Principal
+from .dependencies import get_current_principal, get_current_active_user
 from app.models.user import User
 
 
@@ -22,22 +23,24 @@ user_service = UserService()
 
 
 @auth_router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreateModel_By_Password,
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db),
+    read_session: Session = Depends(get_read_db)
 ):
     """Register a new user"""
-    user = user_service.create_user_by_password(user_data, session)
+    user = await user_service.create_user_by_password(user_data, session, read_session)
     return user
 
 
 @auth_router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db),
+    read_session: Session = Depends(get_read_db)
 ):
     """Login with email (username field) and password"""
-    return user_service.login_with_password(form_data.username, form_data.password, session)
+    return await user_service.login_with_password(form_data.username, form_data.password, session, read_session)
 
 
 @auth_router.post("/refresh", response_model=TokenRefreshResponse)
@@ -52,7 +55,7 @@ def refresh_token(
 @auth_router.post("/logout", response_model=MessageResponse)
 def logout(
     request: RefreshRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: Session = Depends(get_db)
 ):
     """Logout user by revoking refresh token"""
@@ -69,7 +72,7 @@ def get_current_user_profile(
 
 @auth_router.post("/logout-all", response_model=MessageResponse)
 def logout_all_devices(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: Session = Depends(get_db)
 ):
     """Logout from all devices"""
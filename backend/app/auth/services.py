@@ -1,11 +1,15 @@
 from app.models.user import User
-from app.models.refresh_token import RefreshToken
+from .cache import auth_cache
 from .schemas import UserCreateModel_By_Password, LoginResponse
-from .utils import generate_password_hash, verify_password, create_access_token
+from .hashing import password_hasher
+from .tokens import as_utc, refresh_token_store
+from .utils import create_access_token, needs_rehash
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
 from fastapi import status
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 import logging
 from typing import Optional
 
@@ -20,8 +24,20 @@ class UserService:
         user = self.get_user_by_email(email, session)
         return True if user else False
     
-    def create_user_by_password(self, user_data: UserCreateModel_By_Password, session: Session):
-        if self.user_exists(user_data.email, session):
+    def _find_user(self, email: str, read_session: Session) -> Optional[User]:
+        """
+        Look a user up and hand the connection back before the caller awaits
+        a password hash; the returned user is detached but fully loaded
+        """
+        user = self.get_user_by_email(email, read_session)
+        read_session.close()
+        return user
+
+    async def create_user_by_password(self, user_data: UserCreateModel_By_Password, session: Session,
+                                      read_session: Session):
+        # Database work runs on the threadpool: a blocking pool checkout on
+        # the event loop would stall every other request
+        if await run_in_threadpool(self._find_user, user_data.email, read_session):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, 
                 detail="A user with same email exists"
@@ -33,19 +49,22 @@ class UserService:
         password = user_data_dict.pop('password')
         
         new_user = User(**user_data_dict)
-        new_user.hashed_password = generate_password_hash(password)
+        new_user.hashed_password = await password_hasher.hash(password)
         
+        return await run_in_threadpool(self._add_user, new_user, session)
+
+    def _add_user(self, new_user: User, session: Session) -> User:
         session.add(new_user)
         session.commit()
         session.refresh(new_user)
-
         return new_user
     
     
     # Login methods
-    def login_with_password(self, email: str, password: str, session: Session):
+    async def login_with_password(self, email: str, password: str, session: Session, read_session: Session):
         """Login with email and password"""
-        user = self.get_user_by_email(email, session)
+        # The writer is only taken once the password checks out
+        user = await run_in_threadpool(self._find_user, email, read_session)
         
         if not user:
             raise HTTPException(
@@ -53,13 +72,19 @@ class UserService:
                 detail="Invalid credentials"
             )
         
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, 
                 detail="Invalid credentials"
             )
+
+        # Upgrade hashes made with an old work factor while we have the password
+        new_hash = None
+        if needs_rehash(user.hashed_password):
+            new_hash = await password_hasher.hash(password)
         
-        if not user.is_verified:
+        # is_verified is not a column yet (see app/models/user.py)
+        if not getattr(user, "is_verified", True):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, 
                 detail="Email not verified"
@@ -71,11 +96,11 @@ class UserService:
             "email": user.email,
             "user_type": user.user_type
         })
-        refresh_token = self.create_refresh_token(user.user_id, session)
+        refresh_token = await run_in_threadpool(self._start_session, user.user_id, new_hash, session)
         
         return {
             "access_token": access_token,
-            "refresh_token": refresh_token.token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": {
                 "user_id": user.user_id,
@@ -85,34 +110,27 @@ class UserService:
             }
         }
     
+    def _start_session(self, user_id: int, new_hash: Optional[str], session: Session) -> str:
+        """Store an upgraded password hash, if any, and issue a refresh token in one commit"""
+        if new_hash is not None:
+            session.execute(
+                update(User).where(User.user_id == user_id).values(hashed_password=new_hash),
+                execution_options={"synchronize_session": False},
+            )
+        return self.create_refresh_token(user_id, session)
+    
     def create_refresh_token(self, user_id: int, session: Session, 
                             ip_address: Optional[str] = None,
-                            user_agent: Optional[str] = None) -> RefreshToken:
-        """Create a refresh token for a user"""
-        import secrets
-        token_str = secrets.token_urlsafe(32)
-        expires_at = datetime.now(timezone.utc) + timedelta(days=30)
-        
-        refresh_token = RefreshToken(
-            user_id=user_id,
-            token=token_str,
-            expires_at=expires_at,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-        
-        session.add(refresh_token)
+                            user_agent: Optional[str] = None) -> str:
+        """Create a refresh token for a user and return it (only its digest is stored)"""
+        token = refresh_token_store.issue(session, user_id, ip_address, user_agent)
         session.commit()
-        session.refresh(refresh_token)
-
-        return refresh_token
+        return token
     
     def refresh_access_token(self, refresh_token: str, session: Session):
         """Generate a new access token using a refresh token"""
         # Find the token
-        token = session.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token
-        ).first()
+        token = refresh_token_store.find(session, refresh_token)
         
         if not token:
             raise HTTPException(
@@ -121,7 +139,7 @@ class UserService:
             )
         
         # Check if revoked or expired
-        if token.is_revoked or token.expires_at <= datetime.now(timezone.utc):
+        if token.is_revoked or as_utc(token.expires_at) <= datetime.now(timezone.utc):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token has expired or been revoked"
@@ -136,7 +154,8 @@ class UserService:
                 detail="User not found"
             )
         
-        if not user.is_active:
+        # is_active is not a column yet (see app/models/user.py)
+        if not getattr(user, "is_active", True):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User account is inactive"
@@ -156,30 +175,16 @@ class UserService:
     
     def logout(self, refresh_token: str, session: Session):
         """Revoke a refresh token to log the user out"""
-        token = session.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token
-        ).first()
-        
-        if token:
-            token.is_revoked = True
-            token.revoked_at = datetime.now(timezone.utc)
-            session.add(token)
-            session.commit()
+        user_id = refresh_token_store.revoke(session, refresh_token)
+        session.commit()
+        if user_id is not None:
+            auth_cache.invalidate_user(user_id)
         
         return {"message": "Successfully logged out"}
     
     def revoke_all_user_tokens(self, user_id: int, session: Session):
         """Revoke all tokens for a user (logout from all devices)"""
-        tokens = session.query(RefreshToken).filter(
-            RefreshToken.user_id == user_id,
-            RefreshToken.is_revoked == False
-        ).all()
-        
-        for token in tokens:
-            token.is_revoked = True
-            token.revoked_at = datetime.now(timezone.utc)
-            session.add(token)
-        
+        count = refresh_token_store.revoke_all(session, user_id)
         session.commit()
-        return len(tokens)
-
+        auth_cache.invalidate_user(user_id)
+        return count
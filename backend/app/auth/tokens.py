@@ -0,0 +1,113 @@
+"""
+Refresh token storage.
+
+Clients get a random token; the table only keeps its SHA-256 digest, so the
+unique index holds fixed 32-byte keys and a leaked table cannot be replayed.
+Revocation is a single set-based UPDATE, and a scheduled purge deletes
+expired tokens and revoked ones older than
+REFRESH_TOKEN_REVOKED_RETENTION_DAYS, so the table stays proportional to
+the number of live sessions.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
+import secrets
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+
+def hash_refresh_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite hands back naive datetimes; they are stored in UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class RefreshTokenStore:
+    """Issue, look up, revoke and purge refresh tokens; callers commit"""
+
+    PURGE_BATCH_SIZE = 500  # same bound as RoadService.ID_CHUNK_SIZE
+
+    def issue(
+        self,
+        session: Session,
+        user_id: int,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> str:
+        """Add a new token for the user and return it; only its digest is stored"""
+        token = secrets.token_urlsafe(32)
+        session.add(RefreshToken(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            ip_address=ip_address,
+            user_agent=user_agent,
+        ))
+        return token
+
+    def find(self, session: Session, token: str) -> Optional[RefreshToken]:
+        return session.execute(
+            select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+        ).scalar_one_or_none()
+
+    def revoke(self, session: Session, token: str) -> Optional[int]:
+        """Revoke one token. Returns its user_id, or None if it was unknown or already revoked."""
+        return session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(token), RefreshToken.is_revoked == False)
+            .values(is_revoked=True, revoked_at=datetime.now(timezone.utc))
+            .returning(RefreshToken.user_id),
+            execution_options={"synchronize_session": False},
+        ).scalar_one_or_none()
+
+    def revoke_all(self, session: Session, user_id: int) -> int:
+        """Revoke every live token of a user. Returns how many were revoked."""
+        result = session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked == False)
+            .values(is_revoked=True, revoked_at=datetime.now(timezone.utc)),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    def purge(self, session: Session, now: Optional[datetime] = None) -> int:
+        """
+        Delete expired tokens and tokens revoked before the retention window,
+        PURGE_BATCH_SIZE rows per statement and commit so writers are never
+        blocked for long. The ids are picked by a subquery, so none of them
+        travel to Python and back. Returns the number of deleted rows.
+        """
+        now = now or datetime.now(timezone.utc)
+        revoked_before = now - timedelta(days=settings.REFRESH_TOKEN_REVOKED_RETENTION_DAYS)
+        stale = select(RefreshToken.id).where(or_(
+            RefreshToken.expires_at <= now,
+            and_(RefreshToken.is_revoked == True, RefreshToken.revoked_at <= revoked_before),
+        )).limit(self.PURGE_BATCH_SIZE)
+
+        deleted = 0
+        while True:
+            result = session.execute(
+                delete(RefreshToken).where(RefreshToken.id.in_(stale.scalar_subquery())),
+                execution_options={"synchronize_session": False},
+            )
+            session.commit()
+            if not result.rowcount:
+                return deleted
+            deleted += result.rowcount
+
+    def run_purge(self) -> None:
+        """Entry point for the scheduler: purge in a session of its own"""
+        session = SessionLocal()
+        try:
+            self.purge(session)
+        finally:
+            session.close()
+
+
+refresh_token_store = RefreshTokenStore()
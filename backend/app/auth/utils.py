@@ -1,5 +1,6 @@
 import bcrypt
 from datetime import timedelta, datetime, timezone
+from typing import Optional
 from app.core.config import settings
 import jwt as pyjwt 
 
@@ -8,15 +9,16 @@ import logging
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 
-def generate_password_hash(password: str) -> str:
+def generate_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """
-    Generate a hashed password using bcrypt.
-    Bcrypt has a 72-byte password limit, so we truncate if necessary.
+    Generate a hashed password using bcrypt with settings.BCRYPT_ROUNDS
+    (or `rounds`). Bcrypt has a 72-byte password limit, so we truncate if necessary.
+    This is CPU-bound; request handlers should go through app.auth.hashing.
     """
     # Encode password to bytes and truncate to 72 bytes if necessary
     password_bytes = password.encode('utf-8')[:72]
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string for storage
     return hashed.decode('utf-8')
@@ -32,6 +34,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Work factor of a bcrypt hash ("$2b$12$..." -> 12), or None if unrecognised"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True if a hash was made with a different work factor than settings.BCRYPT_ROUNDS"""
+    return password_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
 def create_access_token(user_data: dict, expiry: timedelta = None) -> str:
     """Create a JWT access token."""
     if expiry is None:
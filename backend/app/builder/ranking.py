@@ -0,0 +1,113 @@
+"""
+Builder ranking materialized on the builder row.
+
+A builder is credited with the roads it built (`Road.builder_id`) and the
+ratings of those roads. The rating and road write paths call
+record_ratings() / record_roads() in their own transaction; both issue
+`column = column + delta` updates and recompute the derived columns in the
+same statement, so the leaderboard never scans roads or ratings.
+
+The score is a Bayesian average: (C * m + sum) / (C + n) with the prior mean
+m and weight C from settings, so a builder with two 5-star ratings does not
+outrank one with hundreds of 4.8s.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Tuple
+from app.core.config import settings
+from app.models.builder import Builder
+from app.models.rating import Rating
+from app.models.road import Road
+from app.models.road_stats import RoadStats
+
+
+def bayesian_score(rating_sum: float, rating_count: int) -> float:
+    prior_mean = settings.LEADERBOARD_PRIOR_MEAN
+    prior_weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    return (prior_weight * prior_mean + float(rating_sum)) / (prior_weight + rating_count)
+
+
+class BuilderRankingService:
+    """Incremental maintenance and rebuild of the builder ranking columns"""
+
+    def record_ratings(self, session: Session, ratings: Iterable[Rating]) -> None:
+        """Credit new ratings to the builders of their roads; commits with the caller's transaction"""
+        per_road: Dict[int, List[Decimal]] = defaultdict(list)
+        for rating in ratings:
+            per_road[rating.road_id].append(Decimal(str(rating.rating)))
+        if not per_road:
+            return
+
+        owners = dict(session.execute(
+            select(Road.road_id, Road.builder_id).where(Road.road_id.in_(list(per_road)))
+        ).all())
+        deltas: Dict[int, Tuple[Decimal, int]] = {}
+        for road_id, values in per_road.items():
+            builder_id = owners.get(road_id)
+            if builder_id is None:
+                continue
+            total, count = deltas.get(builder_id, (Decimal(0), 0))
+            deltas[builder_id] = (total + sum(values), count + len(values))
+
+        for builder_id, (total, count) in deltas.items():
+            self._add_ratings(session, builder_id, total, count)
+
+    def record_roads(self, session: Session, roads: Iterable[Road]) -> None:
+        """Count newly created roads towards their builders' projects"""
+        counts: Dict[int, int] = defaultdict(int)
+        for road in roads:
+            counts[road.builder_id] += 1
+        for builder_id, count in counts.items():
+            session.execute(
+                update(Builder)
+                .where(Builder.id == builder_id)
+                .values(total_projects=func.coalesce(Builder.total_projects, 0) + count),
+                execution_options={"synchronize_session": False},
+            )
+
+    def _add_ratings(self, session: Session, builder_id: int, total: Decimal, count: int) -> None:
+        # SET expressions see the old row, so the derived columns are written from old + delta
+        new_sum = Builder.rating_sum + total
+        new_count = Builder.rating_count + count
+        prior_weight = settings.LEADERBOARD_PRIOR_WEIGHT
+        session.execute(
+            update(Builder)
+            .where(Builder.id == builder_id)
+            .values(
+                rating_sum=new_sum,
+                rating_count=new_count,
+                average_rating=new_sum / new_count,
+                score=(prior_weight * settings.LEADERBOARD_PRIOR_MEAN + new_sum) / (prior_weight + new_count),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+    def rebuild(self, session: Session) -> int:
+        """Recompute every builder's ranking columns from road_stats. Returns the number of builders."""
+        projects = dict(session.execute(
+            select(Road.builder_id, func.count()).group_by(Road.builder_id)
+        ).all())
+        ratings = {
+            builder_id: (rating_sum, rating_count)
+            for builder_id, rating_sum, rating_count in session.execute(
+                select(Road.builder_id, func.sum(RoadStats.rating_sum), func.sum(RoadStats.rating_count))
+                .join(RoadStats, RoadStats.road_id == Road.road_id)
+                .group_by(Road.builder_id)
+            ).all()
+        }
+
+        builders = session.query(Builder).all()
+        for builder in builders:
+            rating_sum, rating_count = ratings.get(builder.id, (0, 0))
+            rating_sum, rating_count = Decimal(str(rating_sum or 0)), int(rating_count or 0)
+            builder.total_projects = projects.get(builder.id, 0)
+            builder.rating_sum = rating_sum
+            builder.rating_count = rating_count
+            builder.average_rating = rating_sum / rating_count if rating_count else 0
+            builder.score = bayesian_score(rating_sum, rating_count)
+        return len(builders)
+
+
+builder_ranking_service = BuilderRankingService()
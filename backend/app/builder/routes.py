@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional
+from datetime import date
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.versioning import bump_dataset_version, conditional_get
 from app.models.builder import Builder
 from app.models.road import Road
-from app.models.rating import Rating
-from .schemas import BuilderRoadUpdate
+from app.models.road_stats import RoadStats
+from app.roads.dependencies import get_geometry_params
+from app.roads.fragments import RoadCollection, RoadCollectionResponse
+from app.roads.schemas import GeometryParams
+from app.roads.services import RoadService
+from app.tiles.services import TileService
+from app.user.rollups import rating_rollup_service
+from app.user.schemas import TrendBucket, TrendResponse
+from .schemas import BuilderRoadUpdate, LeaderboardEntry, LeaderboardResponse, LeaderboardSort, SortOrder
 
 builder_router = APIRouter(prefix="/builder", tags=["Builder"])
-
-
-@builder_router.get("/{builder_id}/roads")
-def get_builder_roads(builder_id: int, session: Session = Depends(get_db)):
+builders_router = APIRouter(prefix="/builders", tags=["Builder"])
+road_service = RoadService()
+tile_service = TileService()
+
+
+@builder_router.get("/{builder_id}/roads", response_class=RoadCollectionResponse)
+def get_builder_roads(
+    builder_id: int,
+    request: Request,
+    response: Response,
+    params: GeometryParams = Depends(get_geometry_params),
+    session: Session = Depends(get_read_db)
+):
     """
     Return roads assigned to this builder (either as owner or maintainer).
     """
@@ -20,29 +39,31 @@ def get_builder_roads(builder_id: int, session: Session = Depends(get_db)):
     if not builder:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Builder not found")
 
-    roads = session.query(Road).filter(
-        (Road.builder_id == builder.id) | (Road.maintained_by == builder.id)
-    ).all()
-
-    result = []
-    for r in roads:
-        ratings = session.query(Rating).filter(Rating.road_id == r.road_id).all()
-        average_rating = sum(float(rating.rating) for rating in ratings) / len(ratings) if ratings else None
-        result.append({
-            "road_id": getattr(r, "road_id", None),
-            "builder_id": getattr(r, "builder_id", None),
-            "maintained_by": getattr(r, "maintained_by", None),
-            "cost": str(getattr(r, "cost", None)) if getattr(r, "cost", None) is not None else None,
-            "started_date": str(getattr(r, "started_date", None)),
-            "ended_date": str(getattr(r, "ended_date", None)) if getattr(r, "ended_date", None) else None,
-            "status": getattr(r, "status", None),
-            "chief_engineer": getattr(r, "chief_engineer", None),
-            "date_verified": str(getattr(r, "date_verified", None)) if getattr(r, "date_verified", None) else None,
-            "average_rating": average_rating,
-            "polyline_data": getattr(r,"polyline_data",None),
-        })
-
-    return {"count": len(result), "roads": result}
+    # After the existence check, so a replayed ETag cannot turn a 404 into a 304
+    not_modified = conditional_get(request, response, session, params.geometry.value, params.lod_level)
+    if not_modified is not None:
+        return not_modified
+
+    owned = (Road.builder_id == builder.id) | (Road.maintained_by == builder.id)
+    revisions = session.query(Road.road_id, Road.revision).filter(owned).order_by(Road.road_id).all()
+
+    # Ratings change without touching the road, so they stay out of the cached fragment
+    totals = {
+        road_id: (rating_sum, rating_count)
+        for road_id, rating_sum, rating_count in session.query(
+            RoadStats.road_id, RoadStats.rating_sum, RoadStats.rating_count
+        ).join(Road, Road.road_id == RoadStats.road_id).filter(owned, RoadStats.rating_count > 0)
+    }
+    extra_fields = {
+        road_id: {"average_rating": float(totals[road_id][0]) / totals[road_id][1] if road_id in totals else None}
+        for road_id, _ in revisions
+    }
+
+    result = road_service.road_fragments(revisions, params, session, extra_fields)
+    return RoadCollectionResponse(
+        RoadCollection({"count": len(result), **road_service.collection_meta(params)}, result),
+        headers=response.headers,
+    )
 
 
 @builder_router.patch("/roads/{road_id}")
@@ -85,11 +106,85 @@ def update_road_by_builder(
     if not updated:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to update")
 
-    session.commit()
+    bump_dataset_version(session)
+    try:
+        session.commit()
+    except StaleDataError:
+        # Road.revision is the mapper's version counter: another update won the race
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Road was modified concurrently, retry the update",
+        )
     session.refresh(road)
+    # Tiles carry the road status, so cached tiles showing this road are stale
+    tile_service.invalidate_road(road)
 
     return {
         "road_id": road.road_id,
         "chief_engineer": road.chief_engineer,
         "status": road.status,
     }
+
+
+@builders_router.get("/leaderboard", response_model=LeaderboardResponse, status_code=status.HTTP_200_OK)
+def get_builder_leaderboard(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sort: LeaderboardSort = Query(LeaderboardSort.score),
+    order: SortOrder = Query(SortOrder.desc),
+    session: Session = Depends(get_read_db),
+):
+    """
+    Rank builders by their materialized rating aggregates. `score` is a
+    confidence-weighted average that favours builders with more ratings.
+    """
+    column = getattr(Builder, sort.value)
+    direction = column.desc() if order == SortOrder.desc else column.asc()
+    offset = (page - 1) * page_size
+
+    total = session.query(Builder).count()
+    builders = (
+        session.query(Builder)
+        .order_by(direction, Builder.id)
+        .offset(offset)
+        .limit(page_size)
+        .all()
+    )
+
+    return LeaderboardResponse(
+        page=page,
+        page_size=page_size,
+        total=total,
+        sort=sort,
+        order=order,
+        entries=[
+            LeaderboardEntry(
+                rank=offset + i + 1,
+                builder_id=b.id,
+                name=b.name,
+                average_rating=b.average_rating if b.rating_count else None,
+                rating_count=b.rating_count,
+                total_projects=b.total_projects or 0,
+                score=b.score,
+            )
+            for i, b in enumerate(builders)
+        ],
+    )
+
+
+@builders_router.get("/{builder_id}/trend", response_model=TrendResponse, status_code=status.HTTP_200_OK)
+def get_builder_trend(
+    builder_id: int,
+    bucket: TrendBucket = Query(TrendBucket.month),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    session: Session = Depends(get_read_db),
+):
+    """
+    Rating trend across all roads built by a builder, served from the
+    precomputed rollups.
+    """
+    if not session.query(Builder.id).filter(Builder.id == builder_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Builder not found")
+    return rating_rollup_service.trend_response(session, "builder", builder_id, bucket, start, end)
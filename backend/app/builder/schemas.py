@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date
+from decimal import Decimal
+from enum import Enum
 
 
 class BuilderRoadUpdate(BaseModel):
@@ -9,3 +11,34 @@ class BuilderRoadUpdate(BaseModel):
     chief_engineer: Optional[str] = Field(default=None, max_length=200)
     date_verified: Optional[date] = None
     status: Optional[str] = None
+
+
+class LeaderboardSort(str, Enum):
+    score = "score"
+    average_rating = "average_rating"
+    rating_count = "rating_count"
+    total_projects = "total_projects"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    builder_id: int
+    name: str
+    average_rating: Optional[Decimal]
+    rating_count: int
+    total_projects: int
+    score: float
+
+
+class LeaderboardResponse(BaseModel):
+    page: int
+    page_size: int
+    total: int
+    sort: LeaderboardSort
+    order: SortOrder
+    entries: List[LeaderboardEntry]
@@ -1,10 +1,31 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional, Union
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./jansetu.db"
+    # Log every SQL statement (noisy; separate from DEBUG on purpose)
+    DB_ECHO: bool = False
+
+    # SQLite (app.core.database). Pragmas applied to every new connection come
+    # from SQLITE_PROFILE ("performance", "durable" or "none"); SQLITE_PRAGMAS
+    # overrides single ones, e.g. '{"mmap_size": 0}'. Writes go through a pool
+    # of SQLITE_WRITER_POOL_SIZE connections (1 serializes them in-process;
+    # async routes write through it too), GET routes use separate read-only
+    # pools, sync and async, so they never queue behind a write.
+    SQLITE_PROFILE: str = "performance"
+    SQLITE_PRAGMAS: Dict[str, Union[int, str]] = {}
+    SQLITE_WRITER_POOL_SIZE: int = 1
+    SQLITE_READER_POOL_SIZE: int = 8
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+
+    # Query instrumentation (app.core.instrumentation): per-request query
+    # counts and DB time in a Server-Timing header, pool gauges at /health/db,
+    # and a log line for every statement slower than SLOW_QUERY_MS
+    DB_INSTRUMENTATION: bool = True
+    SERVER_TIMING: bool = True
+    SLOW_QUERY_MS: float = 200.0
     
     # JWT
     # NOTE: For development you can keep a default secret so the app starts without an
@@ -12,11 +33,58 @@ class Settings(BaseSettings):
     JWT_SECRET: str = "dev-secret"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Expired tokens are purged right away, revoked ones after this many days
+    REFRESH_TOKEN_REVOKED_RETENTION_DAYS: int = 7
+    REFRESH_TOKEN_PURGE_INTERVAL_MINUTES: int = 60
+
+    # Auth caches (app.auth.cache): verified token claims and caller principals
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    AUTH_CLAIMS_CACHE_TTL_SECONDS: float = 300.0
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Password hashing (app.auth.hashing). Raising BCRYPT_ROUNDS by one doubles
+    # the cost of a hash; existing hashes are upgraded on the next login.
+    # Logins beyond PASSWORD_HASH_MAX_PENDING in flight are refused with 503.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
     
     # App
     APP_NAME: str = "JanSetu"
     DEBUG: bool = True
     API_URL: str = "http://localhost:8000"
+
+    # Ratings
+    # A GPS-tagged rating must be within this distance of the road it rates
+    RATING_MATCH_MAX_DISTANCE_M: float = 100.0
+
+    # Write-behind mode (app.user.journal): ratings are acknowledged with 202
+    # once fsynced to a local journal and inserted in group commits every
+    # RATING_FLUSH_INTERVAL_MS or RATING_FLUSH_MAX_ROWS rows. The journal
+    # belongs to one process, so run a single worker or give each its own path.
+    RATING_WRITE_BEHIND: bool = False
+    RATING_JOURNAL_PATH: str = "journal/ratings.ndjson"
+    RATING_FLUSH_INTERVAL_MS: int = 200
+    RATING_FLUSH_MAX_ROWS: int = 500
+
+    # Builder leaderboard
+    # Scores are Bayesian averages that shrink builders with few ratings towards
+    # PRIOR_MEAN as if they had PRIOR_WEIGHT extra ratings of that value.
+    # Run scripts/rebuild_builder_stats.py after changing these.
+    LEADERBOARD_PRIOR_MEAN: float = 3.0
+    LEADERBOARD_PRIOR_WEIGHT: float = 10.0
+
+    # Road scores (app.roads.scoring): Bayesian-shrunk, time-decayed averages.
+    # A rating loses half its weight every ROAD_SCORE_HALF_LIFE_DAYS.
+    ROAD_SCORE_PRIOR_MEAN: float = 3.0
+    ROAD_SCORE_PRIOR_WEIGHT: float = 5.0
+    ROAD_SCORE_HALF_LIFE_DAYS: float = 180.0
+    ROAD_SCORE_INTERVAL_MINUTES: int = 60
+
+    # Background jobs (app.core.scheduler). Disable on all but one worker
+    # when running several processes against the same database.
+    SCHEDULER_ENABLED: bool = True
     
     class Config:
         env_file = ".env"
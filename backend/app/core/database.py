@@ -1,21 +1,142 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import Dict, Optional, Union
 from app.core.config import settings
 
+# Pragmas run on every new SQLite connection, by SQLITE_PROFILE. WAL lets
+# readers keep reading while a write is in progress; synchronous=NORMAL only
+# fsyncs at checkpoints, which is still crash-safe in WAL mode (a power loss
+# can drop the last transactions, never corrupt the file).
+SQLITE_PROFILES: Dict[str, Dict[str, Union[int, str]]] = {
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # KiB, i.e. ~64 MB per connection
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    "none": {},
+}
+
+
+def sqlite_pragmas(profile: Optional[str] = None) -> Dict[str, Union[int, str]]:
+    """Pragmas of a profile with SQLITE_PRAGMAS applied on top"""
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE {profile!r}, expected one of {sorted(SQLITE_PROFILES)}")
+    return {**SQLITE_PROFILES[profile], **settings.SQLITE_PRAGMAS}
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Union[int, str]]) -> None:
+    """Run `PRAGMA name = value` for each pragma on every connection the engine opens"""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+database_url = make_url(settings.DATABASE_URL)
+is_sqlite = database_url.get_backend_name() == "sqlite"
+# An in-memory database exists per connection, so it cannot be split into pools
+is_memory = is_sqlite and database_url.database in (None, "", ":memory:")
+
 # Create engine with SQLite-specific configuration
 connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
+pool_args = {}
+if is_sqlite:
     connect_args = {"check_same_thread": False}
+    if not is_memory:
+        pool_args = {
+            "pool_size": settings.SQLITE_WRITER_POOL_SIZE,
+            "max_overflow": 0,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        }
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=connect_args,
-    echo=settings.DEBUG
+    echo=settings.DB_ECHO,
+    **pool_args
 )
+apply_sqlite_pragmas(engine, sqlite_pragmas() if is_sqlite else {})
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only pool for GET routes. SQLite allows a single writer at a time, so
+# reads get connections of their own instead of queueing for the writer's;
+# with WAL they see the last committed state while a write is in progress.
+# Other databases already handle concurrent readers and share the engine.
+if is_sqlite and not is_memory:
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args=connect_args,
+        echo=settings.DB_ECHO,
+        pool_size=settings.SQLITE_READER_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    # query_only makes an accidental write through this pool fail loudly
+    apply_sqlite_pragmas(read_engine, {**sqlite_pragmas(), "query_only": "ON"})
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async drivers for the same database, for `async def` handlers
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one of the same backend"""
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Async routes read through an async engine of their own, set up like the
+# read pool. There is no async writer: async routes write on a get_db()
+# session in the threadpool, so the process keeps one writer connection.
+async_url = async_database_url(settings.DATABASE_URL)
+if is_sqlite and not is_memory:
+    async_read_engine = create_async_engine(
+        async_url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.SQLITE_READER_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    apply_sqlite_pragmas(async_read_engine.sync_engine, {**sqlite_pragmas(), "query_only": "ON"})
+else:
+    async_read_engine = create_async_engine(async_url, echo=settings.DB_ECHO)
+    apply_sqlite_pragmas(async_read_engine.sync_engine, sqlite_pragmas() if is_sqlite else {})
+
+# expire_on_commit=False: attributes cannot lazy-load on an AsyncSession
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -28,3 +149,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency function to get a read-only database session, for GET routes
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """
+    Dependency function to get a read-only async database session, for
+    `async def` GET routes
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,235 @@
+"""
+Database instrumentation: pool gauges, per-request query stats and a
+slow-query log, all driven by SQLAlchemy events.
+
+`instrument(app)` (called once from main.py) hooks every engine in
+app.core.database and adds an ASGI middleware that opens a RequestStats in a
+contextvar for each request. Queries run by that request, on the event loop,
+the threadpool or the async engine, add to it, and the response gets a
+`Server-Timing` header, e.g.
+
+    Server-Timing: db;dur=4.21;desc="3 queries", db-wait;dur=0.05, app;dur=9.80
+
+Pool state (size, checked out, overflow) and cumulative checkout waits per
+engine are served at GET /health/db. Statements slower than SLOW_QUERY_MS
+are logged with literals stripped from the SQL and bind parameters reduced
+to their types, so no user data ends up in the log.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Any, Dict, List, Optional
+import logging
+import re
+import threading
+import time
+from app.core.config import settings
+from app.core.database import async_read_engine, engine, read_engine
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+
+@dataclass
+class RequestStats:
+    """Database work done on behalf of one request; times in seconds"""
+    queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+
+
+# Set per request by the middleware. The object is mutated, never replaced, so
+# copies of the context (threadpool, async engine greenlets) share it.
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class PoolMetrics:
+    """Checkout counts and waits of one engine's pool, plus its live gauges"""
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                self.failures += 1
+                return
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        gauges = {"pool": type(pool).__name__}
+        # Only QueuePool and its async variant have a fixed size
+        if hasattr(pool, "size"):
+            gauges.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        with self._lock:
+            gauges.update(
+                checkouts=self.checkouts,
+                checkout_failures=self.failures,
+                checkout_wait_total_ms=round(self.wait_total * 1000, 3),
+                checkout_wait_max_ms=round(self.wait_max * 1000, 3),
+            )
+        return gauges
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,)+\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """One line of SQL with literals replaced by ? and IN lists folded, for grouping"""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?, ...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Types of the bind parameters, never their values"""
+    def shape(params: Any) -> str:
+        if isinstance(params, dict):
+            return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+        if isinstance(params, (list, tuple)):
+            return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+        return type(params).__name__
+
+    if executemany and parameters:
+        return f"{len(parameters)} x {shape(parameters[0])}"
+    return shape(parameters) if parameters else "()"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms) on %s: %s params=%s",
+            elapsed * 1000,
+            conn.engine.url.render_as_string(hide_password=True),
+            normalize_sql(statement),
+            parameter_shape(parameters, executemany),
+        )
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _time_checkouts(metrics: PoolMetrics) -> None:
+    """
+    Time every connection checkout of the engine. The pool has no event
+    before a checkout starts, so Engine.raw_connection, through which every
+    Connection gets its DBAPI connection, is wrapped on the instance.
+    """
+    raw_connection = metrics.engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            connection = raw_connection()
+        except Exception:
+            # Pool timeouts and failed connects
+            metrics.record(time.perf_counter() - started, failed=True)
+            raise
+        wait = time.perf_counter() - started
+        metrics.record(wait)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.pool_wait += wait
+        return connection
+
+    metrics.engine.raw_connection = timed_raw_connection
+
+
+pool_metrics: List[PoolMetrics] = []
+
+
+def instrument_engine(name: str, target: Engine) -> None:
+    if any(m.engine is target for m in pool_metrics):
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+    metrics = PoolMetrics(name, target)
+    _time_checkouts(metrics)
+    pool_metrics.append(metrics)
+
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    return (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+        f"db-wait;dur={stats.pool_wait * 1000:.2f}, "
+        f"app;dur={total * 1000:.2f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware).
+    Streaming responses report what ran before their first byte.
+    """
+
+    def __init__(self, app, emit_header: bool = True):
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.emit_header:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, time.perf_counter() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+
+
+def db_health() -> Dict[str, Any]:
+    """Pool gauges and checkout waits for each engine"""
+    return {"engines": {m.name: m.snapshot() for m in pool_metrics}}
+
+
+def instrument(app: FastAPI) -> None:
+    """Instrument every engine and the app; call once at import time of main.py"""
+    if not settings.DB_INSTRUMENTATION:
+        return
+    instrument_engine("writer", engine)
+    instrument_engine("reader", read_engine)
+    instrument_engine("async_reader", async_read_engine.sync_engine)
+    app.add_middleware(QueryStatsMiddleware, emit_header=settings.SERVER_TIMING)
+    app.add_api_route("/health/db", db_health, methods=["GET"], tags=["Health"])
@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination over (timestamp, id), newest first.
+
+A page is fetched with `WHERE (timestamp, id) < (cursor)` on an index that
+ends in (timestamp, id), so every page costs one index range scan no matter
+how deep it is, unlike OFFSET. Cursors are opaque to clients: base64url of
+the last row's timestamp and id.
+"""
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for a cursor this module did not produce"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_query(query, timestamp_column: Any, id_column: Any, limit: int, cursor: Optional[str] = None):
+    """
+    Restrict an ORM Query or a select() to the page after `cursor`, ordered
+    by (timestamp, id) descending, fetching one extra row to detect a next page.
+    """
+    if cursor is not None:
+        timestamp, row_id = decode_cursor(cursor)
+        # Written as a range on timestamp so the index can seek to the cursor
+        query = query.filter(
+            timestamp_column <= timestamp,
+            or_(timestamp_column < timestamp, and_(timestamp_column == timestamp, id_column < row_id)),
+        )
+    return query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def keyset_result(
+    rows: List[Any],
+    timestamp_column: Any,
+    id_column: Any,
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim the rows of a keyset_query() to one page and compute the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+
+def keyset_page(
+    query: Query,
+    timestamp_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Return one page of `query` ordered by (timestamp, id) descending, and the
+    cursor of the next page (None on the last page).
+    """
+    rows = keyset_query(query, timestamp_column, id_column, limit, cursor).all()
+    return keyset_result(rows, timestamp_column, id_column, limit)
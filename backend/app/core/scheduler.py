@@ -0,0 +1,77 @@
+"""
+Minimal in-process scheduler for periodic maintenance jobs.
+
+Jobs are registered with `scheduler.register()` in main.py and run on
+daemon threads between the application's startup and shutdown events. Each
+job sleeps for its interval after a run finishes, so a slow run never
+overlaps the next one. Failures are logged and the job keeps its schedule.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    interval_seconds: float
+    func: Callable[[], None]
+    run_at_start: bool = False
+    last_error: str = field(default="", repr=False)
+
+
+class Scheduler:
+    """Registry of periodic jobs run on background threads"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def register(self, name: str, interval_seconds: float, func: Callable[[], None], run_at_start: bool = False) -> None:
+        if name in self._jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        self._jobs[name] = Job(name, interval_seconds, func, run_at_start)
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for job in self._jobs.values():
+            thread = threading.Thread(target=self._loop, args=(job,), name=f"job-{job.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_now(self, name: str) -> None:
+        """Run a job synchronously, e.g. from a script"""
+        self._run(self._jobs[name])
+
+    def _loop(self, job: Job) -> None:
+        if job.run_at_start:
+            self._run(job)
+        while not self._stop.wait(job.interval_seconds):
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        try:
+            job.func()
+            job.last_error = ""
+        except Exception as e:
+            job.last_error = str(e)
+            logger.exception("Scheduled job %s failed", job.name)
+
+
+scheduler = Scheduler()
@@ -0,0 +1,85 @@
+"""
+Dataset version for conditional GETs on road collections.
+
+Every write that can change a road listing (road create/update, ratings,
+reviews) calls bump_dataset_version() inside its own transaction. Listings
+derive a strong ETag from the version, so a client that already holds the
+current representation gets a 304 after a single primary-key read instead of
+the whole road table.
+"""
+from fastapi import Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+from app.models.dataset_version import DatasetVersion
+
+DATASET_VERSION_ID = 1
+
+
+def _version_query():
+    return select(DatasetVersion.version).where(DatasetVersion.id == DATASET_VERSION_ID)
+
+
+def get_dataset_version(session: Session) -> int:
+    return session.execute(_version_query()).scalar() or 0
+
+
+async def get_dataset_version_async(session: AsyncSession) -> int:
+    return (await session.execute(_version_query())).scalar() or 0
+
+
+def bump_dataset_version(session: Session) -> None:
+    """Increment the version; commits with the caller's transaction"""
+    result = session.execute(
+        update(DatasetVersion)
+        .where(DatasetVersion.id == DATASET_VERSION_ID)
+        .values(version=DatasetVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        session.add(DatasetVersion(id=DATASET_VERSION_ID, version=1))
+
+
+def collection_etag(version: int, *variant: Any) -> str:
+    """Strong ETag for a listing at `version`; `variant` distinguishes representations"""
+    parts = [str(version), *(str(v) for v in variant)]
+    return '"' + "-".join(parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_get(request: Request, response: Response, session: Session, *variant: Any) -> Optional[Response]:
+    """
+    Tag `response` with the current collection ETag. Returns a 304 response
+    that the route should return as-is when the client is already up to date.
+    """
+    return _conditional_response(request, response, get_dataset_version(session), *variant)
+
+
+async def conditional_get_async(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    *variant: Any,
+) -> Optional[Response]:
+    """conditional_get() for routes on an AsyncSession"""
+    return _conditional_response(request, response, await get_dataset_version_async(session), *variant)
+
+
+def _conditional_response(request: Request, response: Response, version: int, *variant: Any) -> Optional[Response]:
+    etag = collection_etag(version, *variant)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
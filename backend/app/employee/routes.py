@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.versioning import bump_dataset_version, conditional_get
 from app.models.builder import Builder
 import json
 from app.models.employee import Employee
 from app.models.road import Road
+from app.roads.dependencies import get_geometry_params
+from app.roads.fragments import RoadCollection, RoadCollectionResponse
+from app.roads.schemas import GeometryParams
+from app.roads.services import RoadService
+from app.builder.ranking import builder_ranking_service
+from app.roads.stats import road_stats_service
+from app.tiles.services import TileService
 from .schemas import RoadCreate
 
 employee_router = APIRouter(prefix="/employee", tags=["Employee"])
+road_service = RoadService()
+tile_service = TileService()
 
 
 @employee_router.post("/add_road", status_code=status.HTTP_201_CREATED)
@@ -55,15 +65,24 @@ def create_road(
         ended_date=payload.ended_date,
         builder_id=builder.id,
         employee_id=assigned_employee_unique,
-        polyline_data=payload.polyline,
         maintained_by=builder.id,
         chief_engineer="",
         date_verified=payload.date_verified
     )
+    try:
+        road_service.apply_geometry(road, payload.polyline)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     session.add(road)
+    session.flush()
+    road_service.save_geometry(road, session)
+    road_stats_service.create(session, road.road_id)
+    builder_ranking_service.record_roads(session, [road])
+    bump_dataset_version(session)
     session.commit()
     session.refresh(road)
+    tile_service.invalidate_road(road)
 
     return {
         "road_id": road.road_id,
@@ -74,10 +93,13 @@ def create_road(
         "ended_date": str(road.ended_date) if road.ended_date else None,
     }
 
-@employee_router.get("/inspector/roads")
+@employee_router.get("/inspector/roads", response_class=RoadCollectionResponse)
 def get_inspector_roads(
     inspector_unique_id: int,
-    session: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    params: GeometryParams = Depends(get_geometry_params),
+    session: Session = Depends(get_read_db),
 ):
     """
     Return roads assigned to the inspector corresponding to the authenticated user.
@@ -90,24 +112,17 @@ def get_inspector_roads(
             detail="Inspector profile not found for provided unique id"
         )
 
-    roads = session.query(Road).filter(Road.employee_id == inspector.unique_id).all()
-
-    result = []
-    for r in roads:
-        # ✅ Parse polyline data safely
-        raw_polyline = getattr(r, "polyline_data", None)
+    # After the existence check, so a replayed ETag cannot hide a missing inspector
+    not_modified = conditional_get(request, response, session, params.geometry.value, params.lod_level)
+    if not_modified is not None:
+        return not_modified
 
-        result.append({
-            "road_id": getattr(r, "road_id", None),
-            "builder_id": getattr(r, "builder_id", None),
-            "maintained_by": getattr(r, "maintained_by", None),
-            "cost": str(getattr(r, "cost", None)) if getattr(r, "cost", None) is not None else None,
-            "started_date": str(getattr(r, "started_date", None)),
-            "ended_date": str(getattr(r, "ended_date", None)) if getattr(r, "ended_date", None) else None,
-            "status": getattr(r, "status", None),
-            "chief_engineer": getattr(r, "chief_engineer", None),
-            "date_verified": str(getattr(r, "date_verified", None)) if getattr(r, "date_verified", None) else None,
-            "polyline_data": raw_polyline, 
-        })
+    revisions = session.query(Road.road_id, Road.revision).filter(
+        Road.employee_id == inspector.unique_id
+    ).order_by(Road.road_id).all()
 
-    return {"count": len(result), "roads": result}
+    result = road_service.road_fragments(revisions, params, session)
+    return RoadCollectionResponse(
+        RoadCollection({"count": len(result), **road_service.collection_meta(params)}, result),
+        headers=response.headers,
+    )
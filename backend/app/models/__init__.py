@@ -5,5 +5,15 @@ from app.models.road import Road
 from app.models.rating import Rating
 from app.models.review import Review
 from app.models.refresh_token import RefreshToken
+from app.models.road_lod import RoadLOD
+from app.models.dataset_version import DatasetVersion
+from app.models.road_stats import RoadStats
+from app.models.rating_rollup import RatingRollup
+from app.models.review_tag import ReviewTag, RoadTagCount, TagCount
+from app.models.journal_checkpoint import JournalCheckpoint
 
-__all__ = ["User", "Builder", "Employee", "Road", "Rating", "Review", "RefreshToken"]
+__all__ = [
+    "User", "Builder", "Employee", "Road", "Rating", "Review", "RefreshToken", "RoadLOD",
+    "DatasetVersion", "RoadStats", "RatingRollup", "ReviewTag", "RoadTagCount", "TagCount",
+    "JournalCheckpoint",
+]
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DECIMAL
+from sqlalchemy import Column, Integer, String, DECIMAL, Float, Index
 from sqlalchemy.orm import relationship
+from app.core.config import settings
 from app.core.database import Base
 
 
@@ -8,8 +9,13 @@ class Builder(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String, nullable=False)
+    # Materialized by app.builder.ranking from the rating and road write paths
     average_rating = Column(DECIMAL(3, 2), default=0.0)
     total_projects = Column(Integer, default=0)
+    rating_sum = Column(DECIMAL(14, 1), nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Confidence-weighted (Bayesian) average rating used for ranking
+    score = Column(Float, nullable=False, default=lambda: settings.LEADERBOARD_PRIOR_MEAN)
     hyperlink = Column(String, nullable=True)
     email = Column(String, unique=True, nullable=False, index=True)
     phone = Column(String, unique=True, nullable=True, index=True)
@@ -23,5 +29,9 @@ class Builder(Base):
         foreign_keys="Road.maintained_by"
     )
 
+    __table_args__ = (
+        Index("ix_builder_score", "score"),
+    )
+
     def __repr__(self):
         return f"<Builder(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+
+class JournalCheckpoint(Base):
+    """Last journal sequence number applied to the database, per journal"""
+    __tablename__ = "journal_checkpoint"
+
+    name = Column(String, primary_key=True)
+    last_seq = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<JournalCheckpoint(name={self.name}, last_seq={self.last_seq})>"
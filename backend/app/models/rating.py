@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey
+from sqlalchemy import Index, Column, Integer, String, DECIMAL, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -17,5 +17,10 @@ class Rating(Base):
     road = relationship("Road", back_populates="ratings")
     user = relationship("User", back_populates="ratings")
 
+    __table_args__ = (
+        # Keyset pagination of a road's ratings, newest first (app.core.pagination)
+        Index("ix_rating_road_timestamp", "road_id", "timestamp", "rating_id"),
+    )
+
     def __repr__(self):
         return f"<Rating(rating_id={self.rating_id}, rating={self.rating}, timestamp={self.timestamp}, location={self.location})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DECIMAL, Date
+from app.core.database import Base
+
+
+class RatingRollup(Base):
+    """
+    Ratings of one road or builder aggregated over one day, week or month,
+    maintained incrementally by app.user.rollups.
+    """
+    __tablename__ = "rating_rollup"
+
+    scope = Column(String, primary_key=True)          # "road" or "builder"
+    scope_id = Column(Integer, primary_key=True)      # road_id or builder id
+    bucket = Column(String, primary_key=True)         # "day", "week" or "month"
+    bucket_start = Column(Date, primary_key=True)     # First day of the bucket (weeks start on Monday)
+    rating_count = Column(Integer, nullable=False)
+    rating_sum = Column(DECIMAL(12, 1), nullable=False)
+    rating_min = Column(DECIMAL(2, 1), nullable=False)
+    rating_max = Column(DECIMAL(2, 1), nullable=False)
+
+    def __repr__(self):
+        return f"<RatingRollup({self.scope}={self.scope_id}, {self.bucket} {self.bucket_start}, count={self.rating_count})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Index, Column, Integer, String, DateTime, Boolean, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -9,7 +9,8 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
-    token = Column(String, unique=True, nullable=False, index=True)
+    # SHA-256 digest of the token handed to the client (app.auth.tokens)
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     is_revoked = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -20,6 +21,12 @@ class RefreshToken(Base):
     # Relationships
     user = relationship("User", back_populates="refresh_tokens")
 
+    __table_args__ = (
+        # Revoking a user's live tokens, and purging expired ones
+        Index("ix_refresh_token_user_revoked", "user_id", "is_revoked"),
+        Index("ix_refresh_token_expires_at", "expires_at"),
+    )
+
     def __repr__(self):
         return f"<RefreshToken(id={self.id}, user_id={self.user_id}, is_revoked={self.is_revoked})>"
 
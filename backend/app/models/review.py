@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -17,5 +17,10 @@ class Review(Base):
     road = relationship("Road", back_populates="reviews")
     user = relationship("User", back_populates="reviews")
 
+    __table_args__ = (
+        # Keyset pagination of a road's reviews, newest first (app.core.pagination)
+        Index("ix_review_road_timestamp", "road_id", "timestamp", "review_id"),
+    )
+
     def __repr__(self):
         return f"<Review(review_id={self.review_id}, timestamp={self.timestamp})>"
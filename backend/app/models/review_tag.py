@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, text
+from app.core.database import Base
+
+
+class ReviewTag(Base):
+    """One tag of one review, parsed from Review.tags and normalized (see app.user.tags)"""
+    __tablename__ = "review_tag"
+
+    review_id = Column(Integer, ForeignKey("review.review_id"), primary_key=True)
+    tag = Column(String, primary_key=True)
+    road_id = Column(Integer, ForeignKey("road.road_id"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_review_tag_tag_road", "tag", "road_id"),
+    )
+
+    def __repr__(self):
+        return f"<ReviewTag(review_id={self.review_id}, tag='{self.tag}')>"
+
+
+class RoadTagCount(Base):
+    """Number of reviews of a road carrying a tag"""
+    __tablename__ = "road_tag_count"
+
+    road_id = Column(Integer, ForeignKey("road.road_id"), primary_key=True)
+    tag = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Top-k roads per tag, ties included, in index order
+        Index("ix_road_tag_count_tag_count", "tag", text("count DESC"), "road_id"),
+    )
+
+    def __repr__(self):
+        return f"<RoadTagCount(road_id={self.road_id}, tag='{self.tag}', count={self.count})>"
+
+
+class TagCount(Base):
+    """City-wide number of reviews carrying a tag"""
+    __tablename__ = "tag_count"
+
+    tag = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<TagCount(tag='{self.tag}', count={self.count})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Date, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DECIMAL, Date, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -7,7 +7,10 @@ class Road(Base):
     __tablename__ = "road"
 
     road_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    polyline_data = Column(JSON, nullable=False)
+    # Geometry is stored as an encoded polyline (see app.roads.polyline);
+    # polyline_data only holds rows written before the encoded format existed
+    polyline_encoded = Column(Text, nullable=True)
+    polyline_data = Column(JSON, nullable=True)
     cost = Column(DECIMAL(15, 2), nullable=False)
     started_date = Column(Date, nullable=False)
     ended_date = Column(Date, nullable=True)
@@ -17,6 +20,13 @@ class Road(Base):
     chief_engineer = Column(String, nullable=True)
     date_verified = Column(Date, nullable=True)
     status = Column(String, default="under_construction")  
+    # Bounding box of polyline_data, kept in sync by RoadService.apply_geometry
+    min_lat = Column(Float, nullable=True)
+    min_lng = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
+    max_lng = Column(Float, nullable=True)
+    # Incremented by the ORM on every update; keys the serialized-road cache (app.roads.fragments)
+    revision = Column(Integer, nullable=False, server_default="1")
     
     builder = relationship("Builder", back_populates="roads", foreign_keys=[builder_id])
     employee = relationship(
@@ -31,6 +41,16 @@ class Road(Base):
     )
     ratings = relationship("Rating", back_populates="road", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="road", cascade="all, delete-orphan")
+    stats = relationship("RoadStats", back_populates="road", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_road_bbox", "min_lng", "max_lng", "min_lat", "max_lat"),
+        # Roads of a builder (owner or maintainer, via a multi-index OR) and of an inspector
+        Index("ix_road_builder_id", "builder_id"),
+        Index("ix_road_maintained_by", "maintained_by"),
+        Index("ix_road_employee_id", "employee_id"),
+    )
+    __mapper_args__ = {"version_id_col": revision}
 
     def __repr__(self):
         return f"<Road(road_id={self.road_id}, chief_engineer='{self.chief_engineer}')>"
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey
+from app.core.database import Base
+
+
+class RoadLOD(Base):
+    """Precomputed simplified geometry of a road at one level of detail"""
+    __tablename__ = "road_lod"
+
+    road_id = Column(Integer, ForeignKey("road.road_id"), primary_key=True)
+    level = Column(Integer, primary_key=True)  # Target map zoom, see app.roads.simplify.LOD_ZOOMS
+    polyline_encoded = Column(Text, nullable=False)
+    point_count = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<RoadLOD(road_id={self.road_id}, level={self.level}, point_count={self.point_count})>"
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, DECIMAL, DateTime, Float, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class RoadStats(Base):
+    """
+    Rating and review aggregates of a road, maintained incrementally by
+    app.roads.stats in the same transaction as each rating/review write.
+    """
+    __tablename__ = "road_stats"
+
+    road_id = Column(Integer, ForeignKey("road.road_id"), primary_key=True)
+    rating_sum = Column(DECIMAL(12, 1), nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    # Histogram of ratings by whole star: [0, 1), [1, 2), [2, 3), [3, 4), [4, 5]
+    rating_hist_0 = Column(Integer, nullable=False, default=0)
+    rating_hist_1 = Column(Integer, nullable=False, default=0)
+    rating_hist_2 = Column(Integer, nullable=False, default=0)
+    rating_hist_3 = Column(Integer, nullable=False, default=0)
+    rating_hist_4 = Column(Integer, nullable=False, default=0)
+    review_count = Column(Integer, nullable=False, default=0)
+    last_rating_at = Column(DateTime, nullable=True)
+    # Bayesian, time-decayed score written in batch by app.roads.scoring
+    score = Column(Float, nullable=True)
+    score_computed_at = Column(DateTime, nullable=True)
+
+    road = relationship("Road", back_populates="stats")
+
+    @property
+    def histogram(self):
+        return [self.rating_hist_0, self.rating_hist_1, self.rating_hist_2, self.rating_hist_3, self.rating_hist_4]
+
+    def __repr__(self):
+        return f"<RoadStats(road_id={self.road_id}, rating_count={self.rating_count}, review_count={self.review_count})>"
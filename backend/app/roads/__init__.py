@@ -0,0 +1,3 @@
+from .routes import roads_router
+
+__all__ = ["roads_router"]
@@ -0,0 +1,12 @@
+from fastapi import Query
+from typing import Optional
+from .schemas import GeometryFormat, GeometryParams
+
+
+def get_geometry_params(
+    geometry: GeometryFormat = Query(GeometryFormat.json, description="Polyline wire format"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom; serves a matching simplified geometry"),
+    tolerance: Optional[float] = Query(None, gt=0, description="Maximum simplification error in metres"),
+) -> GeometryParams:
+    """Geometry rendering options shared by the road listing endpoints"""
+    return GeometryParams(geometry=geometry, zoom=zoom, tolerance=tolerance)
@@ -0,0 +1,96 @@
+"""
+Pre-serialized road payloads.
+
+Serializing a road (ORM attribute access, Decimal/date conversion, decoding
+its polyline) costs far more than copying bytes, and a road changes rarely
+compared to how often the map lists it. Each road is therefore encoded once
+per geometry variant with orjson and kept as bytes, keyed by road_id and
+checked against `Road.revision`, which the ORM bumps on every update.
+Collection responses are then a concatenation of cached fragments.
+"""
+from collections import OrderedDict
+from fastapi.responses import Response
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
+import threading
+import orjson
+
+
+class RoadFragmentCache:
+    """Thread-safe LRU of (road_id, variant) -> (revision, JSON bytes)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[int, Hashable], Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        revisions: Sequence[Tuple[int, int]],
+        variant: Hashable,
+    ) -> Tuple[Dict[int, bytes], List[int]]:
+        """
+        Look up (road_id, revision) pairs. Returns the fresh fragments by
+        road_id and the road_ids that are missing or stale.
+        """
+        found: Dict[int, bytes] = {}
+        missing: List[int] = []
+        with self._lock:
+            for road_id, revision in revisions:
+                key = (road_id, variant)
+                item = self._items.get(key)
+                if item is None or item[0] != revision:
+                    missing.append(road_id)
+                    continue
+                self._items.move_to_end(key)
+                found[road_id] = item[1]
+        return found, missing
+
+    def put(self, road_id: int, revision: int, variant: Hashable, fragment: bytes) -> None:
+        with self._lock:
+            key = (road_id, variant)
+            self._items[key] = (revision, fragment)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def with_fields(fragment: bytes, fields: Dict[str, Any]) -> bytes:
+    """Append per-request fields to a cached JSON object without re-encoding it"""
+    if not fields:
+        return fragment
+    extra = orjson.dumps(fields)
+    if fragment == b"{}":
+        return extra
+    return fragment[:-1] + b"," + extra[1:]
+
+
+class RoadCollection:
+    """Envelope fields plus a list of pre-serialized items"""
+
+    def __init__(self, meta: Dict[str, Any], items: List[bytes], items_key: str = "roads"):
+        self.meta = meta
+        self.items = items
+        self.items_key = items_key
+
+
+class RoadCollectionResponse(Response):
+    """
+    JSON response that splices cached fragments into the envelope. Routes opt
+    in with `response_class=RoadCollectionResponse` and return an instance;
+    other content is encoded with orjson.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if not isinstance(content, RoadCollection):
+            return orjson.dumps(content)
+        head = orjson.dumps({**content.meta, content.items_key: []})
+        # head ends with `[]}`: open the list, splice the items, close it again
+        return b"".join((head[:-2], b",".join(content.items), b"]}"))
+
+
+road_fragment_cache = RoadFragmentCache(max_size=100_000)
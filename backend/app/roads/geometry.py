@@ -0,0 +1,120 @@
+"""
+Geometry helpers for road polylines.
+
+Polylines are lists of {"lat": ..., "lng": ...} points as sent by the map
+frontend. Bounding boxes are (min_lng, min_lat, max_lng, max_lat) tuples, the
+same order used by the `bbox` query parameter.
+"""
+import math
+from typing import Any, Dict, List, Tuple
+
+BBox = Tuple[float, float, float, float]
+
+# Equirectangular approximation, accurate to well under 1% at city scale
+METERS_PER_DEGREE_LAT = 111_320.0
+
+
+def point_coords(point: Dict[str, Any]) -> Tuple[float, float]:
+    """Return (lat, lng) of a polyline point, raising ValueError if it is malformed"""
+    try:
+        lat = float(point["lat"])
+        lng = float(point["lng"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid polyline point: {point!r}")
+
+    if not -90.0 <= lat <= 90.0 or not -180.0 <= lng <= 180.0:
+        raise ValueError(f"Polyline point out of range: {point!r}")
+    return lat, lng
+
+
+def polyline_bbox(points: List[Dict[str, Any]]) -> BBox:
+    """Compute the bounding box of a polyline"""
+    if not points:
+        raise ValueError("Polyline has no points")
+
+    coords = [point_coords(p) for p in points]
+    lats = [lat for lat, _ in coords]
+    lngs = [lng for _, lng in coords]
+    return min(lngs), min(lats), max(lngs), max(lats)
+
+
+def parse_bbox(value: str) -> BBox:
+    """Parse a 'minLng,minLat,maxLng,maxLat' string into a bounding box"""
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError("bbox must have four comma-separated values: minLng,minLat,maxLng,maxLat")
+
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(p) for p in parts)
+    except ValueError:
+        raise ValueError("bbox values must be numbers")
+
+    if min_lng > max_lng or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed maximums")
+    if min_lat < -90.0 or max_lat > 90.0 or min_lng < -180.0 or max_lng > 180.0:
+        raise ValueError("bbox is outside valid longitude/latitude range")
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def meters_to_degrees(meters: float, lat: float) -> Tuple[float, float]:
+    """Convert a distance at latitude `lat` into (degrees of latitude, degrees of longitude)"""
+    d_lat = meters / METERS_PER_DEGREE_LAT
+    d_lng = meters / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return d_lat, d_lng
+
+
+def bbox_distance_m(lat: float, lng: float, bbox: BBox) -> float:
+    """Distance in metres from a point to the nearest edge of a bounding box (0 if inside)"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    d_lng = max(min_lng - lng, 0.0, lng - max_lng)
+    d_lat = max(min_lat - lat, 0.0, lat - max_lat)
+    dx = d_lng * METERS_PER_DEGREE_LAT * math.cos(math.radians(lat))
+    dy = d_lat * METERS_PER_DEGREE_LAT
+    return math.hypot(dx, dy)
+
+
+def _clip_segment(x0: float, y0: float, x1: float, y1: float, bbox: BBox):
+    """Liang-Barsky: parameter range (t0, t1) of a segment inside bbox, or None"""
+    min_x, min_y, max_x, max_y = bbox
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - min_x), (dx, max_x - x0), (-dy, y0 - min_y), (dy, max_y - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        r = q / p
+        if p < 0:
+            if r > t1:
+                return None
+            t0 = max(t0, r)
+        else:
+            if r < t0:
+                return None
+            t1 = min(t1, r)
+    return t0, t1
+
+
+def clip_polyline(points: List[Dict[str, float]], bbox: BBox) -> List[List[Dict[str, float]]]:
+    """
+    Clip a polyline to a bounding box. Returns the pieces that lie inside it;
+    a line that leaves and re-enters the box yields several pieces.
+    """
+    parts: List[List[Dict[str, float]]] = []
+    current = None
+    for a, b in zip(points, points[1:]):
+        clipped = _clip_segment(a["lng"], a["lat"], b["lng"], b["lat"], bbox)
+        if clipped is None:
+            current = None
+            continue
+        t0, t1 = clipped
+        d_lat, d_lng = b["lat"] - a["lat"], b["lng"] - a["lng"]
+        start = {"lat": a["lat"] + t0 * d_lat, "lng": a["lng"] + t0 * d_lng}
+        end = {"lat": a["lat"] + t1 * d_lat, "lng": a["lng"] + t1 * d_lng}
+        if current is None or t0 > 0.0:
+            current = [start]
+            parts.append(current)
+        current.append(end)
+        if t1 < 1.0:
+            current = None
+    return parts
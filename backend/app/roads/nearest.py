@@ -0,0 +1,162 @@
+"""
+Nearest-road matching for GPS points.
+
+Candidates are the roads whose bounding box lies within the search radius
+(via the spatial index). All of their segments are then measured against the
+point in one vectorized NumPy pass on a local equirectangular plane, so the
+cost per lookup is one indexed query plus a few array operations. Decoded
+road coordinates are kept in a bounded LRU cache keyed by the stored
+geometry, so an edited road is re-decoded automatically.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+import math
+import threading
+import numpy as np
+from .geometry import METERS_PER_DEGREE_LAT, meters_to_degrees
+from .polyline import decode_polyline, encode_polyline
+from .spatial_index import spatial_index
+
+
+@dataclass
+class RoadMatch:
+    road_id: int
+    distance_m: float
+    lat: float  # Closest point on the road
+    lng: float
+
+
+class _CoordinateCache:
+    """Thread-safe LRU of road_id -> (geometry key, lat array, lng array)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[int, Tuple[str, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, road_id: int, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            item = self._items.get(road_id)
+            if item is None or item[0] != key:
+                return None
+            self._items.move_to_end(road_id)
+            return item[1], item[2]
+
+    def put(self, road_id: int, key: str, lats: np.ndarray, lngs: np.ndarray) -> None:
+        with self._lock:
+            self._items[road_id] = (key, lats, lngs)
+            self._items.move_to_end(road_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class RoadMatcher:
+    """Finds the roads closest to a latitude/longitude"""
+
+    DEFAULT_MAX_DISTANCE_M = 200.0
+    CACHE_SIZE = 20_000
+
+    def __init__(self):
+        self._cache = _CoordinateCache(self.CACHE_SIZE)
+        self._queries = {}
+
+    def _candidates_query(self, session: Session):
+        """Candidate roads in a window; built once per dialect since this is the hot path"""
+        dialect = session.get_bind().dialect.name
+        query = self._queries.get(dialect)
+        if query is None:
+            query = text(
+                "SELECT road_id, polyline_encoded, polyline_data FROM road "
+                f"WHERE road_id IN ({spatial_index.intersecting_ids_sql(session)})"
+            )
+            self._queries[dialect] = query
+        return query
+
+    def _coordinates(self, road_id: int, encoded: Optional[str], legacy_points) -> Tuple[np.ndarray, np.ndarray]:
+        key = encoded if encoded is not None else encode_polyline(legacy_points or [])
+        cached = self._cache.get(road_id, key)
+        if cached is not None:
+            return cached
+        points = decode_polyline(key)
+        lats = np.fromiter((p["lat"] for p in points), dtype=np.float64, count=len(points))
+        lngs = np.fromiter((p["lng"] for p in points), dtype=np.float64, count=len(points))
+        self._cache.put(road_id, key, lats, lngs)
+        return lats, lngs
+
+    def nearest_roads(
+        self,
+        session: Session,
+        lat: float,
+        lng: float,
+        k: int = 3,
+        max_distance_m: float = DEFAULT_MAX_DISTANCE_M,
+    ) -> List[RoadMatch]:
+        """Return up to k roads within max_distance_m of the point, closest first"""
+        d_lat, d_lng = meters_to_degrees(max_distance_m, lat)
+        rows = session.execute(
+            self._candidates_query(session),
+            {"min_lng": lng - d_lng, "min_lat": lat - d_lat, "max_lng": lng + d_lng, "max_lat": lat + d_lat},
+        ).all()
+        if not rows:
+            return []
+
+        # Gather every segment of every candidate road into flat arrays
+        seg_lat0, seg_lng0, seg_lat1, seg_lng1, seg_road = [], [], [], [], []
+        road_ids = []
+        for row in rows:
+            lats, lngs = self._coordinates(row.road_id, row.polyline_encoded, row.polyline_data)
+            if len(lats) == 0:
+                continue
+            if len(lats) == 1:
+                # Degenerate road: treat the single point as a zero-length segment
+                lats, lngs = np.repeat(lats, 2), np.repeat(lngs, 2)
+            seg_lat0.append(lats[:-1])
+            seg_lng0.append(lngs[:-1])
+            seg_lat1.append(lats[1:])
+            seg_lng1.append(lngs[1:])
+            seg_road.append(np.full(len(lats) - 1, len(road_ids), dtype=np.int64))
+            road_ids.append(row.road_id)
+        if not road_ids:
+            return []
+
+        # Project onto a plane in metres centred on the query point
+        kx = METERS_PER_DEGREE_LAT * math.cos(math.radians(lat))
+        ky = METERS_PER_DEGREE_LAT
+        ax = (np.concatenate(seg_lng0) - lng) * kx
+        ay = (np.concatenate(seg_lat0) - lat) * ky
+        dx = (np.concatenate(seg_lng1) - lng) * kx - ax
+        dy = (np.concatenate(seg_lat1) - lat) * ky - ay
+        owner = np.concatenate(seg_road)
+
+        # Closest point on each segment to the origin
+        seg_len2 = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(seg_len2 > 0.0, -(ax * dx + ay * dy) / seg_len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        cx = ax + t * dx
+        cy = ay + t * dy
+        dist = np.hypot(cx, cy)
+
+        # Best segment per road
+        order = np.lexsort((dist, owner))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = owner[order][1:] != owner[order][:-1]
+        best = order[first]
+        best = best[dist[best] <= max_distance_m]
+        best = best[np.argsort(dist[best])][:k]
+
+        return [
+            RoadMatch(
+                road_id=road_ids[owner[i]],
+                distance_m=float(dist[i]),
+                lat=float(lat + cy[i] / ky),
+                lng=float(lng + cx[i] / kx),
+            )
+            for i in best
+        ]
+
+
+road_matcher = RoadMatcher()
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.database import ReadSessionLocal, get_read_db
+from .dependencies import get_geometry_params
+from .geometry import parse_bbox
+from .nearest import road_matcher
+from .schemas import ExportFormat, GeometryParams, NearestRoad, NearestRoadsResponse
+from .services import RoadService
+
+roads_router = APIRouter(prefix="/roads", tags=["Roads"])
+road_service = RoadService()
+
+
+@roads_router.get("", status_code=status.HTTP_200_OK)
+def get_roads_in_bbox(
+    bbox: str = Query(..., description="Viewport as minLng,minLat,maxLng,maxLat"),
+    limit: int = Query(500, ge=1, le=5000),
+    params: GeometryParams = Depends(get_geometry_params),
+    session: Session = Depends(get_read_db)
+):
+    """
+    Return the roads whose bounding box intersects the given viewport.
+    `truncated` is true when more roads matched than `limit`.
+    """
+    try:
+        viewport = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    roads, truncated = road_service.roads_in_bbox(viewport, limit, session)
+    geometries = road_service.geometries_for(roads, params, session)
+    result = [road_service.serialize_road(r, geometries[r.road_id]) for r in roads]
+
+    return {
+        "count": len(result),
+        "truncated": truncated,
+        **road_service.collection_meta(params),
+        "roads": result,
+    }
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.geojson: "application/geo+json",
+}
+
+
+@roads_router.get("/export", status_code=status.HTTP_200_OK)
+def export_roads(format: ExportFormat = Query(ExportFormat.ndjson)):
+    """
+    Stream every road as NDJSON (one road per line) or a GeoJSON
+    FeatureCollection. Rows are read and written in batches, so memory use
+    does not depend on the size of the network.
+    """
+    def stream():
+        # The stream outlives this handler, so it owns its session
+        session = ReadSessionLocal()
+        try:
+            yield from road_service.export_roads(session, format)
+        finally:
+            session.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="roads.{format.value}"'},
+    )
+
+
+@roads_router.get("/nearest", response_model=NearestRoadsResponse, status_code=status.HTTP_200_OK)
+def get_nearest_roads(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(3, ge=1, le=50),
+    max_distance: float = Query(200.0, gt=0, le=5000, description="Search radius in metres"),
+    session: Session = Depends(get_read_db)
+):
+    """
+    Return the roads closest to a GPS point with their distance in metres and
+    the closest point on each road.
+    """
+    matches = road_matcher.nearest_roads(session, lat, lng, k=k, max_distance_m=max_distance)
+    return NearestRoadsResponse(
+        lat=lat,
+        lng=lng,
+        matches=[NearestRoad(**vars(m)) for m in matches],
+    )
@@ -0,0 +1,45 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import List, Optional
+from .simplify import lod_for_tolerance, lod_for_zoom
+
+
+class GeometryFormat(str, Enum):
+    """Wire format for road polylines in listing responses"""
+    json = "json"          # polyline_data: [{"lat": ..., "lng": ...}, ...]
+    encoded = "encoded"    # polyline_encoded: encoded polyline string
+
+
+class ExportFormat(str, Enum):
+    """Output format of the full road export"""
+    ndjson = "ndjson"      # One serialized road per line
+    geojson = "geojson"    # A single FeatureCollection of LineStrings
+
+
+class GeometryParams(BaseModel):
+    """How road listings should render geometry"""
+    geometry: GeometryFormat = GeometryFormat.json
+    zoom: Optional[int] = None
+    tolerance: Optional[float] = None  # metres
+
+    @property
+    def lod_level(self) -> Optional[int]:
+        """Precomputed LOD level to serve, or None for full resolution. zoom wins over tolerance."""
+        if self.zoom is not None:
+            return lod_for_zoom(self.zoom)
+        if self.tolerance is not None:
+            return lod_for_tolerance(self.tolerance)
+        return None
+
+
+class NearestRoad(BaseModel):
+    road_id: int
+    distance_m: float
+    lat: float  # Closest point on the road
+    lng: float
+
+
+class NearestRoadsResponse(BaseModel):
+    lat: float
+    lng: float
+    matches: List[NearestRoad]
@@ -0,0 +1,127 @@
+"""
+Batch road scores: Bayesian shrinkage with exponential time decay.
+
+    w_i   = 0.5 ** (age_days_i / half_life)
+    score = (C * m + sum(w_i * r_i)) / (C + sum(w_i))
+
+The prior (mean m, weight C) pulls roads with few or old ratings towards m,
+so one 5-star rating does not beat 400 ratings averaging 4.6, and recent
+ratings count more than old ones. All ratings are read column-wise into NumPy
+arrays (age computed by the database) and every road is scored in one
+vectorized pass; results are written back to road_stats with a single
+executemany. Runs periodically through app.core.scheduler and on demand via
+scripts/compute_road_scores.py.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Float, bindparam, cast, func, select, update
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+import logging
+import time
+import numpy as np
+from app.core.config import settings
+from app.core.database import ReadSessionLocal, SessionLocal
+from app.models.rating import Rating
+from app.models.road_stats import RoadStats
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+JULIAN_DAY_UNIX_EPOCH = 2440587.5
+
+
+class RoadScoringService:
+    """Computes and stores road scores for all roads at once"""
+
+    # Rows per fetch when streaming the rating table
+    FETCH_SIZE = 200_000
+
+    def load_ratings(self, session: Session, now: datetime) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (road_id, rating, age in days) arrays for every rating"""
+        if session.get_bind().dialect.name == "sqlite":
+            epoch = (func.julianday(Rating.timestamp) - JULIAN_DAY_UNIX_EPOCH) * SECONDS_PER_DAY
+        else:
+            epoch = func.extract("epoch", Rating.timestamp)
+        stmt = select(Rating.road_id, cast(Rating.rating, Float), epoch)
+
+        # Plain DBAPI tuples straight into NumPy: building ORM/Core rows would cost
+        # more than the scoring itself. The statement only has numeric literals.
+        sql = str(stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.execute(sql)
+            chunks = []
+            while True:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.float64))
+        finally:
+            cursor.close()
+
+        if not chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        data = np.concatenate(chunks)
+        age_days = (now.replace(tzinfo=timezone.utc).timestamp() - data[:, 2]) / SECONDS_PER_DAY
+        return data[:, 0].astype(np.int64), data[:, 1], np.maximum(age_days, 0.0)
+
+    def compute_scores(
+        self,
+        road_ids: np.ndarray,
+        values: np.ndarray,
+        age_days: np.ndarray,
+        score_road_ids: np.ndarray,
+    ) -> np.ndarray:
+        """Scores for `score_road_ids`, given every rating as parallel arrays"""
+        prior_mean = settings.ROAD_SCORE_PRIOR_MEAN
+        prior_weight = settings.ROAD_SCORE_PRIOR_WEIGHT
+        weights = np.exp2(-age_days / settings.ROAD_SCORE_HALF_LIFE_DAYS)
+
+        size = int(max(road_ids.max(initial=0), score_road_ids.max(initial=0))) + 1
+        weight_sum = np.bincount(road_ids, weights=weights, minlength=size)
+        value_sum = np.bincount(road_ids, weights=weights * values, minlength=size)
+
+        return (prior_weight * prior_mean + value_sum[score_road_ids]) / (prior_weight + weight_sum[score_road_ids])
+
+    def score_all(self, session: Session, read_session: Optional[Session] = None) -> int:
+        """
+        Recompute every road's score; commits with the caller's transaction.
+        The full scan runs on `read_session` when given, so the writer is
+        only held for the UPDATE. Returns the number of roads.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        reader = read_session or session
+        road_ids, values, age_days = self.load_ratings(reader, now)
+        score_road_ids = np.fromiter(reader.execute(select(RoadStats.road_id)).scalars(), dtype=np.int64)
+        if read_session is not None:
+            read_session.rollback()
+        if len(score_road_ids) == 0:
+            return 0
+
+        scores = self.compute_scores(road_ids, values, age_days, score_road_ids)
+        session.execute(
+            update(RoadStats.__table__)
+            .where(RoadStats.__table__.c.road_id == bindparam("b_road_id"))
+            .values(score=bindparam("b_score"), score_computed_at=now),
+            [
+                {"b_road_id": road_id, "b_score": score}
+                for road_id, score in zip(score_road_ids.tolist(), scores.tolist())
+            ],
+        )
+        return len(score_road_ids)
+
+    def run(self) -> None:
+        """Scheduler entry point: score all roads in a session of its own"""
+        started = time.perf_counter()
+        read_session = ReadSessionLocal()
+        session = SessionLocal()
+        try:
+            count = self.score_all(session, read_session)
+            session.commit()
+        finally:
+            read_session.close()
+            session.close()
+        logger.info("Scored %s roads in %.2fs", count, time.perf_counter() - started)
+
+
+road_scoring_service = RoadScoringService()
@@ -0,0 +1,223 @@
+from app.models.road import Road
+from app.models.road_lod import RoadLOD
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import orjson
+from .fragments import road_fragment_cache, with_fields
+from .geometry import BBox, polyline_bbox
+from .polyline import POLYLINE_PRECISION, decode_polyline, encode_polyline
+from .schemas import ExportFormat, GeometryFormat, GeometryParams
+from .simplify import LOD_ZOOMS, simplify_points, zoom_tolerance_m
+from .spatial_index import spatial_index
+
+
+class RoadService:
+    """Service class for road geometry and map listing operations"""
+
+    # Keep IN (...) lists well below SQLite's bound parameter limit
+    ID_CHUNK_SIZE = 500
+    # Rows fetched per round trip, and serialized per chunk, by the export
+    EXPORT_BATCH_SIZE = 1000
+
+    def apply_geometry(self, road: Road, points: List[Dict[str, Any]]) -> None:
+        """
+        Set a road's polyline and every column derived from it.
+        Raises ValueError if the polyline is empty or malformed.
+        """
+        if not points:
+            raise ValueError("Polyline has no points")
+        encoded = encode_polyline(points)
+        # Derive the bbox from the stored (rounded) points so the two always agree
+        min_lng, min_lat, max_lng, max_lat = polyline_bbox(decode_polyline(encoded))
+        road.polyline_encoded = encoded
+        road.polyline_data = None
+        road.min_lng = min_lng
+        road.min_lat = min_lat
+        road.max_lng = max_lng
+        road.max_lat = max_lat
+
+    def save_geometry(self, road: Road, session: Session) -> None:
+        """
+        Propagate a road's geometry to the spatial index and LOD pyramid. Call
+        after the road has been flushed; changes commit with the caller's transaction.
+        """
+        spatial_index.upsert(session, road)
+        self.refresh_lods(road, session)
+
+    def refresh_lods(self, road: Road, session: Session) -> None:
+        """Recompute the simplified geometries of a road for every LOD level"""
+        session.query(RoadLOD).filter(RoadLOD.road_id == road.road_id).delete(synchronize_session=False)
+        points = self.road_points(road)
+        for level in LOD_ZOOMS:
+            simplified = simplify_points(points, zoom_tolerance_m(level))
+            session.add(RoadLOD(
+                road_id=road.road_id,
+                level=level,
+                polyline_encoded=encode_polyline(simplified),
+                point_count=len(simplified),
+            ))
+
+    def road_points(self, road: Road) -> List[Dict[str, float]]:
+        """Return a road's polyline as a list of {"lat", "lng"} points"""
+        if road.polyline_encoded is not None:
+            return decode_polyline(road.polyline_encoded)
+        return road.polyline_data or []
+
+    def road_encoded(self, road: Road) -> str:
+        """Return a road's polyline in encoded form"""
+        if road.polyline_encoded is not None:
+            return road.polyline_encoded
+        return encode_polyline(road.polyline_data or [])
+
+    def lod_geometries(self, road_ids: List[int], level: int, session: Session) -> Dict[int, str]:
+        """Encoded simplified geometries at `level`, keyed by road_id"""
+        result: Dict[int, str] = {}
+        for start in range(0, len(road_ids), self.ID_CHUNK_SIZE):
+            chunk = road_ids[start:start + self.ID_CHUNK_SIZE]
+            rows = session.query(RoadLOD.road_id, RoadLOD.polyline_encoded).filter(
+                RoadLOD.level == level,
+                RoadLOD.road_id.in_(chunk),
+            ).all()
+            result.update(dict(rows))
+        return result
+
+    def geometry_fields(
+        self,
+        road: Road,
+        geometry: GeometryFormat,
+        encoded: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Geometry entries of a serialized road in the requested wire format.
+        `encoded` overrides the full-resolution polyline (e.g. with a LOD geometry).
+        """
+        if geometry == GeometryFormat.encoded:
+            return {"polyline_encoded": encoded if encoded is not None else self.road_encoded(road)}
+        return {"polyline_data": decode_polyline(encoded) if encoded is not None else self.road_points(road)}
+
+    def geometries_for(
+        self,
+        roads: List[Road],
+        params: GeometryParams,
+        session: Session,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Geometry entries for a batch of roads, keyed by road_id, using the LOD pyramid when asked"""
+        level = params.lod_level
+        simplified: Dict[int, str] = {}
+        if level is not None:
+            simplified = self.lod_geometries([r.road_id for r in roads], level, session)
+        return {
+            r.road_id: self.geometry_fields(r, params.geometry, simplified.get(r.road_id))
+            for r in roads
+        }
+
+    def road_fragments(
+        self,
+        revisions: List[Tuple[int, int]],
+        params: GeometryParams,
+        session: Session,
+        extra_fields: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> List[bytes]:
+        """
+        Serialized roads for (road_id, revision) pairs, in the given order.
+        Only roads missing from the fragment cache, or changed since they were
+        cached, are loaded and encoded. `extra_fields` adds per-road entries
+        that are not part of the cached payload (e.g. rating aggregates).
+        """
+        variant = (params.geometry, params.lod_level)
+        fragments, missing = road_fragment_cache.get_many(revisions, variant)
+        for start in range(0, len(missing), self.ID_CHUNK_SIZE):
+            chunk = missing[start:start + self.ID_CHUNK_SIZE]
+            roads = session.query(Road).filter(Road.road_id.in_(chunk)).all()
+            geometries = self.geometries_for(roads, params, session)
+            for road in roads:
+                fragment = orjson.dumps(self.serialize_road(road, geometries[road.road_id]))
+                road_fragment_cache.put(road.road_id, road.revision, variant, fragment)
+                fragments[road.road_id] = fragment
+        extra_fields = extra_fields or {}
+        # Roads deleted between the two reads are simply left out
+        return [
+            with_fields(fragments[road_id], extra_fields.get(road_id, {}))
+            for road_id, _ in revisions
+            if road_id in fragments
+        ]
+
+    def collection_meta(self, params: GeometryParams) -> Dict[str, Any]:
+        """Envelope entries that tell clients how to decode the geometry"""
+        meta: Dict[str, Any] = {"geometry": params.geometry.value, "lod_level": params.lod_level}
+        if params.geometry == GeometryFormat.encoded:
+            meta["polyline_precision"] = POLYLINE_PRECISION
+        return meta
+
+    def roads_in_bbox(self, bbox: BBox, limit: int, session: Session) -> Tuple[List[Road], bool]:
+        """
+        Return roads whose bounding box intersects `bbox`, ordered by road_id.
+        The second value is True when more than `limit` roads matched.
+        """
+        min_lng, min_lat, max_lng, max_lat = bbox
+        candidates = spatial_index.intersecting_ids(session, bbox)
+        roads = session.query(Road).filter(
+            Road.road_id.in_(candidates),
+            Road.min_lng <= max_lng,
+            Road.max_lng >= min_lng,
+            Road.min_lat <= max_lat,
+            Road.max_lat >= min_lat,
+        ).order_by(Road.road_id).limit(limit + 1).all()
+
+        return roads[:limit], len(roads) > limit
+
+    def serialize_road(self, road: Road, geometry_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a road to the dictionary shape used by the map listings"""
+        return {
+            "road_id": road.road_id,
+            "builder_id": road.builder_id,
+            "employee_id": road.employee_id,
+            "maintained_by": road.maintained_by,
+            "cost": str(road.cost) if road.cost is not None else None,
+            "started_date": str(road.started_date),
+            "ended_date": str(road.ended_date) if road.ended_date else None,
+            "status": road.status,
+            "chief_engineer": road.chief_engineer,
+            "date_verified": str(road.date_verified) if road.date_verified else None,
+            **geometry_fields,
+        }
+
+    def road_feature(self, road: Road) -> Dict[str, Any]:
+        """Convert a road to a GeoJSON LineString feature"""
+        return {
+            "type": "Feature",
+            "id": road.road_id,
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[p["lng"], p["lat"]] for p in self.road_points(road)],
+            },
+            "properties": self.serialize_road(road, {}),
+        }
+
+    def export_roads(self, session: Session, export_format: ExportFormat) -> Iterator[str]:
+        """
+        Yield the whole road table as NDJSON lines or one GeoJSON FeatureCollection.
+        Rows are streamed with yield_per (the identity map only holds them weakly)
+        so memory stays flat as the table grows; output is produced one string
+        per batch to keep write calls cheap.
+        """
+        rows = session.execute(
+            select(Road).order_by(Road.road_id).execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+        ).scalars()
+
+        if export_format == ExportFormat.ndjson:
+            for batch in rows.partitions():
+                yield "".join(
+                    json.dumps(self.serialize_road(r, {"polyline_data": self.road_points(r)})) + "\n"
+                    for r in batch
+                )
+            return
+
+        yield '{"type":"FeatureCollection","features":['
+        separator = ""
+        for batch in rows.partitions():
+            yield separator + ",".join(json.dumps(self.road_feature(r)) for r in batch)
+            separator = ","
+        yield "]}"
@@ -0,0 +1,82 @@
+"""
+Douglas-Peucker polyline simplification and the level-of-detail pyramid.
+
+Each LOD level is named after the map zoom it targets and is simplified with a
+tolerance of half a web-mercator pixel at that zoom, so it renders identically
+to the full polyline at that zoom and any zoom below it.
+"""
+import math
+from typing import Dict, List, Optional
+from .geometry import METERS_PER_DEGREE_LAT
+
+LOD_ZOOMS = (6, 9, 12, 15)
+
+# Ground resolution of one 256px web-mercator tile pixel at zoom 0, in metres
+METERS_PER_PIXEL_Z0 = 156543.03392
+
+
+def zoom_tolerance_m(zoom: int) -> float:
+    """Simplification tolerance in metres for a map zoom level (half a pixel)"""
+    return METERS_PER_PIXEL_Z0 / (2 ** zoom) * 0.5
+
+
+def lod_for_zoom(zoom: int) -> Optional[int]:
+    """Coarsest LOD level that still looks exact at `zoom`; None means full resolution"""
+    for level in LOD_ZOOMS:
+        if level >= zoom:
+            return level
+    return None
+
+
+def lod_for_tolerance(tolerance_m: float) -> Optional[int]:
+    """Coarsest LOD level whose tolerance does not exceed `tolerance_m`; None means full resolution"""
+    for level in LOD_ZOOMS:
+        if zoom_tolerance_m(level) <= tolerance_m:
+            return level
+    return None
+
+
+def simplify_points(points: List[Dict[str, float]], tolerance_m: float) -> List[Dict[str, float]]:
+    """
+    Douglas-Peucker simplification of {"lat", "lng"} points with a tolerance in
+    metres. Endpoints are always kept. Uses an explicit stack, so very long
+    polylines cannot hit the recursion limit.
+    """
+    n = len(points)
+    if n < 3:
+        return list(points)
+
+    # Project to a local equirectangular plane in metres
+    kx = METERS_PER_DEGREE_LAT * math.cos(math.radians(points[0]["lat"]))
+    xs = [p["lng"] * kx for p in points]
+    ys = [p["lat"] * METERS_PER_DEGREE_LAT for p in points]
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tol2 = tolerance_m * tolerance_m
+    stack = [(0, n - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        seg2 = dx * dx + dy * dy
+
+        max_d2, index = -1.0, -1
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if seg2 > 0.0:
+                t = max(0.0, min(1.0, (px * dx + py * dy) / seg2))
+                ex, ey = px - t * dx, py - t * dy
+            else:
+                ex, ey = px, py
+            d2 = ex * ex + ey * ey
+            if d2 > max_d2:
+                max_d2, index = d2, i
+
+        if max_d2 > tol2:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [p for p, k in zip(points, keep) if k]
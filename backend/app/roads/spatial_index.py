@@ -0,0 +1,198 @@
+"""
+Spatial index over road bounding boxes.
+
+On SQLite the index is an R*Tree virtual table (`road_rtree`) holding one
+row per road. It is not part of `Base.metadata`, so `create_all` and Alembic
+autogenerate leave it alone; `ensure()` creates it and `rebuild()` backfills
+it from the `road` table. On other databases the same queries fall back to the
+indexed bounding box columns on `road`.
+
+R*Tree stores 32-bit floats rounded outwards, so results are a superset of
+the exact answer. Callers that need exact bounding boxes should re-check
+against the `Road.min_*`/`max_*` columns.
+"""
+from sqlalchemy import Column, Float, Integer, MetaData, Table, select, text, delete
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing import List, Optional, Tuple, Union
+from app.models.road import Road
+from .geometry import BBox, bbox_distance_m, meters_to_degrees
+
+RTREE_TABLE = "road_rtree"
+
+# Kept out of Base.metadata on purpose: this describes a virtual table
+road_rtree = Table(
+    RTREE_TABLE,
+    MetaData(),
+    Column("road_id", Integer, primary_key=True),
+    Column("min_lng", Float),
+    Column("max_lng", Float),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+)
+
+CREATE_RTREE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} "
+    "USING rtree(road_id, min_lng, max_lng, min_lat, max_lat)"
+)
+
+
+def is_rtree_table(name: str) -> bool:
+    """True for the R*Tree table and the shadow tables SQLite creates for it"""
+    return name == RTREE_TABLE or name.startswith(f"{RTREE_TABLE}_")
+
+
+class SpatialIndex:
+    """Intersects / within / nearest queries over road bounding boxes"""
+
+    # Starting half-width (metres) of the search window used by nearest()
+    NEAREST_START_RADIUS_M = 100.0
+    NEAREST_MAX_RADIUS_M = 50_000.0
+
+    def uses_rtree(self, bind: Union[Session, Connection, Engine]) -> bool:
+        if isinstance(bind, Session):
+            bind = bind.get_bind()
+        return bind.dialect.name == "sqlite"
+
+    def ensure(self, bind: Union[Connection, Engine]) -> None:
+        """Create the R*Tree table if the database supports it"""
+        if not self.uses_rtree(bind):
+            return
+        if isinstance(bind, Engine):
+            with bind.begin() as conn:
+                conn.execute(text(CREATE_RTREE_SQL))
+        else:
+            bind.execute(text(CREATE_RTREE_SQL))
+
+    def upsert(self, session: Session, road: Road) -> None:
+        """
+        Insert or replace a road's entry. Call after the road is flushed so
+        that road_id is set; the change commits with the caller's transaction.
+        """
+        if not self.uses_rtree(session) or road.min_lng is None:
+            return
+        session.execute(
+            text(
+                f"INSERT OR REPLACE INTO {RTREE_TABLE} (road_id, min_lng, max_lng, min_lat, max_lat) "
+                "VALUES (:road_id, :min_lng, :max_lng, :min_lat, :max_lat)"
+            ),
+            {
+                "road_id": road.road_id,
+                "min_lng": road.min_lng,
+                "max_lng": road.max_lng,
+                "min_lat": road.min_lat,
+                "max_lat": road.max_lat,
+            },
+        )
+
+    def remove(self, session: Session, road_id: int) -> None:
+        if not self.uses_rtree(session):
+            return
+        session.execute(delete(road_rtree).where(road_rtree.c.road_id == road_id))
+
+    def rebuild(self, session: Session) -> int:
+        """Repopulate the index from the road table. Returns the number of indexed roads."""
+        if not self.uses_rtree(session):
+            return 0
+        self.ensure(session.connection())
+        session.execute(delete(road_rtree))
+        result = session.execute(text(
+            f"INSERT INTO {RTREE_TABLE} (road_id, min_lng, max_lng, min_lat, max_lat) "
+            "SELECT road_id, min_lng, max_lng, min_lat, max_lat FROM road WHERE min_lng IS NOT NULL"
+        ))
+        return result.rowcount
+
+    def intersecting_ids(self, session: Session, bbox: BBox) -> Select:
+        """Select of road_ids whose bounding box intersects `bbox`, for use in subqueries"""
+        min_lng, min_lat, max_lng, max_lat = bbox
+        if self.uses_rtree(session):
+            t = road_rtree.c
+            return select(t.road_id).where(
+                t.min_lng <= max_lng, t.max_lng >= min_lng,
+                t.min_lat <= max_lat, t.max_lat >= min_lat,
+            )
+        return select(Road.road_id).where(
+            Road.min_lng <= max_lng, Road.max_lng >= min_lng,
+            Road.min_lat <= max_lat, Road.max_lat >= min_lat,
+        )
+
+    def intersecting_ids_sql(self, session: Session) -> str:
+        """
+        Raw SQL equivalent of intersecting_ids() with :min_lng, :min_lat,
+        :max_lng and :max_lat parameters, for hot paths where building and
+        caching a Core statement per call would dominate the query itself.
+        """
+        table = RTREE_TABLE if self.uses_rtree(session) else "road"
+        return (
+            f"SELECT road_id FROM {table} "
+            "WHERE min_lng <= :max_lng AND max_lng >= :min_lng "
+            "AND min_lat <= :max_lat AND max_lat >= :min_lat"
+        )
+
+    def within_ids(self, session: Session, bbox: BBox) -> Select:
+        """Select of road_ids whose bounding box lies entirely inside `bbox`"""
+        min_lng, min_lat, max_lng, max_lat = bbox
+        if self.uses_rtree(session):
+            t = road_rtree.c
+            return select(t.road_id).where(
+                t.min_lng >= min_lng, t.max_lng <= max_lng,
+                t.min_lat >= min_lat, t.max_lat <= max_lat,
+            )
+        return select(Road.road_id).where(
+            Road.min_lng >= min_lng, Road.max_lng <= max_lng,
+            Road.min_lat >= min_lat, Road.max_lat <= max_lat,
+        )
+
+    def intersects(self, session: Session, bbox: BBox, limit: Optional[int] = None) -> List[int]:
+        query = self.intersecting_ids(session, bbox)
+        if limit is not None:
+            query = query.limit(limit)
+        return list(session.execute(query).scalars())
+
+    def within(self, session: Session, bbox: BBox, limit: Optional[int] = None) -> List[int]:
+        query = self.within_ids(session, bbox)
+        if limit is not None:
+            query = query.limit(limit)
+        return list(session.execute(query).scalars())
+
+    def nearest(
+        self,
+        session: Session,
+        lat: float,
+        lng: float,
+        k: int = 5,
+        max_distance_m: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Return up to k (road_id, distance_m) pairs ordered by distance from the
+        point to each road's bounding box. The search window doubles until it
+        holds k roads whose distance is no larger than the window, which
+        guarantees no road outside the window could rank higher.
+        """
+        limit_m = max_distance_m if max_distance_m is not None else self.NEAREST_MAX_RADIUS_M
+        radius_m = min(self.NEAREST_START_RADIUS_M, limit_m)
+
+        while True:
+            d_lat, d_lng = meters_to_degrees(radius_m, lat)
+            window = (lng - d_lng, lat - d_lat, lng + d_lng, lat + d_lat)
+            ids = self.intersecting_ids(session, window)
+            rows = session.execute(
+                select(Road.road_id, Road.min_lng, Road.min_lat, Road.max_lng, Road.max_lat)
+                .where(Road.road_id.in_(ids))
+            ).all()
+
+            ranked = sorted(
+                (
+                    (row.road_id, bbox_distance_m(lat, lng, (row.min_lng, row.min_lat, row.max_lng, row.max_lat)))
+                    for row in rows
+                ),
+                key=lambda pair: pair[1],
+            )
+            settled = [pair for pair in ranked if pair[1] <= radius_m]
+            if len(settled) >= k or radius_m >= limit_m:
+                return settled[:k]
+            radius_m = min(radius_m * 2, limit_m)
+
+
+spatial_index = SpatialIndex()
@@ -0,0 +1,150 @@
+"""
+Incrementally maintained rating and review aggregates (`road_stats`).
+
+Every write path that adds ratings or reviews calls record_ratings() or
+record_reviews() before committing, so the aggregates change atomically with
+the rows they summarize. Changes are applied as `column = column + delta`
+updates, one per road in the batch, so concurrent writers never lose an
+increment. rebuild() recomputes everything from the rating and review tables.
+"""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import case, delete, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, Optional
+from app.models.rating import Rating
+from app.models.review import Review
+from app.models.road import Road
+from app.models.road_stats import RoadStats
+
+HISTOGRAM_BUCKETS = 5
+HISTOGRAM_COLUMNS = [f"rating_hist_{i}" for i in range(HISTOGRAM_BUCKETS)]
+
+
+def rating_bucket(value: Decimal) -> int:
+    """Histogram bucket of a rating: its whole-star part, with 5.0 counted in the top bucket"""
+    return min(int(value), HISTOGRAM_BUCKETS - 1)
+
+
+def average_rating(stats: Optional[RoadStats]) -> Optional[Decimal]:
+    """Mean rating rounded to one decimal, or None for an unrated road"""
+    if stats is None or not stats.rating_count:
+        return None
+    return (Decimal(str(stats.rating_sum)) / stats.rating_count).quantize(Decimal('0.1'))
+
+
+class RoadStatsService:
+    """Reads and incremental updates of the per-road aggregates"""
+
+    def create(self, session: Session, road_id: int) -> None:
+        """Add the empty aggregate row of a new road"""
+        session.add(self._new_stats(road_id))
+
+    def _new_stats(self, road_id: int, **values: Any) -> RoadStats:
+        fields: Dict[str, Any] = {"rating_sum": 0, "rating_count": 0, "review_count": 0}
+        fields.update({column: 0 for column in HISTOGRAM_COLUMNS})
+        fields.update(values)
+        return RoadStats(road_id=road_id, **fields)
+
+    def get(self, session: Session, road_id: int) -> Optional[RoadStats]:
+        return session.get(RoadStats, road_id)
+
+    def record_ratings(self, session: Session, ratings: Iterable[Rating]) -> None:
+        """Fold new ratings into their roads' aggregates; commits with the caller's transaction"""
+        deltas: Dict[int, Dict[str, Any]] = defaultdict(lambda: defaultdict(int))
+        latest: Dict[int, datetime] = {}
+        for rating in ratings:
+            delta = deltas[rating.road_id]
+            delta["rating_sum"] += Decimal(str(rating.rating))
+            delta["rating_count"] += 1
+            delta[HISTOGRAM_COLUMNS[rating_bucket(rating.rating)]] += 1
+            if rating.road_id not in latest or rating.timestamp > latest[rating.road_id]:
+                latest[rating.road_id] = rating.timestamp
+
+        for road_id, delta in deltas.items():
+            self._increment(session, road_id, delta, latest[road_id])
+
+    def record_reviews(self, session: Session, reviews: Iterable[Review]) -> None:
+        """Fold new reviews into their roads' aggregates; commits with the caller's transaction"""
+        counts: Dict[int, int] = defaultdict(int)
+        for review in reviews:
+            counts[review.road_id] += 1
+        for road_id, count in counts.items():
+            self._increment(session, road_id, {"review_count": count})
+
+    def _increment(
+        self,
+        session: Session,
+        road_id: int,
+        delta: Dict[str, Any],
+        last_rating_at: Optional[datetime] = None,
+    ) -> None:
+        values: Dict[str, Any] = {column: getattr(RoadStats, column) + amount for column, amount in delta.items()}
+        if last_rating_at is not None:
+            values["last_rating_at"] = case(
+                (or_(RoadStats.last_rating_at.is_(None), RoadStats.last_rating_at < last_rating_at), last_rating_at),
+                else_=RoadStats.last_rating_at,
+            )
+        result = session.execute(
+            update(RoadStats).where(RoadStats.road_id == road_id).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+        if result.rowcount:
+            return
+
+        # Road predates road_stats and was never rebuilt: start it from this delta.
+        # Flushed right away so the next increment in this transaction finds it.
+        session.add(self._new_stats(road_id, last_rating_at=last_rating_at, **delta))
+        session.flush()
+
+    def rebuild(self, session: Session) -> int:
+        """Recompute every road's aggregates from scratch. Returns the number of roads."""
+        rating = (
+            select(
+                Rating.road_id,
+                func.sum(Rating.rating).label("rating_sum"),
+                func.count().label("rating_count"),
+                func.max(Rating.timestamp).label("last_rating_at"),
+                *(
+                    func.sum(case((self._bucket_condition(i), 1), else_=0)).label(column)
+                    for i, column in enumerate(HISTOGRAM_COLUMNS)
+                ),
+            )
+            .group_by(Rating.road_id)
+            .subquery()
+        )
+        review = (
+            select(Review.road_id, func.count().label("review_count"))
+            .group_by(Review.road_id)
+            .subquery()
+        )
+        rows = (
+            select(
+                Road.road_id,
+                func.coalesce(rating.c.rating_sum, literal(0)),
+                func.coalesce(rating.c.rating_count, literal(0)),
+                *(func.coalesce(rating.c[column], literal(0)) for column in HISTOGRAM_COLUMNS),
+                func.coalesce(review.c.review_count, literal(0)),
+                rating.c.last_rating_at,
+            )
+            .outerjoin(rating, rating.c.road_id == Road.road_id)
+            .outerjoin(review, review.c.road_id == Road.road_id)
+        )
+
+        session.execute(delete(RoadStats))
+        result = session.execute(
+            insert(RoadStats).from_select(
+                ["road_id", "rating_sum", "rating_count", *HISTOGRAM_COLUMNS, "review_count", "last_rating_at"],
+                rows,
+            )
+        )
+        return result.rowcount
+
+    def _bucket_condition(self, bucket: int):
+        if bucket == HISTOGRAM_BUCKETS - 1:
+            return Rating.rating >= bucket
+        return (Rating.rating >= bucket) & (Rating.rating < bucket + 1)
+
+
+road_stats_service = RoadStatsService()
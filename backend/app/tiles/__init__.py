@@ -0,0 +1,3 @@
+from .routes import tiles_router
+
+__all__ = ["tiles_router"]
@@ -0,0 +1,67 @@
+"""
+Web-mercator (XYZ / "slippy map") tile math.
+
+Tiles are addressed as (z, x, y) with y growing southwards, as used by Google
+Maps, Leaflet and OpenStreetMap. Bounding boxes use the same
+(min_lng, min_lat, max_lng, max_lat) order as app.roads.geometry.
+"""
+import math
+from typing import Tuple
+from app.roads.geometry import BBox
+
+MAX_LATITUDE = 85.05112878
+
+
+def tile_count(z: int) -> int:
+    return 1 << z
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    n = tile_count(z)
+    return 0 <= x < n and 0 <= y < n
+
+
+def _tile_lng(x: float, z: int) -> float:
+    return x / tile_count(z) * 360.0 - 180.0
+
+
+def _tile_lat(y: float, z: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / tile_count(z)))))
+
+
+def tile_bbox(z: int, x: int, y: int, buffer: float = 0.0) -> BBox:
+    """
+    Bounding box of a tile. `buffer` grows it by that fraction of the tile
+    size on each side, so clipped lines do not end exactly on tile edges.
+    """
+    return (
+        _tile_lng(x - buffer, z),
+        _tile_lat(y + 1 + buffer, z),
+        _tile_lng(x + 1 + buffer, z),
+        _tile_lat(y - buffer, z),
+    )
+
+
+def lng_lat_to_tile(lng: float, lat: float, z: int) -> Tuple[float, float]:
+    """Fractional tile coordinates of a point; the integer part is the tile index"""
+    n = tile_count(z)
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lng + 180.0) / 360.0 * n
+    y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n
+    return x, y
+
+
+def tile_range(bbox: BBox, z: int, buffer: float = 0.0) -> Tuple[int, int, int, int]:
+    """
+    (min_x, min_y, max_x, max_y) of the tiles whose `buffer`-grown extent
+    intersects a bounding box at zoom z, clamped to the valid tile range.
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    fx0, fy0 = lng_lat_to_tile(min_lng, max_lat, z)
+    fx1, fy1 = lng_lat_to_tile(max_lng, min_lat, z)
+    last = tile_count(z) - 1
+
+    def clamp(v: float) -> int:
+        return min(max(int(math.floor(v)), 0), last)
+
+    return clamp(fx0 - buffer), clamp(fy0 - buffer), clamp(fx1 + buffer), clamp(fy1 + buffer)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from app.core.database import get_read_db
+from .mercator import is_valid_tile
+from .schemas import TileFormat
+from .services import TileService
+import hashlib
+
+tiles_router = APIRouter(prefix="/tiles", tags=["Tiles"])
+tile_service = TileService()
+
+MEDIA_TYPES = {
+    TileFormat.geojson: "application/geo+json",
+    TileFormat.encoded: "application/json",
+}
+
+
+@tiles_router.get("/{z}/{x}/{y}")
+def get_road_tile(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    format: TileFormat = Query(TileFormat.geojson),
+    session: Session = Depends(get_read_db)
+):
+    """
+    Return the roads inside a web-mercator tile, clipped to the tile.
+    Responses carry a content-derived ETag so browsers and CDNs can revalidate.
+    """
+    if not 0 <= z <= TileService.MAX_ZOOM or not is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tile out of range")
+
+    content = tile_service.get_tile(z, x, y, format, session)
+    etag = f'"{hashlib.sha1(content).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type=MEDIA_TYPES[format], headers=headers)
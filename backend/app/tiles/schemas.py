@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class TileFormat(str, Enum):
+    """Encoding of a rendered road tile"""
+    geojson = "geojson"    # GeoJSON FeatureCollection of (Multi)LineStrings
+    encoded = "encoded"    # Compact JSON with encoded polyline parts per road
@@ -0,0 +1,163 @@
+from app.core.versioning import get_dataset_version
+from app.models.road import Road
+from app.roads.geometry import BBox, clip_polyline
+from app.roads.polyline import POLYLINE_PRECISION, decode_polyline, encode_polyline
+from app.roads.schemas import GeometryParams
+from app.roads.services import RoadService
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import json
+import logging
+import os
+import uuid
+from .mercator import tile_bbox, tile_range
+from .schemas import TileFormat
+
+logger = logging.getLogger(__name__)
+
+
+class TileService:
+    """Renders road tiles and manages the on-disk tile cache"""
+
+    CACHE_DIR = Path("storage/tiles")
+    MAX_ZOOM = 22
+    # Tiles above this zoom are cheap to render and too numerous to cache
+    MAX_CACHED_ZOOM = 16
+    # Clip with a 4px margin (of 256) so line caps are not cut at tile edges
+    BUFFER = 4 / 256
+    MAX_ROADS_PER_TILE = 10_000
+
+    def __init__(self):
+        self.road_service = RoadService()
+
+    def tile_path(self, fmt: TileFormat, z: int, x: int, y: int) -> Path:
+        return self.CACHE_DIR / fmt.value / str(z) / str(x) / f"{y}.json"
+
+    def get_tile(self, z: int, x: int, y: int, fmt: TileFormat, session: Session) -> bytes:
+        """Return a rendered tile, from the disk cache when possible"""
+        if z > self.MAX_CACHED_ZOOM:
+            return self.render_tile(z, x, y, fmt, session)
+
+        path = self.tile_path(fmt, z, x, y)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+        # A road write that commits while we render invalidates its tiles
+        # after the commit, possibly before our file exists, and the render
+        # may still have seen the old road. Read the dataset version in the
+        # render's own snapshot, then again in a fresh one once the tile is
+        # on disk, and drop the tile if any write committed in between.
+        version = get_dataset_version(session)
+        content = self.render_tile(z, x, y, fmt, session)
+        self._write_atomic(path, content)
+        session.rollback()
+        if get_dataset_version(session) != version:
+            path.unlink(missing_ok=True)
+        return content
+
+    def render_tile(self, z: int, x: int, y: int, fmt: TileFormat, session: Session) -> bytes:
+        """Render the roads intersecting a tile, clipped to its buffered extent"""
+        bbox = tile_bbox(z, x, y, buffer=self.BUFFER)
+        roads, truncated = self.road_service.roads_in_bbox(bbox, self.MAX_ROADS_PER_TILE, session)
+        if truncated:
+            logger.warning("Tile %s/%s/%s has more than %s roads; output truncated", z, x, y, self.MAX_ROADS_PER_TILE)
+
+        params = GeometryParams(zoom=z)
+        level = params.lod_level
+        simplified: Dict[int, str] = {}
+        if level is not None:
+            simplified = self.road_service.lod_geometries([r.road_id for r in roads], level, session)
+
+        clipped = []
+        for road in roads:
+            encoded = simplified.get(road.road_id)
+            points = decode_polyline(encoded) if encoded is not None else self.road_service.road_points(road)
+            parts = [part for part in clip_polyline(points, bbox) if len(part) >= 2]
+            if parts:
+                clipped.append((road, parts))
+
+        if fmt == TileFormat.encoded:
+            body = self._encoded_tile(z, x, y, clipped)
+        else:
+            body = self._geojson_tile(clipped)
+        return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+    def invalidate_bbox(self, bbox: Optional[BBox]) -> int:
+        """
+        Delete every cached tile whose rendered extent intersects `bbox`.
+        Only directories that exist are scanned, so the cost follows the
+        number of cached tiles rather than the number of tiles covered.
+        Returns the number of deleted tiles.
+        """
+        if bbox is None or not self.CACHE_DIR.exists():
+            return 0
+
+        removed = 0
+        for fmt_dir in self.CACHE_DIR.iterdir():
+            for z in range(self.MAX_CACHED_ZOOM + 1):
+                z_dir = fmt_dir / str(z)
+                if not z_dir.is_dir():
+                    continue
+                min_x, min_y, max_x, max_y = tile_range(bbox, z, buffer=self.BUFFER)
+                for x_entry in os.scandir(z_dir):
+                    if not x_entry.name.isdigit() or not min_x <= int(x_entry.name) <= max_x:
+                        continue
+                    for y_entry in os.scandir(x_entry.path):
+                        y = Path(y_entry.name).stem
+                        if y.isdigit() and min_y <= int(y) <= max_y:
+                            try:
+                                os.unlink(y_entry.path)
+                                removed += 1
+                            except FileNotFoundError:
+                                pass
+        return removed
+
+    def invalidate_road(self, road: Road) -> int:
+        """Delete cached tiles that show a road"""
+        if road.min_lng is None:
+            return 0
+        return self.invalidate_bbox((road.min_lng, road.min_lat, road.max_lng, road.max_lat))
+
+    def _road_properties(self, road: Road) -> Dict[str, Any]:
+        return {
+            "road_id": road.road_id,
+            "status": road.status,
+            "builder_id": road.builder_id,
+            "maintained_by": road.maintained_by,
+        }
+
+    def _geojson_tile(self, clipped) -> Dict[str, Any]:
+        features = []
+        for road, parts in clipped:
+            coordinates = [[[p["lng"], p["lat"]] for p in part] for part in parts]
+            if len(coordinates) == 1:
+                geometry = {"type": "LineString", "coordinates": coordinates[0]}
+            else:
+                geometry = {"type": "MultiLineString", "coordinates": coordinates}
+            features.append({
+                "type": "Feature",
+                "id": road.road_id,
+                "geometry": geometry,
+                "properties": self._road_properties(road),
+            })
+        return {"type": "FeatureCollection", "features": features}
+
+    def _encoded_tile(self, z: int, x: int, y: int, clipped) -> Dict[str, Any]:
+        roads: List[Dict[str, Any]] = []
+        for road, parts in clipped:
+            roads.append({
+                **self._road_properties(road),
+                "parts": [encode_polyline(part) for part in parts],
+            })
+        return {"z": z, "x": x, "y": y, "polyline_precision": POLYLINE_PRECISION, "roads": roads}
+
+    def _write_atomic(self, path: Path, content: bytes) -> None:
+        """Write via a temporary file so readers never see a partial tile"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,26 @@
+"""
+Side effects of new ratings and reviews.
+
+Every path that inserts ratings or reviews calls these once per batch, after
+adding the rows and before committing, so all derived aggregates change in
+the same transaction as the rows they summarize.
+"""
+from sqlalchemy.orm import Session
+from typing import List
+from app.builder.ranking import builder_ranking_service
+from app.models.rating import Rating
+from app.models.review import Review
+from app.roads.stats import road_stats_service
+from .rollups import rating_rollup_service
+from .tags import review_tag_service
+
+
+def record_new_ratings(session: Session, ratings: List[Rating]) -> None:
+    road_stats_service.record_ratings(session, ratings)
+    builder_ranking_service.record_ratings(session, ratings)
+    rating_rollup_service.record_ratings(session, ratings)
+
+
+def record_new_reviews(session: Session, reviews: List[Review]) -> None:
+    road_stats_service.record_reviews(session, reviews)
+    review_tag_service.record_reviews(session, reviews)
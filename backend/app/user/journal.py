@@ -0,0 +1,314 @@
+"""
+Write-behind journal for rating inserts.
+
+With RATING_WRITE_BEHIND on, a validated rating is appended to an
+append-only journal file and fsynced before the request is acknowledged
+(concurrent appends share one fsync). A flusher thread then moves journaled
+ratings into the `rating` table in group commits, so a burst costs one
+SQLite write transaction per batch instead of one per request.
+
+Every entry carries a sequence number. The highest applied one is stored in
+`journal_checkpoint` in the same transaction as the rows, which makes replay
+idempotent: on startup, entries past the checkpoint are applied and the rest
+skipped, so a crash between acknowledging and flushing loses nothing. The
+file is truncated whenever everything in it has been applied.
+
+A batch that fails to apply is retried one entry at a time. Entries that
+fail on their own for anything but a transient database error (locked,
+pool timeout) are moved to a dead-letter file next to the journal, logged,
+and stepped over by the checkpoint, so one bad entry cannot stall the
+journal or keep the app from starting.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from sqlalchemy import exc, func, insert, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import threading
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.versioning import bump_dataset_version
+from app.models.journal_checkpoint import JournalCheckpoint
+from app.models.rating import Rating
+from app.models.user import User
+from .aggregates import record_new_ratings
+
+logger = logging.getLogger(__name__)
+
+# Worth retrying later as they are; anything else is a problem with the entry
+TRANSIENT_ERRORS = (exc.OperationalError, exc.TimeoutError)
+
+
+class JournalClosed(RuntimeError):
+    """The journal is stopped or stopping and takes no more entries"""
+
+
+class RatingJournal:
+    """Durable buffer of acknowledged ratings, flushed to the database in batches"""
+
+    def __init__(self, path: str, flush_interval_ms: int, flush_max_rows: int):
+        self.path = Path(path)
+        self.dead_letter_path = self.path.with_name(f"{self.path.stem}.dead{self.path.suffix}")
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_rows = flush_max_rows
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced_seq = 0
+        self._stop = threading.Event()
+        self._pending: List[Dict[str, Any]] = []
+        self._next_seq = 1
+        self._file = None
+        self._accepting = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def name(self) -> str:
+        return str(self.path)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Replay anything left from the previous run, then start the flusher"""
+        if self.running:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        replayed = self.recover()
+        if replayed:
+            logger.info("Replayed %d journaled ratings from %s", replayed, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._accepting = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="rating-journal", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and apply whatever is still pending"""
+        if not self.running:
+            return
+        self._stop.set()
+        with self._wake:
+            self._wake.notify()
+        self._thread.join(timeout)
+        self._thread = None
+        # Appends that got in before this are pending and flushed below; later
+        # ones get JournalClosed and are inserted synchronously by the caller
+        with self._lock:
+            self._accepting = False
+        try:
+            while self.flush():
+                pass
+        finally:
+            with self._sync_lock, self._lock:
+                self._file.close()
+                self._file = None
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """
+        Journal one rating (road_id, user_id, rating, location, timestamp)
+        and return its sequence number. The entry is on disk when this returns.
+        Raises JournalClosed once the journal is stopping.
+        """
+        with self._lock:
+            if not self._accepting:
+                raise JournalClosed("The rating journal is not accepting entries")
+            seq = self._next_seq
+            record = {
+                "seq": seq,
+                "road_id": entry["road_id"],
+                "user_id": entry["user_id"],
+                "rating": str(entry["rating"]),
+                "location": entry["location"],
+                "timestamp": entry["timestamp"].isoformat(),
+            }
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self._next_seq += 1
+            self._pending.append(record)
+            if len(self._pending) >= self.flush_max_rows:
+                self._wake.notify()
+        self._sync(seq)
+        return seq
+
+    def _sync(self, seq: int) -> None:
+        """fsync up to `seq`; one fsync covers every append written before it (group commit)"""
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return
+            with self._lock:
+                written = self._next_seq - 1
+                file = self._file
+            if file is None:
+                # Stopped meanwhile; stop() applied every pending entry to the database
+                return
+            os.fsync(file.fileno())
+            self._synced_seq = written
+
+    def flush(self) -> int:
+        """
+        Apply up to flush_max_rows pending ratings in one transaction.
+        Returns the number of entries applied or dead-lettered.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending[:self.flush_max_rows]
+            if not batch:
+                return 0
+
+            handled = self._commit_batch(batch)
+
+            with self._lock:
+                # Appends only ever extend the list, so the batch is still at the front
+                del self._pending[:handled]
+                if not self._pending:
+                    self._truncate()
+            return handled
+
+    def recover(self) -> int:
+        """Apply journaled entries newer than the checkpoint and empty the journal"""
+        entries = self._read()
+        session = SessionLocal()
+        try:
+            checkpoint = session.get(JournalCheckpoint, self.name)
+            last_seq = checkpoint.last_seq if checkpoint else 0
+        finally:
+            session.close()
+
+        todo = [e for e in entries if e["seq"] > last_seq]
+        for start in range(0, len(todo), self.flush_max_rows):
+            chunk = todo[start:start + self.flush_max_rows]
+            while chunk:
+                chunk = chunk[self._commit_batch(chunk):]
+
+        self._next_seq = max([last_seq] + [e["seq"] for e in entries]) + 1
+        self._synced_seq = self._next_seq - 1
+        if self.path.exists():
+            with open(self.path, "w", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+        return len(todo)
+
+    def _commit_batch(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Apply entries in one transaction, or failing that one at a time,
+        dead-lettering those that cannot be applied. Returns how many
+        leading entries were dealt with; raises if a transient error stops
+        the first one.
+        """
+        try:
+            self._commit(entries)
+            return len(entries)
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception:
+            logger.warning("Applying %d journaled ratings failed, retrying one by one", len(entries), exc_info=True)
+
+        for handled, entry in enumerate(entries):
+            try:
+                self._commit([entry])
+            except TRANSIENT_ERRORS:
+                if handled == 0:
+                    raise
+                return handled
+            except Exception as e:
+                self._dead_letter(entry, e)
+        return len(entries)
+
+    def _commit(self, entries: List[Dict[str, Any]]) -> None:
+        session = SessionLocal()
+        try:
+            self._apply(session, entries)
+            session.commit()
+        finally:
+            session.close()
+
+    def _dead_letter(self, entry: Dict[str, Any], error: Exception) -> None:
+        """Set an entry that cannot be applied aside and move the checkpoint past it"""
+        logger.error("Dead-lettering journaled rating seq=%s to %s: %r", entry.get("seq"), self.dead_letter_path, error)
+        record = {"entry": entry, "error": repr(error), "failed_at": datetime.now(timezone.utc).isoformat()}
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        session = SessionLocal()
+        try:
+            self._advance_checkpoint(session, entry["seq"])
+            session.commit()
+        finally:
+            session.close()
+
+    def _advance_checkpoint(self, session: Session, last_seq: int) -> None:
+        checkpoint = session.get(JournalCheckpoint, self.name)
+        if checkpoint is None:
+            session.add(JournalCheckpoint(name=self.name, last_seq=last_seq))
+        else:
+            checkpoint.last_seq = max(checkpoint.last_seq, last_seq)
+
+    def _apply(self, session: Session, entries: List[Dict[str, Any]]) -> None:
+        rows = [
+            {
+                "road_id": e["road_id"],
+                "user_id": e["user_id"],
+                "rating": Decimal(e["rating"]),
+                "location": e["location"],
+                "timestamp": datetime.fromisoformat(e["timestamp"]),
+            }
+            for e in entries
+        ]
+        ratings = list(session.scalars(insert(Rating).returning(Rating, sort_by_parameter_order=True), rows))
+        record_new_ratings(session, ratings)
+
+        for user_id, count in Counter(e["user_id"] for e in entries).items():
+            session.execute(
+                update(User)
+                .where(User.user_id == user_id)
+                .values(total_contributions=func.coalesce(User.total_contributions, 0) + count),
+                execution_options={"synchronize_session": False},
+            )
+
+        self._advance_checkpoint(session, max(e["seq"] for e in entries))
+        bump_dataset_version(session)
+
+    def _read(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash mid-append was never acknowledged
+                    logger.warning("Skipping unreadable line %d of %s", line_no, self.path)
+        return entries
+
+    def _truncate(self) -> None:
+        self._file.truncate(0)
+        os.fsync(self._file.fileno())
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            with self._wake:
+                if len(self._pending) < self.flush_max_rows:
+                    self._wake.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # Entries stay pending and journaled; the next tick retries them
+                logger.exception("Flushing journaled ratings failed")
+                self._stop.wait(self.flush_interval)
+
+
+rating_journal = RatingJournal(
+    settings.RATING_JOURNAL_PATH,
+    settings.RATING_FLUSH_INTERVAL_MS,
+    settings.RATING_FLUSH_MAX_ROWS,
+)
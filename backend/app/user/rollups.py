@@ -0,0 +1,195 @@
+"""
+Time-bucketed rating rollups for trend charts.
+
+Each rating lands in a day, week and month bucket for both its road and the
+road's builder. New ratings are folded in with one INSERT ... ON CONFLICT DO
+UPDATE per batch, so trends never read the rating table; rebuild() recomputes
+the history from scratch (see scripts/rebuild_rating_rollups.py).
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from app.models.rating import Rating
+from app.models.rating_rollup import RatingRollup
+from app.models.road import Road
+from .schemas import TrendBucket, TrendPoint, TrendResponse
+
+BUCKETS = ("day", "week", "month")
+SCOPES = ("road", "builder")
+
+RollupKey = Tuple[str, int, str, date]
+
+
+def bucket_start(moment: Union[datetime, date], bucket: str) -> date:
+    """First day of the bucket holding `moment`; weeks start on Monday"""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown bucket: {bucket}")
+
+
+def _fold(rollups: Dict[RollupKey, Dict[str, Any]], key: RollupKey, value: Decimal) -> None:
+    row = rollups.get(key)
+    if row is None:
+        rollups[key] = {"rating_count": 1, "rating_sum": value, "rating_min": value, "rating_max": value}
+        return
+    row["rating_count"] += 1
+    row["rating_sum"] += value
+    row["rating_min"] = min(row["rating_min"], value)
+    row["rating_max"] = max(row["rating_max"], value)
+
+
+class RatingRollupService:
+    """Incremental maintenance and reads of rating_rollup"""
+
+    def record_ratings(self, session: Session, ratings: Iterable[Rating]) -> None:
+        """Fold new ratings into their buckets; commits with the caller's transaction"""
+        ratings = list(ratings)
+        if not ratings:
+            return
+        owners = dict(session.execute(
+            select(Road.road_id, Road.builder_id).where(Road.road_id.in_({r.road_id for r in ratings}))
+        ).all())
+        rollups: Dict[RollupKey, Dict[str, Any]] = {}
+        for rating in ratings:
+            self._add(rollups, rating, owners.get(rating.road_id))
+        self._merge(session, rollups)
+
+    def _add(
+        self,
+        rollups: Dict[RollupKey, Dict[str, Any]],
+        rating: Rating,
+        builder_id: Optional[int],
+    ) -> None:
+        value = Decimal(str(rating.rating))
+        for bucket in BUCKETS:
+            start = bucket_start(rating.timestamp, bucket)
+            _fold(rollups, ("road", rating.road_id, bucket, start), value)
+            if builder_id is not None:
+                _fold(rollups, ("builder", builder_id, bucket, start), value)
+
+    def _merge(self, session: Session, rollups: Dict[RollupKey, Dict[str, Any]]) -> None:
+        rows = [
+            {"scope": scope, "scope_id": scope_id, "bucket": bucket, "bucket_start": start, **values}
+            for (scope, scope_id, bucket, start), values in rollups.items()
+        ]
+        if not rows:
+            return
+
+        dialect = session.get_bind().dialect.name
+        if dialect not in ("sqlite", "postgresql"):
+            for row in rows:
+                self._merge_row(session, row)
+            return
+
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(RatingRollup)
+        t = RatingRollup.__table__.c
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[t.scope, t.scope_id, t.bucket, t.bucket_start],
+                set_={
+                    "rating_count": t.rating_count + stmt.excluded.rating_count,
+                    "rating_sum": t.rating_sum + stmt.excluded.rating_sum,
+                    "rating_min": case((stmt.excluded.rating_min < t.rating_min, stmt.excluded.rating_min), else_=t.rating_min),
+                    "rating_max": case((stmt.excluded.rating_max > t.rating_max, stmt.excluded.rating_max), else_=t.rating_max),
+                },
+            ),
+            rows,
+        )
+
+    def _merge_row(self, session: Session, row: Dict[str, Any]) -> None:
+        """Portable update-or-insert for databases without ON CONFLICT"""
+        result = session.execute(
+            update(RatingRollup)
+            .where(
+                RatingRollup.scope == row["scope"],
+                RatingRollup.scope_id == row["scope_id"],
+                RatingRollup.bucket == row["bucket"],
+                RatingRollup.bucket_start == row["bucket_start"],
+            )
+            .values(
+                rating_count=RatingRollup.rating_count + row["rating_count"],
+                rating_sum=RatingRollup.rating_sum + row["rating_sum"],
+                rating_min=case((RatingRollup.rating_min > row["rating_min"], row["rating_min"]), else_=RatingRollup.rating_min),
+                rating_max=case((RatingRollup.rating_max < row["rating_max"], row["rating_max"]), else_=RatingRollup.rating_max),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        if not result.rowcount:
+            session.add(RatingRollup(**row))
+            session.flush()
+
+    def trend(
+        self,
+        session: Session,
+        scope: str,
+        scope_id: int,
+        bucket: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[RatingRollup]:
+        """Rollup rows of one road or builder, oldest bucket first"""
+        query = session.query(RatingRollup).filter(
+            RatingRollup.scope == scope,
+            RatingRollup.scope_id == scope_id,
+            RatingRollup.bucket == bucket,
+        )
+        if start is not None:
+            query = query.filter(RatingRollup.bucket_start >= bucket_start(start, bucket))
+        if end is not None:
+            query = query.filter(RatingRollup.bucket_start <= end)
+        return query.order_by(RatingRollup.bucket_start).all()
+
+    def trend_response(
+        self,
+        session: Session,
+        scope: str,
+        scope_id: int,
+        bucket: TrendBucket,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> TrendResponse:
+        rows = self.trend(session, scope, scope_id, bucket.value, start, end)
+        return TrendResponse(
+            scope=scope,
+            scope_id=scope_id,
+            bucket=bucket,
+            points=[
+                TrendPoint(
+                    bucket_start=row.bucket_start,
+                    count=row.rating_count,
+                    average=(Decimal(str(row.rating_sum)) / row.rating_count).quantize(Decimal('0.01')),
+                    min=row.rating_min,
+                    max=row.rating_max,
+                )
+                for row in rows
+            ],
+        )
+
+    def rebuild(self, session: Session, batch_size: int = 5000) -> int:
+        """Recompute every rollup from the rating table. Returns the number of ratings processed."""
+        rollups: Dict[RollupKey, Dict[str, Any]] = {}
+        count = 0
+        rows = session.execute(
+            select(Rating, Road.builder_id)
+            .join(Road, Road.road_id == Rating.road_id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rating, builder_id in rows:
+            self._add(rollups, rating, builder_id)
+            count += 1
+
+        session.execute(delete(RatingRollup))
+        self._merge(session, rollups)
+        return count
+
+
+rating_rollup_service = RatingRollupService()
@@ -1,20 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_async_read_db, get_db, get_read_db
 from app.core.config import settings
 from app.models.builder import Builder
 from app.models.user import User
 from app.models.road import Road
 from app.auth.dependencies import get_current_user
 from .schemas import (
+    BatchSyncRequest,
+    BatchSyncResponse,
     RatingCreate,
+    RatingQueuedResponse,
     ReviewCreate,
     RatingResponse,
     ReviewResponse,
-    RoadInfoResponse
+    RoadInfoResponse,
+    RoadTagCountsResponse,
+    TagCountItem,
+    TagRoadItem,
+    TagTopRoadsResponse,
+    TrendBucket,
+    TrendResponse
 )
+from .rollups import rating_rollup_service
+from .journal import JournalClosed, rating_journal
 from .services import UserService
-from typing import List, Optional
+from .tags import normalize_tag, parse_review_tags, review_tag_service
+from typing import List, Optional, Union
+from datetime import date
 
 user_router = APIRouter(prefix="/user", tags=["User"])
 user_service = UserService()
@@ -26,61 +40,80 @@ current_user = {
 @user_router.get('/roads/{road_id}', response_model=RoadInfoResponse, status_code=status.HTTP_200_OK)
 def get_road_info(
     road_id: int,
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_read_db)
+):
+    """
+    Get detailed information about a specific road, in a single query.
+    """
+    return user_service.get_road_detail(road_id, session)
+
+
+@user_router.get('/roads/{road_id}/trend', response_model=TrendResponse, status_code=status.HTTP_200_OK)
+def get_road_trend(
+    road_id: int,
+    bucket: TrendBucket = Query(TrendBucket.week),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    session: Session = Depends(get_read_db)
 ):
     """
-    Get detailed information about a specific road.
+    Rating count, average, min and max of a road per day, week or month,
+    served from the precomputed rollups.
     """
-    road = session.query(Road).filter(Road.road_id == road_id).first()
-    if not road:
+    if not session.query(Road.road_id).filter(Road.road_id == road_id).first():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Road not found"
         )
-    
-    # Get average rating
-    avg_rating = user_service.get_average_rating(road_id, session)
-    
-    # Get counts
-    total_ratings = len(road.ratings)
-    total_reviews = len(road.reviews)
-
-    return RoadInfoResponse(
-        road_id=road.road_id,
-        builder_id=road.builder_id,
-        builder_name=road.builder.name,
-        cost=road.cost,
-        employee_id=road.employee_id,
-        employee_name=road.employee.user.name,
-        status=road.status,
-        maintained_by=road.maintained_by,
-        maintainer_name=road.maintainer.name,
-        started_date=str(road.started_date),
-        ended_date=str(road.ended_date) if road.ended_date else None,
-        verification_date=str(road.date_verified) if road.date_verified else None,
-        chief_engineer=road.chief_engineer,
-        average_rating=avg_rating,
-        total_ratings=total_ratings,
-        total_reviews=total_reviews
-    )
+    return rating_rollup_service.trend_response(session, "road", road_id, bucket, start, end)
 
 
-@user_router.post('/roads/rate/', response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
+@user_router.post(
+    '/roads/rate/',
+    response_model=Union[RatingResponse, RatingQueuedResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": RatingQueuedResponse, "description": "Journaled for write-behind insert"}},
+)
 def rate_road(
     payload: RatingCreate,
+    response: Response,
     # current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db),
+    read_session: Session = Depends(get_read_db)
 ):
     """
     Rate a road. Requires authentication.
+    In write-behind mode the rating is journaled and acknowledged with 202;
+    it shows up in listings and aggregates after the next flush.
     """
+    if rating_journal.running:
+        # Validation reads go to the read pool: the writer connection stays
+        # free for the journal flusher (sessions only connect on first use)
+        try:
+            queued = user_service.enqueue_rating(
+                road_id=payload.road_id,
+                user_id=current_user['user_id'],
+                rating_value=payload.rating,
+                location=payload.location,
+                session=read_session,
+                lat=payload.lat,
+                lng=payload.lng
+            )
+        except JournalClosed:
+            # Shutting down between the check and the append: insert synchronously
+            pass
+        else:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return queued
 
     rating = user_service.create_rating(
         road_id=payload.road_id,
         user_id=current_user['user_id'],
         rating_value=payload.rating,
         location=payload.location,
-        session=session
+        session=session,
+        lat=payload.lat,
+        lng=payload.lng
     )
     return rating
 
@@ -91,7 +124,8 @@ async def review_road(
     tags: Optional[str] = Form(None),
     media_file: Optional[UploadFile] = File(None),
     # current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db),
+    read_session: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Review a road with optional media file upload. Requires authentication.
@@ -100,52 +134,74 @@ async def review_road(
     - tags: str (optional, comma-separated)
     - media_file: file (optional, image/video)
     """
-    review = await user_service.create_review(
+    review = await user_service.create_review_async(
         road_id=road_id,
         user_id=current_user['user_id'],
         media_file=media_file,
         tags=tags,
-        session=session
+        session=session,
+        read_session=read_session
     )
     return review
 
 
+@user_router.post('/roads/batch/', response_model=BatchSyncResponse, status_code=status.HTTP_200_OK)
+def sync_batch(
+    payload: BatchSyncRequest,
+    # current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    """
+    Submit ratings and text reviews collected offline in one request.
+    Each item is accepted or rejected on its own; the response lists the
+    outcome of every item in request order.
+    """
+    return user_service.sync_batch(
+        ratings=payload.ratings,
+        reviews=payload.reviews,
+        user_id=current_user['user_id'],
+        session=session
+    )
+
+
 @user_router.get('/roads/{road_id}/ratings/', response_model=List[RatingResponse], status_code=status.HTTP_200_OK)
 def get_road_ratings(
     road_id: int,
-    session: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next cursor from the previous page"),
+    session: Session = Depends(get_read_db)
 ):
     """
-    Get all ratings for a specific road.
+    Get a page of ratings for a specific road, newest first.
+    The body stays a plain list; the next page's cursor is sent in the
+    X-Next-Cursor header (absent on the last page).
     """
-    ratings = user_service.get_road_ratings(road_id, session)
+    ratings, next_cursor = user_service.get_road_ratings_page(road_id, session, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return ratings
 
 
 @user_router.get("/roads/{road_id}/reviews", response_model=dict)
 async def get_road_reviews(
     road_id: int,
-    session: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Fetch all reviews for a given road with tag frequency count.
+    Fetch a page of reviews for a given road, newest first, with the tag
+    frequency count over all of its reviews.
     """
-    reviews = user_service.get_road_reviews(road_id=road_id, session=session)
+    reviews, next_cursor = await user_service.get_road_reviews_page_async(road_id, session, limit, cursor)
 
-    tag_counts = {}
+    # Counts are maintained on write in road_tag_count
+    tag_counts = await session.run_sync(review_tag_service.road_tag_counts, road_id)
     all_reviews = []
 
     for review in reviews:
-        # Split tags safely
-        tags = []
-        if review.tags:
-            tags = [t.strip() for t in review.tags.split(",") if t.strip() and not t.isdigit()]
-
-        # Update tag counts
-        for tag in tags:
-            if tag not in tag_counts:
-                tag_counts[tag] = 0
-            tag_counts[tag] += 1
+        comment, tags = parse_review_tags(review.tags)
 
         # Construct full media URL if media exists
         media_url = None
@@ -155,13 +211,55 @@ async def get_road_reviews(
         all_reviews.append({
             "user_id": review.user_id,
             "tags": tags,
-            "comment": review.tags.split(",")[0] if review.tags else "",
+            "comment": comment,
             "media": media_url,
-            "timestamp": str(review.timestamp),
+            "timestamp": review.timestamp.isoformat(),
         })
 
     return {
         "reviews": all_reviews,
         "tag_counts": tag_counts,
+        "next_cursor": next_cursor,
     }
 
+
+@user_router.get("/roads/{road_id}/tags", response_model=RoadTagCountsResponse, status_code=status.HTTP_200_OK)
+def get_road_tag_counts(
+    road_id: int,
+    session: Session = Depends(get_read_db)
+):
+    """
+    Number of reviews of a road carrying each tag, most used first.
+    """
+    if not session.query(Road.road_id).filter(Road.road_id == road_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Road not found"
+        )
+    return RoadTagCountsResponse(road_id=road_id, tag_counts=review_tag_service.road_tag_counts(session, road_id))
+
+
+@user_router.get("/tags", response_model=List[TagCountItem], status_code=status.HTTP_200_OK)
+def get_tag_counts(
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_read_db)
+):
+    """
+    City-wide tag usage across all reviews, most used first.
+    """
+    return [TagCountItem(tag=t.tag, count=t.count) for t in review_tag_service.city_tag_counts(session, limit)]
+
+
+@user_router.get("/tags/top-roads", response_model=TagTopRoadsResponse, status_code=status.HTTP_200_OK)
+def get_top_roads_for_tag(
+    tag: str = Query(..., min_length=1, description="Tag to rank roads by, matched case-insensitively"),
+    k: int = Query(10, ge=1, le=100),
+    session: Session = Depends(get_read_db)
+):
+    """
+    The k roads with the most reviews carrying a tag (e.g. "Potholes Present").
+    """
+    return TagTopRoadsResponse(
+        tag=normalize_tag(tag),
+        roads=[TagRoadItem(road_id=road_id, count=count) for road_id, count in review_tag_service.top_roads(session, tag, k)],
+    )
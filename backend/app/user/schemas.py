@@ -1,15 +1,18 @@
-from pydantic import BaseModel, Field, field_validator
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from decimal import Decimal
+from enum import Enum
 
 
 # Request schemas
 class RatingCreate(BaseModel):
     """Schema for creating a rating"""
-    road_id: int = Field(..., gt=0, description="ID of the road being rated")
+    road_id: Optional[int] = Field(None, gt=0, description="ID of the road being rated; inferred from lat/lng when omitted")
     rating: Decimal = Field(..., ge=0.0, le=5.0, decimal_places=1, description="Rating value between 0.0 and 5.0")
-    location: str = Field(..., min_length=1, description="Location where rating was given")
+    location: Optional[str] = Field(None, min_length=1, description="Location where rating was given; defaults to 'lat,lng'")
+    lat: Optional[float] = Field(None, ge=-90, le=90, description="GPS latitude where the rating was given")
+    lng: Optional[float] = Field(None, ge=-180, le=180, description="GPS longitude where the rating was given")
 
     @field_validator('rating')
     @classmethod
@@ -18,6 +21,17 @@ class RatingCreate(BaseModel):
             raise ValueError('Rating must be between 0.0 and 5.0')
         return v
 
+    @model_validator(mode='after')
+    def validate_target(self):
+        if (self.lat is None) != (self.lng is None):
+            raise ValueError('lat and lng must be provided together')
+        if self.lat is None:
+            if self.road_id is None:
+                raise ValueError('Provide road_id or lat/lng')
+            if self.location is None:
+                raise ValueError('location is required when lat/lng are not provided')
+        return self
+
 
 class ReviewCreate(BaseModel):
     """Schema for creating a review"""
@@ -26,6 +40,24 @@ class ReviewCreate(BaseModel):
     tags: Optional[str] = Field(None, description="Comma-separated tags")
 
 
+class RatingBatchItem(RatingCreate):
+    """A rating collected offline; timestamp is when it was recorded on the device"""
+    timestamp: Optional[datetime] = Field(None, description="When the rating was recorded; defaults to now")
+
+
+class ReviewBatchItem(BaseModel):
+    """A text-only review collected offline (media is uploaded through /roads/review/)"""
+    road_id: int = Field(..., gt=0, description="ID of the road being reviewed")
+    tags: Optional[str] = Field(None, description="Comma-separated tags")
+    timestamp: Optional[datetime] = Field(None, description="When the review was recorded; defaults to now")
+
+
+class BatchSyncRequest(BaseModel):
+    """Ratings and reviews queued on a device while offline"""
+    ratings: List[RatingBatchItem] = Field(default_factory=list, max_length=1000)
+    reviews: List[ReviewBatchItem] = Field(default_factory=list, max_length=1000)
+
+
 # Response schemas
 class RatingResponse(BaseModel):
     rating_id: int
@@ -39,6 +71,16 @@ class RatingResponse(BaseModel):
         from_attributes = True
 
 
+class RatingQueuedResponse(BaseModel):
+    """A rating accepted into the write-behind journal; it has no rating_id yet"""
+    journal_seq: int
+    road_id: int
+    user_id: int
+    rating: Decimal
+    timestamp: datetime
+    location: str
+
+
 class ReviewResponse(BaseModel):
     review_id: int
     road_id: int
@@ -51,6 +93,22 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class BatchItemResult(BaseModel):
+    """Outcome of one submitted item, in request order"""
+    index: int
+    status: str  # "created" or "rejected"
+    id: Optional[int] = None
+    road_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BatchSyncResponse(BaseModel):
+    ratings: List[BatchItemResult]
+    reviews: List[BatchItemResult]
+    created: int
+    rejected: int
+
+
 class RoadInfoResponse(BaseModel):
     """Response schema for road information"""
     road_id: int
@@ -69,4 +127,47 @@ class RoadInfoResponse(BaseModel):
     average_rating: Optional[Decimal] = None
     total_ratings: int = 0
     total_reviews: int = 0
+    # Bayesian, time-decayed score; None until the scoring job has run
+    score: Optional[float] = None
+
+
+class TagCountItem(BaseModel):
+    tag: str
+    count: int
+
+
+class RoadTagCountsResponse(BaseModel):
+    road_id: int
+    tag_counts: Dict[str, int]
+
+
+class TagRoadItem(BaseModel):
+    road_id: int
+    count: int
+
+
+class TagTopRoadsResponse(BaseModel):
+    tag: str
+    roads: List[TagRoadItem]
+
+
+class TrendBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class TrendPoint(BaseModel):
+    bucket_start: date
+    count: int
+    average: Decimal
+    min: Decimal
+    max: Decimal
+
 
+class TrendResponse(BaseModel):
+    """Rating trend of a road or builder, oldest bucket first"""
+    scope: str
+    scope_id: int
+    bucket: TrendBucket
+    points: List[TrendPoint]
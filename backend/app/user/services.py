@@ -1,13 +1,27 @@
 from app.models.builder import Builder
+from app.models.employee import Employee
 from app.models.user import User
 from app.models.rating import Rating
 from app.models.review import Review
 from app.models.road import Road
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from app.models.road_stats import RoadStats
+from app.roads.nearest import road_matcher
+from app.roads.schemas import GeometryParams
+from app.roads.services import RoadService
+from app.roads.stats import average_rating, road_stats_service
+from .aggregates import record_new_ratings, record_new_reviews
+from .journal import rating_journal
+from .schemas import RatingBatchItem, ReviewBatchItem, RoadInfoResponse
+from app.core.config import settings
+from app.core.pagination import keyset_page, keyset_query, keyset_result
+from app.core.versioning import bump_dataset_version
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from fastapi import HTTPException, status, UploadFile
-from datetime import datetime, timezone
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from decimal import Decimal
 import os
 import uuid
@@ -21,6 +35,8 @@ class UserService:
     UPLOAD_DIR = Path("storage/review_media")
     ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".mp4", ".mov", ".avi"}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    # How far ahead of the server clock a device timestamp may be
+    MAX_CLOCK_SKEW = timedelta(minutes=5)
     
     def __init__(self):
         """Initialize service and create upload directory if it doesn't exist"""
@@ -68,16 +84,42 @@ class UserService:
             # Log error but don't fail if file deletion fails
             print(f"Error deleting file {file_path}: {e}")
     
-    def create_rating(self, road_id: int, user_id: int, rating_value: Decimal, location: str, session: Session) -> Rating:
-        """Create a new rating for a road"""
-        # Check if road exists
-        road = session.query(Road).filter(Road.road_id == road_id).first()
-        if not road:
+    def match_rating_road(self, road_id: Optional[int], lat: float, lng: float, session: Session) -> int:
+        """
+        Resolve the road a GPS-tagged rating refers to. Without a road_id the
+        nearest road is assigned; with one, it must be near the given point.
+        """
+        max_distance = settings.RATING_MATCH_MAX_DISTANCE_M
+        matches = road_matcher.nearest_roads(session, lat, lng, k=100, max_distance_m=max_distance)
+
+        if road_id is None:
+            if not matches:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No road found within {max_distance:g} m of this location"
+                )
+            return matches[0].road_id
+
+        if road_id not in {m.road_id for m in matches}:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Road not found"
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Location is more than {max_distance:g} m away from road {road_id}"
             )
-        
+        return road_id
+
+    def create_rating(
+        self,
+        road_id: Optional[int],
+        user_id: int,
+        rating_value: Decimal,
+        location: Optional[str],
+        session: Session,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> Rating:
+        """Create a new rating for a road, validating or inferring the road from lat/lng when given"""
+        road_id, location = self._rating_target(road_id, location, lat, lng, session)
+
         # Create new rating (allow multiple ratings by the same user)
         new_rating = Rating(
             road_id=road_id,
@@ -88,17 +130,60 @@ class UserService:
         )
         
         session.add(new_rating)
+        record_new_ratings(session, [new_rating])
         
         # Update user's total contributions
         user = session.query(User).filter(User.user_id == user_id).first()
         if user:
             user.total_contributions += 1
-        
+
+        bump_dataset_version(session)
         session.commit()
         session.refresh(new_rating)
         
         return new_rating
     
+    def enqueue_rating(
+        self,
+        road_id: Optional[int],
+        user_id: int,
+        rating_value: Decimal,
+        location: Optional[str],
+        session: Session,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Validate a rating and append it to the write-behind journal. It is
+        durable on return and reaches the rating table with the next flush.
+        """
+        road_id, location = self._rating_target(road_id, location, lat, lng, session)
+        entry = {
+            "road_id": road_id,
+            "user_id": user_id,
+            "rating": rating_value,
+            "location": location,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        return {**entry, "journal_seq": rating_journal.append(entry)}
+
+    def _rating_target(
+        self,
+        road_id: Optional[int],
+        location: Optional[str],
+        lat: Optional[float],
+        lng: Optional[float],
+        session: Session,
+    ) -> Tuple[int, str]:
+        """Road and location a rating applies to; 404 if the road does not exist"""
+        if lat is not None and lng is not None:
+            road_id = self.match_rating_road(road_id, lat, lng, session)
+            if location is None:
+                location = f"{lat:.6f},{lng:.6f}"
+
+        self._ensure_road(road_id, session)
+        return road_id, location
+
     async def create_review(
         self, 
         road_id: int, 
@@ -131,17 +216,139 @@ class UserService:
         )
         
         session.add(new_review)
+        record_new_reviews(session, [new_review])
         
         # Update user's total contributions
         user = session.query(User).filter(User.user_id == user_id).first()
         if user:
             user.total_contributions += 1
-        
+
+        bump_dataset_version(session)
         session.commit()
         session.refresh(new_review)
         
         return new_review
     
+    def sync_batch(
+        self,
+        ratings: List[RatingBatchItem],
+        reviews: List[ReviewBatchItem],
+        user_id: int,
+        session: Session,
+    ) -> Dict[str, Any]:
+        """
+        Insert a batch of offline ratings and reviews in one transaction.
+        Items that fail validation are rejected individually and reported
+        back in request order; the rest are stored together. All roads are
+        checked with one IN query and each table gets one executemany insert.
+        """
+        now = datetime.now(timezone.utc)
+        rating_results: List[Dict[str, Any]] = [{"index": i} for i in range(len(ratings))]
+        review_results: List[Dict[str, Any]] = [{"index": i} for i in range(len(reviews))]
+
+        # GPS-tagged ratings resolve (and thereby validate) their road first
+        rating_roads: List[Optional[int]] = []
+        locations: List[Optional[str]] = []
+        for item, result in zip(ratings, rating_results):
+            road_id, location = item.road_id, item.location
+            if item.lat is not None and item.lng is not None:
+                try:
+                    road_id = self.match_rating_road(road_id, item.lat, item.lng, session)
+                except HTTPException as e:
+                    self._reject(result, road_id, e.detail)
+                    road_id = None
+                if location is None:
+                    location = f"{item.lat:.6f},{item.lng:.6f}"
+            rating_roads.append(road_id)
+            locations.append(location)
+
+        wanted = {r for r in rating_roads if r is not None} | {item.road_id for item in reviews}
+        existing = set(session.execute(select(Road.road_id).where(Road.road_id.in_(wanted))).scalars()) if wanted else set()
+
+        rating_rows, rating_slots = [], []
+        for item, result, road_id, location in zip(ratings, rating_results, rating_roads, locations):
+            if "status" in result:
+                continue
+            timestamp = self._batch_timestamp(item.timestamp, now)
+            if road_id not in existing:
+                self._reject(result, road_id, "Road not found")
+            elif timestamp is None:
+                self._reject(result, road_id, "Timestamp is in the future")
+            else:
+                rating_rows.append({
+                    "road_id": road_id,
+                    "user_id": user_id,
+                    "rating": item.rating,
+                    "location": location,
+                    "timestamp": timestamp,
+                })
+                rating_slots.append(result)
+
+        review_rows, review_slots = [], []
+        for item, result in zip(reviews, review_results):
+            timestamp = self._batch_timestamp(item.timestamp, now)
+            if item.road_id not in existing:
+                self._reject(result, item.road_id, "Road not found")
+            elif timestamp is None:
+                self._reject(result, item.road_id, "Timestamp is in the future")
+            else:
+                review_rows.append({
+                    "road_id": item.road_id,
+                    "user_id": user_id,
+                    "media": None,
+                    "tags": item.tags,
+                    "timestamp": timestamp,
+                })
+                review_slots.append(result)
+
+        # executemany with RETURNING; sort_by_parameter_order keeps ids aligned with the rows
+        new_ratings = self._insert_many(session, Rating, rating_rows)
+        new_reviews = self._insert_many(session, Review, review_rows)
+        for result, rating in zip(rating_slots, new_ratings):
+            result.update(status="created", id=rating.rating_id, road_id=rating.road_id)
+        for result, review in zip(review_slots, new_reviews):
+            result.update(status="created", id=review.review_id, road_id=review.road_id)
+
+        created = len(new_ratings) + len(new_reviews)
+        if created:
+            record_new_ratings(session, new_ratings)
+            record_new_reviews(session, new_reviews)
+            self._add_contributions(session, user_id, created)
+            bump_dataset_version(session)
+            session.commit()
+
+        return {
+            "ratings": rating_results,
+            "reviews": review_results,
+            "created": created,
+            "rejected": len(ratings) + len(reviews) - created,
+        }
+
+    def _add_contributions(self, session: Session, user_id: int, count: int) -> None:
+        session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(total_contributions=func.coalesce(User.total_contributions, 0) + count),
+            execution_options={"synchronize_session": False},
+        )
+
+    def _insert_many(self, session: Session, model, rows: List[Dict[str, Any]]) -> list:
+        if not rows:
+            return []
+        return list(session.scalars(insert(model).returning(model, sort_by_parameter_order=True), rows))
+
+    def _batch_timestamp(self, timestamp: Optional[datetime], now: datetime) -> Optional[datetime]:
+        """Device timestamp in UTC (naive ones are taken as UTC), or None if it lies in the future"""
+        if timestamp is None:
+            return now
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        timestamp = timestamp.astimezone(timezone.utc)
+        return None if timestamp > now + self.MAX_CLOCK_SKEW else timestamp
+
+    def _reject(self, result: Dict[str, Any], road_id: Optional[int], detail: str) -> None:
+        result.update(status="rejected", road_id=road_id, detail=detail)
+
     def get_road_ratings(self, road_id: int, session: Session) -> List[Rating]:
         """Get all ratings for a specific road"""
         road = session.query(Road).filter(Road.road_id == road_id).first()
@@ -154,6 +361,214 @@ class UserService:
         ratings = session.query(Rating).filter(Rating.road_id == road_id).all()
         return ratings
     
+    def get_road_ratings_page(
+        self,
+        road_id: int,
+        session: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Rating], Optional[str]]:
+        """One page of a road's ratings, newest first, and the cursor of the next page"""
+        self._ensure_road(road_id, session)
+        return self._page(session.query(Rating).filter(Rating.road_id == road_id), Rating.timestamp, Rating.rating_id, limit, cursor)
+
+    def get_road_reviews_page(
+        self,
+        road_id: int,
+        session: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Review], Optional[str]]:
+        """One page of a road's reviews, newest first, and the cursor of the next page"""
+        self._ensure_road(road_id, session)
+        return self._page(session.query(Review).filter(Review.road_id == road_id), Review.timestamp, Review.review_id, limit, cursor)
+
+    def _page(self, query, timestamp_column, id_column, limit: int, cursor: Optional[str]):
+        try:
+            return keyset_page(query, timestamp_column, id_column, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    def _ensure_road(self, road_id: int, session: Session) -> None:
+        if not session.query(Road.road_id).filter(Road.road_id == road_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Road not found"
+            )
+
+    # Async variants, for `async def` routes. Reads run on an AsyncSession of
+    # the read-only async pool (get_async_read_db); code shared with the sync
+    # path (road matching, aggregates, fragments) runs through
+    # AsyncSession.run_sync, whose queries also go through the async driver.
+    # Writes take a session of the one writer connection (get_db) and run in
+    # the threadpool, so every write in the process queues for it.
+
+    async def create_rating_async(
+        self,
+        road_id: Optional[int],
+        user_id: int,
+        rating_value: Decimal,
+        location: Optional[str],
+        session: Session,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> Rating:
+        """create_rating() off the event loop"""
+        return await run_in_threadpool(self.create_rating, road_id, user_id, rating_value, location, session, lat, lng)
+
+    async def create_review_async(
+        self,
+        road_id: int,
+        user_id: int,
+        media_file: Optional[UploadFile],
+        tags: Optional[str],
+        session: Session,
+        read_session: AsyncSession
+    ) -> Review:
+        """
+        create_review() with the road checked on read_session, so the writer
+        connection is not held while the media file uploads
+        """
+        await self._ensure_road_async(road_id, read_session)
+
+        media_path = None
+        if media_file and media_file.filename:
+            media_path = await self.save_media_file(media_file)
+
+        return await run_in_threadpool(self._add_review, road_id, user_id, media_path, tags, session)
+
+    def _add_review(self, road_id: int, user_id: int, media_path: Optional[str], tags: Optional[str], session: Session) -> Review:
+        new_review = Review(
+            road_id=road_id,
+            user_id=user_id,
+            media=media_path,
+            tags=tags,
+            timestamp=datetime.now(timezone.utc)
+        )
+        session.add(new_review)
+        self._record_contribution(session, record_new_reviews, new_review, user_id)
+        session.commit()
+        # Read back what was stored (a naive timestamp), like create_review()
+        session.refresh(new_review)
+        return new_review
+
+    def _record_contribution(self, session: Session, record, item, user_id: int) -> None:
+        record(session, [item])
+        self._add_contributions(session, user_id, 1)
+        bump_dataset_version(session)
+
+    async def get_road_ratings_page_async(
+        self,
+        road_id: int,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Rating], Optional[str]]:
+        await self._ensure_road_async(road_id, session)
+        return await self._page_async(
+            session, select(Rating).where(Rating.road_id == road_id), Rating.timestamp, Rating.rating_id, limit, cursor
+        )
+
+    async def get_road_reviews_page_async(
+        self,
+        road_id: int,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Review], Optional[str]]:
+        await self._ensure_road_async(road_id, session)
+        return await self._page_async(
+            session, select(Review).where(Review.road_id == road_id), Review.timestamp, Review.review_id, limit, cursor
+        )
+
+    async def get_average_rating_async(self, road_id: int, session: AsyncSession) -> Optional[Decimal]:
+        return average_rating(await session.get(RoadStats, road_id))
+
+    async def all_road_fragments_async(self, session: AsyncSession, params: Optional[GeometryParams] = None) -> List[bytes]:
+        return await session.run_sync(lambda sync_session: self.all_road_fragments(sync_session, params))
+
+    async def _page_async(self, session: AsyncSession, query, timestamp_column, id_column, limit: int, cursor: Optional[str]):
+        try:
+            query = keyset_query(query, timestamp_column, id_column, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        rows = list((await session.scalars(query)).all())
+        return keyset_result(rows, timestamp_column, id_column, limit)
+
+    async def _ensure_road_async(self, road_id: int, session: AsyncSession) -> None:
+        if (await session.execute(select(Road.road_id).where(Road.road_id == road_id))).first() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Road not found"
+            )
+
+    def get_road_detail(self, road_id: int, session: Session) -> RoadInfoResponse:
+        """
+        Road detail in a single statement: the road joined to its builder,
+        maintainer, employee (and the employee's user) and its aggregates.
+        Only columns are selected, so no ORM objects or relationships load.
+        """
+        maintainer = aliased(Builder, name="maintainer")
+        row = session.execute(
+            select(
+                Road.road_id,
+                Road.builder_id,
+                Builder.name.label("builder_name"),
+                Road.cost,
+                Road.employee_id,
+                User.name.label("employee_name"),
+                Road.status,
+                Road.maintained_by,
+                maintainer.name.label("maintainer_name"),
+                Road.started_date,
+                Road.ended_date,
+                Road.date_verified,
+                Road.chief_engineer,
+                RoadStats.rating_sum,
+                RoadStats.rating_count,
+                RoadStats.review_count,
+                RoadStats.score,
+            )
+            .join(Builder, Builder.id == Road.builder_id)
+            .join(maintainer, maintainer.id == Road.maintained_by)
+            .join(Employee, Employee.unique_id == Road.employee_id)
+            .join(User, User.user_id == Employee.user_id)
+            .outerjoin(RoadStats, RoadStats.road_id == Road.road_id)
+            .where(Road.road_id == road_id)
+        ).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Road not found"
+            )
+
+        return RoadInfoResponse(
+            road_id=row.road_id,
+            builder_id=row.builder_id,
+            builder_name=row.builder_name,
+            cost=row.cost,
+            employee_id=row.employee_id,
+            employee_name=row.employee_name,
+            status=row.status,
+            maintained_by=row.maintained_by,
+            maintainer_name=row.maintainer_name,
+            started_date=str(row.started_date),
+            ended_date=str(row.ended_date) if row.ended_date else None,
+            verification_date=str(row.date_verified) if row.date_verified else None,
+            chief_engineer=row.chief_engineer,
+            # The outer join leaves the aggregates NULL for a road without a stats row
+            average_rating=average_rating(row),
+            total_ratings=row.rating_count or 0,
+            total_reviews=row.review_count or 0,
+            score=row.score,
+        )
+
     def get_road_reviews(self, road_id: int, session: Session) -> List[Review]:
         """Get all reviews for a specific road"""
         road = session.query(Road).filter(Road.road_id == road_id).first()
@@ -167,16 +582,19 @@ class UserService:
         return reviews
     
     def get_average_rating(self, road_id: int, session: Session) -> Optional[Decimal]:
-        """Calculate average rating for a road"""
-        avg_rating = session.query(func.avg(Rating.rating)).filter(
-            Rating.road_id == road_id
-        ).scalar()
-        
-        return Decimal(str(avg_rating)).quantize(Decimal('0.1')) if avg_rating else None
+        """Average rating for a road, from the maintained aggregates"""
+        return average_rating(road_stats_service.get(session, road_id))
 
-    def all_road_data(self, session: Session):
+    def all_road_data(self, session: Session, params: Optional[GeometryParams] = None):
         """Sending all roads data with [road_id, polyline_data]"""
 
         roads_data = session.query(Road).all()
         # Convert to list of dictionaries for JSON serialization
-        return roads_data
\ No newline at end of file
+        road_service = RoadService()
+        geometries = road_service.geometries_for(roads_data, params or GeometryParams(), session)
+        return [road_service.serialize_road(road, geometries[road.road_id]) for road in roads_data]
+
+    def all_road_fragments(self, session: Session, params: Optional[GeometryParams] = None) -> List[bytes]:
+        """Every road as pre-serialized JSON, ordered by road_id (see app.roads.fragments)"""
+        revisions = session.query(Road.road_id, Road.revision).order_by(Road.road_id).all()
+        return RoadService().road_fragments(revisions, params or GeometryParams(), session)
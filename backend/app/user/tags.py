@@ -0,0 +1,142 @@
+"""
+Normalized review tags and precomputed tag counts.
+
+The client sends a review's comment and tags as one comma-separated string,
+"comment,tag1,tag2" (the comment may be empty). Tags are parsed once when a
+review is created into `review_tag`, and the per-road (`road_tag_count`) and
+city-wide (`tag_count`) counters are incremented in the same transaction, so
+tag queries never re-split review strings.
+
+Tags are indexed under their normalized key (see normalize_tag), so
+"Potholes Present" and "potholes  present" are one tag, counted once per
+review, and lookups are exact matches on the key.
+"""
+from collections import Counter
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.review import Review
+from app.models.review_tag import ReviewTag, RoadTagCount, TagCount
+
+
+def normalize_tag(tag: str) -> str:
+    """The key a tag is indexed and looked up by: whitespace collapsed, case folded"""
+    return " ".join(tag.split()).casefold()
+
+
+def parse_review_tags(raw: Optional[str]) -> Tuple[str, List[str]]:
+    """
+    Split a review's tags string into (comment, unique tags in order). Tags
+    differing only in case or spacing count once, in their first spelling.
+    """
+    if not raw:
+        return "", []
+    comment, *parts = raw.split(",")
+    tags: List[str] = []
+    seen = set()
+    for part in parts:
+        tag = " ".join(part.split())
+        if tag and not tag.isdigit() and normalize_tag(tag) not in seen:
+            seen.add(normalize_tag(tag))
+            tags.append(tag)
+    return comment.strip(), tags
+
+
+class ReviewTagService:
+    """Maintains and queries the tag index"""
+
+    def record_reviews(self, session: Session, reviews: Iterable[Review]) -> None:
+        """Index the tags of new reviews; commits with the caller's transaction"""
+        reviews = list(reviews)
+        if any(r.review_id is None for r in reviews):
+            session.flush()
+
+        rows = []
+        for review in reviews:
+            _, tags = parse_review_tags(review.tags)
+            rows.extend(
+                {"review_id": review.review_id, "road_id": review.road_id, "tag": normalize_tag(tag)} for tag in tags
+            )
+        if not rows:
+            return
+
+        session.execute(ReviewTag.__table__.insert(), rows)
+        self._increment(session, RoadTagCount, ["road_id", "tag"], Counter((r["road_id"], r["tag"]) for r in rows))
+        self._increment(session, TagCount, ["tag"], Counter((r["tag"],) for r in rows))
+
+    def _increment(self, session: Session, model, key_columns: List[str], counts: Counter) -> None:
+        rows = [{**dict(zip(key_columns, key)), "count": count} for key, count in counts.items()]
+        table = model.__table__
+        dialect = session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = insert(table)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c[c] for c in key_columns],
+                    set_={"count": table.c.count + stmt.excluded["count"]},
+                ),
+                rows,
+            )
+            return
+
+        # Portable update-or-insert for databases without ON CONFLICT
+        for row in rows:
+            result = session.execute(
+                update(table)
+                .where(*(table.c[c] == row[c] for c in key_columns))
+                .values(count=table.c.count + row["count"])
+            )
+            if not result.rowcount:
+                session.execute(table.insert(), row)
+
+    def road_tag_counts(self, session: Session, road_id: int) -> Dict[str, int]:
+        """Tag -> number of reviews of the road, most used first"""
+        rows = session.execute(
+            select(RoadTagCount.tag, RoadTagCount.count)
+            .where(RoadTagCount.road_id == road_id, RoadTagCount.count > 0)
+            .order_by(RoadTagCount.count.desc(), RoadTagCount.tag)
+        ).all()
+        return dict(rows)
+
+    def city_tag_counts(self, session: Session, limit: Optional[int] = None) -> List[TagCount]:
+        query = session.query(TagCount).filter(TagCount.count > 0).order_by(TagCount.count.desc(), TagCount.tag)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def top_roads(self, session: Session, tag: str, k: int) -> List[Tuple[int, int]]:
+        """
+        (road_id, count) of the k roads with the most reviews carrying `tag`,
+        read in order off ix_road_tag_count_tag_count
+        """
+        return [
+            tuple(row)
+            for row in session.execute(
+                select(RoadTagCount.road_id, RoadTagCount.count)
+                .where(RoadTagCount.tag == normalize_tag(tag), RoadTagCount.count > 0)
+                .order_by(RoadTagCount.count.desc(), RoadTagCount.road_id)
+                .limit(k)
+            ).all()
+        ]
+
+    def rebuild(self, session: Session, batch_size: int = 5000) -> int:
+        """Re-parse every review and recompute all tag tables. Returns the number of reviews."""
+        session.execute(delete(RoadTagCount))
+        session.execute(delete(TagCount))
+        session.execute(delete(ReviewTag))
+
+        count = 0
+        batch: List[Review] = []
+        for review in session.execute(select(Review).execution_options(yield_per=batch_size)).scalars():
+            batch.append(review)
+            if len(batch) >= batch_size:
+                self.record_reviews(session, batch)
+                count += len(batch)
+                batch = []
+        self.record_reviews(session, batch)
+        return count + len(batch)
+
+
+review_tag_service = ReviewTagService()
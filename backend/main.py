@@ -1,14 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.instrumentation import instrument
+from app.core.scheduler import scheduler
+from app.core.versioning import conditional_get_async
 from app.auth import auth_router
+from app.auth.hashing import password_hasher
+from app.auth.tokens import refresh_token_store
 from app.employee.routes import employee_router
-from app.builder.routes import builder_router
+from app.builder.routes import builder_router, builders_router
+from app.user.journal import rating_journal
 from app.user.routes import user_router
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.roads import roads_router
+from app.roads.dependencies import get_geometry_params
+from app.roads.fragments import RoadCollection, RoadCollectionResponse
+from app.roads.schemas import GeometryParams
+from app.roads.scoring import road_scoring_service
+from app.roads.spatial_index import spatial_index
+from app.tiles import tiles_router
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_read_engine, get_async_read_db
 from fastapi import Depends
 from pathlib import Path
 
@@ -29,13 +42,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Query counts, DB time and pool gauges (Server-Timing header, /health/db)
+instrument(app)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(employee_router)
 app.include_router(builder_router)
+app.include_router(builders_router)
 app.include_router(user_router)
+app.include_router(roads_router)
+app.include_router(tiles_router)
+
+# Periodic maintenance jobs
+scheduler.register(
+    "road_scores",
+    settings.ROAD_SCORE_INTERVAL_MINUTES * 60,
+    road_scoring_service.run,
+    run_at_start=True,
+)
+scheduler.register(
+    "refresh_token_purge",
+    settings.REFRESH_TOKEN_PURGE_INTERVAL_MINUTES * 60,
+    refresh_token_store.run_purge,
+)
 
 @app.on_event("startup")
 async def startup_event():
@@ -44,20 +77,48 @@ async def startup_event():
     In production, use Alembic migrations instead
     """
     # Base.metadata.create_all(bind=engine)
-    pass
+    spatial_index.ensure(engine)
+    if settings.RATING_WRITE_BEHIND:
+        rating_journal.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    scheduler.stop()
+    rating_journal.stop()
+    password_hasher.shutdown()
+    await async_read_engine.dispose()
 
 
-@app.get("/")
-async def root(session: Session = Depends(get_db)):
+@app.get("/", response_class=RoadCollectionResponse)
+async def root(
+    request: Request,
+    response: Response,
+    params: GeometryParams = Depends(get_geometry_params),
+    session: AsyncSession = Depends(get_async_read_db)
+):
+    not_modified = await conditional_get_async(request, response, session, params.geometry.value, params.lod_level)
+    if not_modified is not None:
+        return not_modified
     from app.user.services import UserService
     user_service = UserService()
-    all_roads = user_service.all_road_data(session=session)
+    all_roads = await user_service.all_road_fragments_async(session=session, params=params)
     #will send all roads data as json
-    return {
-        "message": f"Welcome to {settings.APP_NAME} API",
-        "docs": "/docs",
-        "all_roads_data": all_roads
-    }
+    return RoadCollectionResponse(
+        RoadCollection(
+            {
+                "message": f"Welcome to {settings.APP_NAME} API",
+                "docs": "/docs",
+                "geometry": params.geometry.value,
+                "lod_level": params.lod_level,
+            },
+            all_roads,
+            items_key="all_roads_data",
+        ),
+        headers=response.headers,
+    )
 
 
 @app.get("/health")
@@ -0,0 +1,34 @@
+# scripts/backfill_spatial_index.py
+"""
+Recompute missing road bounding boxes and rebuild the R*Tree spatial index.
+
+Usage (from the backend folder):
+    python -m scripts.backfill_spatial_index
+"""
+from app.core.database import SessionLocal, engine
+from app.models.road import Road
+from app.roads.services import RoadService
+from app.roads.spatial_index import spatial_index
+
+road_service = RoadService()
+spatial_index.ensure(engine)
+
+db = SessionLocal()
+try:
+    missing = db.query(Road).filter(Road.min_lng.is_(None)).all()
+    skipped = 0
+    for road in missing:
+        try:
+            road_service.apply_geometry(road, road_service.road_points(road))
+        except ValueError as e:
+            skipped += 1
+            print(f'Skipping road {road.road_id}: {e}')
+    db.flush()
+
+    indexed = spatial_index.rebuild(db)
+    db.commit()
+
+    print('Bounding boxes computed:', len(missing) - skipped)
+    print('Roads in spatial index:', indexed)
+finally:
+    db.close()
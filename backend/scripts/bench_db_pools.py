@@ -0,0 +1,249 @@
+# scripts/bench_db_pools.py
+"""
+Compare read throughput while writes are running, for one shared connection
+pool versus the reader/writer split of app/core/database.py, under each
+SQLITE_PROFILE, on the sync engines and on their aiosqlite counterparts.
+
+Readers page through a road's ratings (the query behind
+GET /user/roads/{id}/ratings/) while writers insert ratings one transaction
+at a time: threads on the sync engines, tasks on one event loop on the async
+ones. Every configuration runs against a fresh copy of a throwaway SQLite
+database; the configured database is not touched.
+
+Usage (from the backend folder):
+    python -m scripts.bench_db_pools [--profiles performance none] [--modes sync async] [--readers 8] [--writers 2] [--seconds 5]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import SQLITE_PROFILES, Base, apply_sqlite_pragmas
+from app.models.rating import Rating
+
+ROADS = 1000
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def seed(path: str, ratings: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO rating (road_id, user_id, rating, timestamp, location) VALUES (?, 1, ?, ?, 'x')",
+        ((i % ROADS + 1, (i % 50) / 10, str(start + timedelta(minutes=i))) for i in range(ratings)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def make_engines(path: str, profile: str, split: bool, readers: int, writers: int):
+    """(write engine, read engine) as app.core.database would build them"""
+    url = f"sqlite:///{path}"
+    connect_args = {"check_same_thread": False}
+    pragmas = SQLITE_PROFILES[profile]
+    if not split:
+        engine = create_engine(url, connect_args=connect_args, pool_size=readers + writers, max_overflow=0)
+        apply_sqlite_pragmas(engine, pragmas)
+        return engine, engine
+
+    write_engine = create_engine(url, connect_args=connect_args, pool_size=1, max_overflow=0)
+    apply_sqlite_pragmas(write_engine, pragmas)
+    read_engine = create_engine(url, connect_args=connect_args, pool_size=readers, max_overflow=0)
+    apply_sqlite_pragmas(read_engine, {**pragmas, "query_only": "ON"})
+    return write_engine, read_engine
+
+
+def make_async_engines(path: str, profile: str, split: bool, readers: int, writers: int):
+    """
+    (write engine, read engine) for async routes as app.core.database builds
+    them: split, the write engine is the sync writer and reads are async
+    """
+    url = f"sqlite+aiosqlite:///{path}"
+    pragmas = SQLITE_PROFILES[profile]
+    if not split:
+        engine = create_async_engine(url, pool_size=readers + writers, max_overflow=0)
+        apply_sqlite_pragmas(engine.sync_engine, pragmas)
+        return engine, engine
+
+    write_engine, _ = make_engines(path, profile, split, readers, writers)
+    read_engine = create_async_engine(url, pool_size=readers, max_overflow=0)
+    apply_sqlite_pragmas(read_engine.sync_engine, {**pragmas, "query_only": "ON"})
+    return write_engine, read_engine
+
+
+def new_rating(n: int) -> Rating:
+    return Rating(road_id=n % ROADS + 1, user_id=1, rating=4, timestamp=datetime.now(), location="x")
+
+
+def page_query(road_id: int):
+    return (
+        select(Rating)
+        .where(Rating.road_id == road_id)
+        .order_by(Rating.timestamp.desc(), Rating.rating_id.desc())
+        .limit(20)
+    )
+
+
+def run(path: str, profile: str, split: bool, readers: int, writers: int, seconds: float):
+    write_engine, read_engine = make_engines(path, profile, split, readers, writers)
+    WriteSession = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+    ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    stop = threading.Event()
+    read_latencies, write_latencies, errors = [], [], []
+
+    def reader(n: int):
+        road_id = n
+        while not stop.is_set():
+            road_id = road_id % ROADS + 1
+            started = time.perf_counter()
+            try:
+                with ReadSession() as session:
+                    session.execute(page_query(road_id)).all()
+            except Exception as e:
+                errors.append(e)
+                continue
+            read_latencies.append(time.perf_counter() - started)
+
+    def writer(n: int):
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with WriteSession() as session:
+                    session.add(new_rating(n))
+                    session.commit()
+            except Exception as e:
+                errors.append(e)
+                continue
+            write_latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    write_engine.dispose()
+    read_engine.dispose()
+    return read_latencies, write_latencies, errors
+
+
+async def run_async(path: str, profile: str, split: bool, readers: int, writers: int, seconds: float):
+    write_engine, read_engine = make_async_engines(path, profile, split, readers, writers)
+    ReadSession = async_sessionmaker(read_engine, autoflush=False)
+    stop = asyncio.Event()
+    read_latencies, write_latencies, errors = [], [], []
+
+    if split:
+        WriteSession = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+
+        def write_sync(n: int):
+            with WriteSession() as session:
+                session.add(new_rating(n))
+                session.commit()
+
+        async def write(n: int):
+            await asyncio.to_thread(write_sync, n)
+    else:
+        AsyncWriteSession = async_sessionmaker(write_engine, autoflush=False)
+
+        async def write(n: int):
+            async with AsyncWriteSession() as session:
+                session.add(new_rating(n))
+                await session.commit()
+
+    async def reader(n: int):
+        road_id = n
+        while not stop.is_set():
+            road_id = road_id % ROADS + 1
+            started = time.perf_counter()
+            try:
+                async with ReadSession() as session:
+                    (await session.execute(page_query(road_id))).all()
+            except Exception as e:
+                errors.append(e)
+                continue
+            read_latencies.append(time.perf_counter() - started)
+
+    async def writer(n: int):
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                await write(n)
+            except Exception as e:
+                errors.append(e)
+                continue
+            write_latencies.append(time.perf_counter() - started)
+
+    tasks = [asyncio.create_task(reader(i)) for i in range(readers)]
+    tasks += [asyncio.create_task(writer(i)) for i in range(writers)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    if split:
+        write_engine.dispose()
+    await read_engine.dispose()
+    return read_latencies, write_latencies, errors
+
+
+def summary(latencies, seconds: float) -> str:
+    if not latencies:
+        return "        0/s"
+    return (
+        f"{len(latencies) / seconds:9.0f}/s  "
+        f"p50={statistics.median(latencies) * 1000:6.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES))
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--ratings", type=int, default=200_000, help="ratings seeded before each run")
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} readers={args.readers} writers={args.writers} seconds={args.seconds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "template.db")
+        seed(template, args.ratings)
+
+        for profile in args.profiles:
+            for mode in args.modes:
+                for split in (False, True):
+                    path = os.path.join(tmp, f"{profile}-{mode}-{split}.db")
+                    shutil.copyfile(template, path)
+                    bench_args = (path, profile, split, args.readers, args.writers, args.seconds)
+                    if mode == "async":
+                        reads, writes, errors = asyncio.run(run_async(*bench_args))
+                    else:
+                        reads, writes, errors = run(*bench_args)
+                    layout = "split " if split else "shared"
+                    print(f"{profile:<12} {mode:<5} {layout}  reads {summary(reads, args.seconds)}  writes {summary(writes, args.seconds)}")
+                    if errors:
+                        print(f"{'':<26}{len(errors)} errors, first: {errors[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
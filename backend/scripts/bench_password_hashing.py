@@ -0,0 +1,114 @@
+# scripts/bench_password_hashing.py
+"""
+Measure bcrypt throughput and login latency under concurrency, to size
+PASSWORD_HASH_WORKERS and BCRYPT_ROUNDS (see app/core/config.py) per pod.
+
+Logins run through the real login service against a throwaway SQLite
+database; the configured database is not touched.
+
+Usage (from the backend folder):
+    python -m scripts.bench_password_hashing [--rounds 10 12] [--concurrency 32] [--logins 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.auth.hashing import PasswordHasher, password_hasher
+from app.auth.services import UserService
+from app.auth.utils import generate_password_hash
+from app.core.config import settings
+from app.core.database import Base
+from app.models.user import User
+
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def hash_throughput(rounds: int, count: int, workers: int) -> float:
+    hasher = PasswordHasher(workers, max_pending=count)
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(hasher._run(generate_password_hash, PASSWORD, rounds) for _ in range(count)))
+        return count / (time.perf_counter() - started)
+    finally:
+        hasher.shutdown()
+
+
+async def login_latency(SessionMaker, logins: int, concurrency: int):
+    service = UserService()
+    gate = asyncio.Semaphore(concurrency)
+    latencies, rejected = [], 0
+
+    async def login():
+        nonlocal rejected
+        async with gate:
+            session, read_session = SessionMaker(), SessionMaker()
+            started = time.perf_counter()
+            try:
+                await service.login_with_password("bench@example.com", PASSWORD, session, read_session)
+                latencies.append(time.perf_counter() - started)
+            except HTTPException as e:
+                if e.status_code != 503:
+                    raise
+                rejected += 1
+            finally:
+                read_session.close()
+                session.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return latencies, rejected, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[settings.BCRYPT_ROUNDS])
+    parser.add_argument("--hashes", type=int, default=32, help="hashes per throughput measurement")
+    parser.add_argument("--concurrency", type=int, default=32, help="logins in flight at once")
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+
+    workers = settings.PASSWORD_HASH_WORKERS
+    print(f"cpus={os.cpu_count()} PASSWORD_HASH_WORKERS={workers} PASSWORD_HASH_MAX_PENDING={settings.PASSWORD_HASH_MAX_PENDING}")
+    for rounds in args.rounds:
+        single = asyncio.run(hash_throughput(rounds, max(4, args.hashes // 4), 1))
+        pooled = asyncio.run(hash_throughput(rounds, args.hashes, workers))
+        print(f"rounds={rounds:>2}  {single:8.1f} hashes/s on 1 thread  {pooled:8.1f} hashes/s on {workers} workers")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        SessionMaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with SessionMaker() as session:
+            session.add(User(name="bench", email="bench@example.com", hashed_password=generate_password_hash(PASSWORD)))
+            session.commit()
+
+        try:
+            latencies, rejected, elapsed = asyncio.run(login_latency(SessionMaker, args.logins, args.concurrency))
+        finally:
+            password_hasher.shutdown()
+            engine.dispose()
+
+    print(f"logins={args.logins} concurrency={args.concurrency} rounds={settings.BCRYPT_ROUNDS}")
+    if latencies:
+        print(
+            f"  {len(latencies) / elapsed:.1f} logins/s  "
+            f"p50={statistics.median(latencies) * 1000:.0f}ms  "
+            f"p95={percentile(latencies, 95) * 1000:.0f}ms  "
+            f"p99={percentile(latencies, 99) * 1000:.0f}ms"
+        )
+    print(f"  rejected with 503: {rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# scripts/compute_road_scores.py
+"""
+Recompute the Bayesian, time-decayed score of every road now instead of
+waiting for the scheduled job (see ROAD_SCORE_* in app/core/config.py).
+
+Usage (from the backend folder):
+    python -m scripts.compute_road_scores
+"""
+import time
+from app.core.database import SessionLocal
+from app.roads.scoring import road_scoring_service
+
+db = SessionLocal()
+try:
+    started = time.perf_counter()
+    count = road_scoring_service.score_all(db)
+    db.commit()
+    print(f'Scored {count} roads in {time.perf_counter() - started:.2f}s')
+finally:
+    db.close()
@@ -0,0 +1,18 @@
+# scripts/purge_refresh_tokens.py
+"""
+Delete expired refresh tokens and revoked ones past the retention window
+now, instead of waiting for the scheduled job (see REFRESH_TOKEN_* in
+app/core/config.py).
+
+Usage (from the backend folder):
+    python -m scripts.purge_refresh_tokens
+"""
+from app.core.database import SessionLocal
+from app.auth.tokens import refresh_token_store
+
+db = SessionLocal()
+try:
+    count = refresh_token_store.purge(db)
+    print(f'Purged {count} refresh tokens')
+finally:
+    db.close()
@@ -0,0 +1,20 @@
+# scripts/rebuild_builder_stats.py
+"""
+Recompute the builder leaderboard columns (average_rating, total_projects,
+rating_sum, rating_count, score) from roads and road_stats. Run this after
+changing LEADERBOARD_PRIOR_MEAN / LEADERBOARD_PRIOR_WEIGHT, and after
+scripts/rebuild_road_stats.py if that was needed.
+
+Usage (from the backend folder):
+    python -m scripts.rebuild_builder_stats
+"""
+from app.core.database import SessionLocal
+from app.builder.ranking import builder_ranking_service
+
+db = SessionLocal()
+try:
+    count = builder_ranking_service.rebuild(db)
+    db.commit()
+    print('Builders with rebuilt ranking:', count)
+finally:
+    db.close()
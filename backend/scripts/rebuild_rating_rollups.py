@@ -0,0 +1,19 @@
+# scripts/rebuild_rating_rollups.py
+"""
+Recompute the daily/weekly/monthly rating rollups from the full rating
+history. Run once after deploying the rollups, or whenever ratings were
+imported outside the API.
+
+Usage (from the backend folder):
+    python -m scripts.rebuild_rating_rollups
+"""
+from app.core.database import SessionLocal
+from app.user.rollups import rating_rollup_service
+
+db = SessionLocal()
+try:
+    count = rating_rollup_service.rebuild(db)
+    db.commit()
+    print('Ratings rolled up:', count)
+finally:
+    db.close()
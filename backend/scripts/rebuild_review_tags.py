@@ -0,0 +1,19 @@
+# scripts/rebuild_review_tags.py
+"""
+Re-parse every review's tags and rebuild review_tag, road_tag_count and
+tag_count. Run after changing how tags are parsed (app/user/tags.py) or
+after importing reviews outside the API.
+
+Usage (from the backend folder):
+    python -m scripts.rebuild_review_tags
+"""
+from app.core.database import SessionLocal
+from app.user.tags import review_tag_service
+
+db = SessionLocal()
+try:
+    count = review_tag_service.rebuild(db)
+    db.commit()
+    print('Reviews indexed:', count)
+finally:
+    db.close()
@@ -0,0 +1,24 @@
+# scripts/rebuild_road_lods.py
+"""
+Recompute the simplified level-of-detail geometries for every road.
+Run this after changing LOD_ZOOMS or the simplification tolerance.
+
+Usage (from the backend folder):
+    python -m scripts.rebuild_road_lods
+"""
+from app.core.database import SessionLocal
+from app.models.road import Road
+from app.roads.services import RoadService
+
+road_service = RoadService()
+
+db = SessionLocal()
+try:
+    count = 0
+    for road in db.query(Road).yield_per(500):
+        road_service.refresh_lods(road, db)
+        count += 1
+    db.commit()
+    print('Roads with rebuilt LOD pyramid:', count)
+finally:
+    db.close()
@@ -0,0 +1,19 @@
+# scripts/rebuild_road_stats.py
+"""
+Recompute the per-road rating and review aggregates (road_stats) from the
+rating and review tables. Run this after importing data outside the API or
+if the aggregates are ever suspected to have drifted.
+
+Usage (from the backend folder):
+    python -m scripts.rebuild_road_stats
+"""
+from app.core.database import SessionLocal
+from app.roads.stats import road_stats_service
+
+db = SessionLocal()
+try:
+    count = road_stats_service.rebuild(db)
+    db.commit()
+    print('Roads with rebuilt stats:', count)
+finally:
+    db.close()
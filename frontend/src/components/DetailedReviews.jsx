@@ -5,40 +5,54 @@ function DetailedReviews({ roadId, onClose }) {
   const [ratings, setRatings] = useState([]);
   const [loading, setLoading] = useState(true);
   const [averageRating, setAverageRating] = useState(0);
+  const [totalRatings, setTotalRatings] = useState(0);
+  const [totalReviews, setTotalReviews] = useState(0);
+  // Keyset cursors of the next page; null once everything is loaded
+  const [ratingsCursor, setRatingsCursor] = useState(null);
+  const [reviewsCursor, setReviewsCursor] = useState(null);
 
   useEffect(() => {
     fetchDetailedData();
   }, [roadId]);
 
+  const fetchReviewsPage = async (cursor) => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const reviewRes = await fetch(
+      `${import.meta.env.VITE_FLASK_API}/user/roads/${roadId}/reviews${query}`
+    );
+    if (!reviewRes.ok) return;
+    const reviewData = await reviewRes.json();
+    const page = reviewData.reviews || [];
+    setReviews((prev) => (cursor ? [...prev, ...page] : page));
+    setReviewsCursor(reviewData.next_cursor || null);
+  };
+
+  const fetchRatingsPage = async (cursor) => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const ratingRes = await fetch(
+      `${import.meta.env.VITE_FLASK_API}/user/roads/${roadId}/ratings/${query}`
+    );
+    if (!ratingRes.ok) return;
+    const ratingData = await ratingRes.json();
+    // API returns a page as a plain array; the next cursor is in a header
+    const page = Array.isArray(ratingData) ? ratingData : [];
+    setRatings((prev) => (cursor ? [...prev, ...page] : page));
+    setRatingsCursor(ratingRes.headers.get("X-Next-Cursor"));
+  };
+
   const fetchDetailedData = async () => {
     setLoading(true);
     try {
-      // Fetch reviews
-      const reviewRes = await fetch(
-        `${import.meta.env.VITE_FLASK_API}/user/roads/${roadId}/reviews`
-      );
-      if (reviewRes.ok) {
-        const reviewData = await reviewRes.json();
-        setReviews(reviewData.reviews || []);
+      // Aggregates come precomputed with the road, independent of paging
+      const roadRes = await fetch(`${import.meta.env.VITE_FLASK_API}/user/roads/${roadId}`);
+      if (roadRes.ok) {
+        const roadData = await roadRes.json();
+        setAverageRating(roadData.average_rating ? parseFloat(roadData.average_rating).toFixed(1) : 0);
+        setTotalRatings(roadData.total_ratings || 0);
+        setTotalReviews(roadData.total_reviews || 0);
       }
 
-      // Fetch ratings
-      const ratingRes = await fetch(
-        `${import.meta.env.VITE_FLASK_API}/user/roads/${roadId}/ratings/`
-      );
-      if (ratingRes.ok) {
-        const ratingData = await ratingRes.json();
-        console.log("Rating data:", ratingData);
-        // API returns array directly, not wrapped in {ratings: []}
-        const ratingsArray = Array.isArray(ratingData) ? ratingData : [];
-        setRatings(ratingsArray);
-        
-        // Calculate average rating - parse strings to numbers
-        if (ratingsArray.length > 0) {
-          const avg = ratingsArray.reduce((sum, r) => sum + parseFloat(r.rating), 0) / ratingsArray.length;
-          setAverageRating(avg.toFixed(1));
-        }
-      }
+      await Promise.all([fetchReviewsPage(null), fetchRatingsPage(null)]);
     } catch (err) {
       console.error("Error fetching detailed data:", err);
     } finally {
@@ -144,7 +158,7 @@ function DetailedReviews({ roadId, onClose }) {
                 {averageRating > 0 && renderStars(parseFloat(averageRating))}
               </div>
               <p style={{ color: "#666", fontSize: "14px", marginTop: "5px" }}>
-                Based on {ratings.length} rating{ratings.length !== 1 ? "s" : ""}
+                Based on {totalRatings} rating{totalRatings !== 1 ? "s" : ""}
               </p>
             </div>
 
@@ -159,7 +173,7 @@ function DetailedReviews({ roadId, onClose }) {
                   paddingBottom: "5px",
                 }}
               >
-                All Ratings ({ratings.length})
+                All Ratings ({totalRatings})
               </h3>
               {ratings.length === 0 ? (
                 <p style={{ color: "#999", fontStyle: "italic" }}>No ratings yet.</p>
@@ -203,6 +217,21 @@ function DetailedReviews({ roadId, onClose }) {
                   ))}
                 </div>
               )}
+              {ratingsCursor && (
+                <button
+                  onClick={() => fetchRatingsPage(ratingsCursor)}
+                  style={{
+                    marginTop: "10px",
+                    padding: "8px 16px",
+                    cursor: "pointer",
+                    border: "1px solid #ccc",
+                    borderRadius: "6px",
+                    backgroundColor: "white",
+                  }}
+                >
+                  Load more
+                </button>
+              )}
             </div>
 
             {/* Reviews Section */}
@@ -216,7 +245,7 @@ function DetailedReviews({ roadId, onClose }) {
                   paddingBottom: "5px",
                 }}
               >
-                All Reviews ({reviews.length})
+                All Reviews ({totalReviews})
               </h3>
               {reviews.length === 0 ? (
                 <p style={{ color: "#999", fontStyle: "italic" }}>No reviews yet.</p>
@@ -315,6 +344,21 @@ function DetailedReviews({ roadId, onClose }) {
                   ))}
                 </div>
               )}
+              {reviewsCursor && (
+                <button
+                  onClick={() => fetchReviewsPage(reviewsCursor)}
+                  style={{
+                    marginTop: "10px",
+                    padding: "8px 16px",
+                    cursor: "pointer",
+                    border: "1px solid #ccc",
+                    borderRadius: "6px",
+                    backgroundColor: "white",
+                  }}
+                >
+                  Load more
+                </button>
+              )}
             </div>
           </>
         )}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import { Polyline } from "@react-google-maps/api";
 import DetailedReviews from "./DetailedReviews";
+import { decodePolyline } from "../utils/polyline";
 
 // --- Road status colors ---
 const statusColors = {
@@ -30,16 +31,14 @@ const ViewBuilderRoads = ({ onPolylineLoad }) => {
 
       try {
         const res = await fetch(
-          `${import.meta.env.VITE_FLASK_API}/builder/${builderId}/roads`
+          `${import.meta.env.VITE_FLASK_API}/builder/${builderId}/roads?geometry=encoded`
         );
         if (!res.ok) throw new Error("Failed to fetch builder roads");
 
         const data = await res.json();
         const formatted = (data.roads || []).map((r) => ({
           id: r.road_id,
-          path: Array.isArray(r.polyline_data)
-            ? r.polyline_data
-            : JSON.parse(r.polyline_data || "[]"),
+          path: decodePolyline(r.polyline_encoded, data.polyline_precision),
           builder_id: r.builder_id,
           maintained_by: r.maintained_by,
           cost: r.cost,
@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react";
 import { Polyline } from "@react-google-maps/api";
+import { decodePolyline } from "../utils/polyline";
 
 // --- Road status colors ---
 const statusColors = {
@@ -25,14 +26,14 @@ const ViewInspectorRoads = ({ onPolylineLoad }) => {
       setError(null);
       try {
         const res = await fetch(
-          `${import.meta.env.VITE_FLASK_API}/employee/inspector/roads?inspector_unique_id=${inspectorId}`
+          `${import.meta.env.VITE_FLASK_API}/employee/inspector/roads?inspector_unique_id=${inspectorId}&geometry=encoded`
         );
         if (!res.ok) throw new Error("Failed to fetch inspector roads");
         const data = await res.json();
 
         const formatted = (data.roads || []).map((r) => ({
           id: r.road_id,
-          path: r.polyline_data || [],
+          path: decodePolyline(r.polyline_encoded, data.polyline_precision),
           builder_id: r.builder_id,
           maintained_by: r.maintained_by,
           cost: r.cost,
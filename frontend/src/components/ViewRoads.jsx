@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
-import { Polyline } from "@react-google-maps/api";
+import { Polyline, useGoogleMap } from "@react-google-maps/api";
 import DetailedReviews from "./DetailedReviews";
+import { decodePolyline } from "../utils/polyline";
 
 // --- Road status colors ---
 const statusColors = {
@@ -37,18 +38,36 @@ function ViewRoads() {
   const [selectedFile, setSelectedFile] = useState(null);
   const [showDetailedReviews, setShowDetailedReviews] = useState(false);
 
+  const map = useGoogleMap();
+
+  // Only load the roads inside the visible viewport; refetch whenever the map settles
   useEffect(() => {
+    if (!map) return;
+    let controller = null;
+
     const fetchRoads = async () => {
+      const bounds = map.getBounds();
+      if (!bounds) return;
+      const sw = bounds.getSouthWest();
+      const ne = bounds.getNorthEast();
+      const bbox = [sw.lng(), sw.lat(), ne.lng(), ne.lat()].join(",");
+
+      if (controller) controller.abort();
+      controller = new AbortController();
+
       setLoading(true);
       setError(null);
       try {
-        const res = await fetch(`${import.meta.env.VITE_FLASK_API}/`);
+        const res = await fetch(
+          `${import.meta.env.VITE_FLASK_API}/roads?bbox=${bbox}&zoom=${Math.round(map.getZoom())}&geometry=encoded`,
+          { signal: controller.signal }
+        );
         if (!res.ok) throw new Error("Failed to fetch roads");
         const data = await res.json();
 
-        const formattedRoads = (data.all_roads_data || []).map((road) => ({
+        const formattedRoads = (data.roads || []).map((road) => ({
           id: road.road_id,
-          path: road.polyline_data,
+          path: decodePolyline(road.polyline_encoded, data.polyline_precision),
           builder_id: road.builder_id,
           maintained_by: road.maintained_by,
           cost: road.cost,
@@ -62,6 +81,7 @@ function ViewRoads() {
 
         setRoads(formattedRoads);
       } catch (err) {
+        if (err.name === "AbortError") return;
         console.error("Error loading roads:", err);
         setError(err.message);
       } finally {
@@ -69,8 +89,14 @@ function ViewRoads() {
       }
     };
 
+    const listener = map.addListener("idle", fetchRoads);
     fetchRoads();
-  }, []);
+
+    return () => {
+      listener.remove();
+      if (controller) controller.abort();
+    };
+  }, [map]);
 
   const toggleTag = (tag) => {
     setSelectedTags((prev) =>
@@ -0,0 +1,30 @@
+export type LatLng = { lat: number; lng: number };
+
+// Decode a polyline from the API's `geometry=encoded` format
+// (Google encoded polyline algorithm at the given decimal precision).
+export const decodePolyline = (encoded: string, precision: number = 6): LatLng[] => {
+  const factor = Math.pow(10, precision);
+  const points: LatLng[] = [];
+  let index = 0;
+  let lat = 0;
+  let lng = 0;
+
+  const nextValue = () => {
+    let result = 0;
+    let shift = 0;
+    let b;
+    do {
+      b = encoded.charCodeAt(index++) - 63;
+      result |= (b & 0x1f) << shift;
+      shift += 5;
+    } while (b >= 0x20);
+    return result & 1 ? ~(result >> 1) : result >> 1;
+  };
+
+  while (index < encoded.length) {
+    lat += nextValue();
+    lng += nextValue();
+    points.push({ lat: lat / factor, lng: lng / factor });
+  }
+  return points;
+};